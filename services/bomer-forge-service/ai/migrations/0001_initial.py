@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-19 17:05
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LangfusePromptSnapshot',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255)),
+                ('label', models.CharField(max_length=32)),
+                ('version', models.PositiveIntegerField(blank=True, null=True)),
+                ('langchain_prompt', models.JSONField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('name', 'label'), name='unique_langfuse_prompt_snapshot')],
+            },
+        ),
+    ]
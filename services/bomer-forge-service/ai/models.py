@@ -0,0 +1,27 @@
+from django.db import models
+
+from core.base_model import BaseModel
+
+
+class LangfusePromptSnapshot(BaseModel):
+    """
+    A langfuse prompt snapshot is the last known text of a Langfuse prompt,
+    so a process can start serving it while Langfuse is unreachable.
+    """
+
+    name = models.CharField(max_length=255)
+    # The requested version, or "latest"
+    label = models.CharField(max_length=32)
+    version = models.PositiveIntegerField(null=True, blank=True)
+    langchain_prompt = models.JSONField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name", "label"],
+                name="unique_langfuse_prompt_snapshot",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.label})"
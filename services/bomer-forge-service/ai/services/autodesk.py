@@ -0,0 +1,309 @@
+"""Client of the Autodesk Platform Services (APS) APIs.
+
+One client holds a pooled `requests.Session` and its access token, refreshed
+shortly before it expires. Files are uploaded to OSS in parts read from disk
+as they are sent, by a pool of threads, and derivative jobs are awaited with
+an exponential backoff.
+"""
+
+import asyncio
+import base64
+import math
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+import structlog
+from requests.adapters import HTTPAdapter
+
+from core.db_constants import DBConstants, constants
+
+logger = structlog.get_logger(__name__)
+
+APS_BASE_URL = "https://developer.api.autodesk.com"
+APS_SCOPE = "data:read data:write data:create bucket:create bucket:read"
+# Tokens are refreshed this long before they expire
+APS_TOKEN_REFRESH_MARGIN_SECONDS = 60
+APS_REQUEST_TIMEOUT_SECONDS = 60
+# S3 parts must be at least 5 MB, except the last one
+APS_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+APS_UPLOAD_MAX_WORKERS = 4
+# Most signed URLs a single signeds3upload request returns
+APS_SIGNED_URLS_PER_REQUEST = 25
+APS_SIGNED_URLS_EXPIRATION_MINUTES = 60
+APS_JOB_POLL_INITIAL_DELAY_SECONDS = 2.0
+APS_JOB_POLL_MAX_DELAY_SECONDS = 60.0
+APS_JOB_TIMEOUT_SECONDS = 30 * 60
+
+APS_JOB_FINISHED_STATUSES = ("success", "failed", "timeout")
+
+autodesk_client: "AutodeskClient | None" = None
+
+AUTODESK_CONSTANTS = ("AUTODESK_CLIENT_ID", "AUTODESK_CLIENT_SECRET")
+
+
+class AutodeskError(Exception):
+    """Failure of an Autodesk Platform Services request or job."""
+
+
+def encode_urn(urn: str) -> str:
+    """Encode an object id as the URL safe base64 URN of the derivative APIs."""
+    return base64.urlsafe_b64encode(urn.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+class AutodeskClient:
+    """Client of the Autodesk Platform Services APIs."""
+
+    def __init__(
+        self,
+        *,
+        client_id: str,
+        client_secret: str,
+        base_url: str = APS_BASE_URL,
+        scope: str = APS_SCOPE,
+        part_size: int = APS_UPLOAD_PART_SIZE,
+        max_workers: int = APS_UPLOAD_MAX_WORKERS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize instance."""
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.base_url = base_url.rstrip("/")
+        self.scope = scope
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self._clock = clock
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._access_token: str | None = None
+        self._access_token_expires_at = 0.0
+        self._token_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    def get_access_token(self) -> str:
+        """Get the cached access token, requesting a new one when it expires soon."""
+        with self._token_lock:
+            refresh_at = (
+                self._access_token_expires_at - APS_TOKEN_REFRESH_MARGIN_SECONDS
+            )
+            if self._access_token is None or self._clock() >= refresh_at:
+                response = self.session.post(
+                    f"{self.base_url}/authentication/v2/token",
+                    data={"grant_type": "client_credentials", "scope": self.scope},
+                    auth=(self.client_id, self.client_secret),
+                    timeout=APS_REQUEST_TIMEOUT_SECONDS,
+                )
+                data = self._get_json(response)
+                self._access_token = data["access_token"]
+                self._access_token_expires_at = self._clock() + data["expires_in"]
+                logger.info("Autodesk access token refreshed")
+            return self._access_token
+
+    def _raise_for_status(self, response: requests.Response) -> None:
+        if not response.ok:
+            msg = (
+                f"Autodesk request failed: {response.request.method} "
+                f"{response.url} {response.status_code} {response.text}"
+            )
+            raise AutodeskError(msg)
+
+    def _get_json(self, response: requests.Response) -> Any:
+        self._raise_for_status(response)
+        return response.json() if response.content else None
+
+    def request(self, method: str, path: str, **kwargs) -> Any:
+        """Send an authenticated request to the APS APIs, returning its JSON."""
+        headers = {
+            "Authorization": f"Bearer {self.get_access_token()}",
+            **kwargs.pop("headers", {}),
+        }
+        response = self.session.request(
+            method,
+            f"{self.base_url}{path}",
+            headers=headers,
+            timeout=APS_REQUEST_TIMEOUT_SECONDS,
+            **kwargs,
+        )
+        return self._get_json(response)
+
+    def create_bucket(self, bucket_key: str, *, policy_key: str = "transient") -> Any:
+        """Create an OSS bucket, "transient" buckets keep objects for 24 hours."""
+        return self.request(
+            "POST",
+            "/oss/v2/buckets",
+            json={"bucketKey": bucket_key, "policyKey": policy_key},
+        )
+
+    def get_object_details(self, bucket_key: str, object_key: str) -> Any:
+        """Get the details of an OSS object, e.g. its `objectId`."""
+        return self.request(
+            "GET", f"/oss/v2/buckets/{bucket_key}/objects/{object_key}/details"
+        )
+
+    def _get_signed_upload_urls(
+        self, bucket_key: str, object_key: str, parts_count: int
+    ) -> tuple[str, list[str]]:
+        upload_key = None
+        urls: list[str] = []
+        while len(urls) < parts_count:
+            params = {
+                "parts": min(APS_SIGNED_URLS_PER_REQUEST, parts_count - len(urls)),
+                "firstPart": len(urls) + 1,
+                "minutesExpiration": APS_SIGNED_URLS_EXPIRATION_MINUTES,
+            }
+            if upload_key:
+                params["uploadKey"] = upload_key
+            data = self.request(
+                "GET",
+                f"/oss/v2/buckets/{bucket_key}/objects/{object_key}/signeds3upload",
+                params=params,
+            )
+            upload_key = data["uploadKey"]
+            urls.extend(data["urls"])
+        return upload_key, urls
+
+    def _upload_part(self, file_path: str, part_number: int, url: str) -> str:
+        # Every part is read when it is sent, so at most `max_workers` parts
+        # are in memory at once
+        with open(file_path, "rb") as f:
+            f.seek((part_number - 1) * self.part_size)
+            chunk = f.read(self.part_size)
+
+        response = self.session.put(
+            url, data=chunk, timeout=APS_REQUEST_TIMEOUT_SECONDS
+        )
+        self._raise_for_status(response)
+        logger.info("Uploaded part", part_number=part_number)
+        return response.headers["ETag"].strip('"')
+
+    def upload_file(
+        self, bucket_key: str, file_path: str, *, object_key: str | None = None
+    ) -> Any:
+        """Upload a file to an OSS bucket in parallel parts, returning its details."""
+        object_key = object_key or os.path.basename(file_path)
+        parts_count = max(1, math.ceil(os.path.getsize(file_path) / self.part_size))
+        upload_key, urls = self._get_signed_upload_urls(
+            bucket_key, object_key, parts_count
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            etags = list(
+                executor.map(
+                    lambda part: self._upload_part(file_path, *part),
+                    enumerate(urls, start=1),
+                )
+            )
+
+        return self.request(
+            "POST",
+            f"/oss/v2/buckets/{bucket_key}/objects/{object_key}/signeds3upload",
+            json={
+                "uploadKey": upload_key,
+                "parts": [
+                    {"partNumber": part_number, "eTag": etag}
+                    for part_number, etag in enumerate(etags, start=1)
+                ],
+            },
+        )
+
+    def start_derivative_job(
+        self, urn: str, *, formats: list[dict] | None = None
+    ) -> Any:
+        """Start a Model Derivative translation job of an object."""
+        formats = formats or [{"type": "svf", "views": ["2d"]}, {"type": "obj"}]
+        return self.request(
+            "POST",
+            "/modelderivative/v2/designdata/job",
+            json={"input": {"urn": encode_urn(urn)}, "output": {"formats": formats}},
+        )
+
+    def get_manifest(self, urn: str) -> Any:
+        """Get the manifest of the derivatives of an object."""
+        return self.request(
+            "GET", f"/modelderivative/v2/designdata/{encode_urn(urn)}/manifest"
+        )
+
+    async def wait_for_derivative_job(
+        self,
+        urn: str,
+        *,
+        initial_delay: float = APS_JOB_POLL_INITIAL_DELAY_SECONDS,
+        max_delay: float = APS_JOB_POLL_MAX_DELAY_SECONDS,
+        timeout: float = APS_JOB_TIMEOUT_SECONDS,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> Any:
+        """Poll the manifest of an object with a backoff until its job finishes."""
+        delay = initial_delay
+        waited = 0.0
+        while True:
+            manifest = await asyncio.to_thread(self.get_manifest, urn)
+            status = manifest.get("status")
+            logger.info(
+                "Derivative job status",
+                status=status,
+                progress=manifest.get("progress"),
+            )
+            if status in APS_JOB_FINISHED_STATUSES:
+                if status != "success":
+                    msg = f"Derivative job of {urn} finished with status {status}"
+                    raise AutodeskError(msg)
+                return manifest
+
+            if waited >= timeout:
+                msg = f"Derivative job of {urn} didn't finish in {timeout} seconds"
+                raise AutodeskError(msg)
+            await sleep(delay)
+            waited += delay
+            delay = min(delay * 2, max_delay)
+
+    def get_metadata(self, urn: str) -> Any:
+        """Get the views of the derivatives of an object."""
+        return self.request(
+            "GET", f"/modelderivative/v2/designdata/{encode_urn(urn)}/metadata"
+        )
+
+    def get_properties(self, urn: str, guid: str) -> Any:
+        """Get the properties of a view of the derivatives of an object."""
+        encoded_urn = encode_urn(urn)
+        return self.request(
+            "GET",
+            f"/modelderivative/v2/designdata/{encoded_urn}/metadata/{guid}/properties",
+        )
+
+
+@constants.subscribe
+def reset_autodesk_client(old_values: DBConstants, new_values: DBConstants) -> None:
+    """Rebuild the Autodesk client on its next use when its credentials change."""
+    global autodesk_client
+    if any(
+        getattr(old_values, name) != getattr(new_values, name)
+        for name in AUTODESK_CONSTANTS
+    ):
+        autodesk_client = None
+
+
+def get_autodesk_client() -> AutodeskClient:
+    """Get the Autodesk client, shared so its connections and token are reused."""
+    global autodesk_client
+    constants.refresh_if_outdated()
+    if autodesk_client is None:
+        constant_values = constants.values()
+        if not constant_values.AUTODESK_CLIENT_ID:
+            msg = "AUTODESK_CLIENT_ID is not configured"
+            raise AutodeskError(msg)
+        autodesk_client = AutodeskClient(
+            client_id=constant_values.AUTODESK_CLIENT_ID,
+            client_secret=constant_values.AUTODESK_CLIENT_SECRET,
+        )
+    return autodesk_client
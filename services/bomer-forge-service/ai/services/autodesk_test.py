@@ -0,0 +1,169 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from ai.services.autodesk import AutodeskClient, AutodeskError, encode_urn
+
+
+class StubAPS:
+    """Local stub of the APS endpoints used by the client."""
+
+    def __init__(self) -> None:
+        self.token_requests = 0
+        self.parts: dict[int, bytes] = {}
+        self.completed_upload: dict | None = None
+        self.manifest_statuses = ["inprogress", "inprogress", "success"]
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._get_handler())
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def _get_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, data, status=200):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_POST(self):
+                path = urlparse(self.path).path
+                body = self._read_body()
+                if path == "/authentication/v2/token":
+                    stub.token_requests += 1
+                    self._send_json({"access_token": "token", "expires_in": 3600})
+                elif path.endswith("/signeds3upload"):
+                    stub.completed_upload = json.loads(body)
+                    self._send_json({"objectId": "urn:object"})
+                elif path == "/modelderivative/v2/designdata/job":
+                    self._send_json({"result": "created"})
+                else:
+                    self._send_json({}, status=404)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if self.headers.get("Authorization") != "Bearer token":
+                    self._send_json({}, status=401)
+                elif url.path.endswith("/signeds3upload"):
+                    query = parse_qs(url.query)
+                    first_part = int(query["firstPart"][0])
+                    parts = int(query["parts"][0])
+                    self._send_json(
+                        {
+                            "uploadKey": "upload-key",
+                            "urls": [
+                                f"{stub.base_url}/parts/{part_number}"
+                                for part_number in range(first_part, first_part + parts)
+                            ],
+                        }
+                    )
+                elif url.path.endswith("/manifest"):
+                    self._send_json({"status": stub.manifest_statuses.pop(0)})
+                else:
+                    self._send_json({}, status=404)
+
+            def do_PUT(self):
+                part_number = int(self.path.rsplit("/", 1)[-1])
+                stub.parts[part_number] = self._read_body()
+                self.send_response(200)
+                self.send_header("ETag", f'"etag-{part_number}"')
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        return Handler
+
+
+@pytest.fixture()
+def stub_aps():
+    stub = StubAPS()
+    thread = threading.Thread(target=stub.server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+@pytest.fixture()
+def client(stub_aps):
+    client = AutodeskClient(
+        client_id="id", client_secret="secret", base_url=stub_aps.base_url, part_size=5
+    )
+    yield client
+    client.close()
+
+
+def test_encode_urn():
+    assert encode_urn("urn:adsk.objects:os.object:bucket/a.dwg") == (
+        "dXJuOmFkc2sub2JqZWN0czpvcy5vYmplY3Q6YnVja2V0L2EuZHdn"
+    )
+
+
+def test_access_token_is_cached_until_it_expires(stub_aps):
+    now = [0.0]
+    client = AutodeskClient(
+        client_id="id",
+        client_secret="secret",
+        base_url=stub_aps.base_url,
+        clock=lambda: now[0],
+    )
+
+    assert client.get_access_token() == "token"
+    assert client.get_access_token() == "token"
+    assert stub_aps.token_requests == 1
+
+    # Refreshed before it expires
+    now[0] = 3600 - 30
+    client.get_access_token()
+    assert stub_aps.token_requests == 2
+
+
+def test_upload_file(stub_aps, client, tmp_path):
+    file_path = tmp_path / "drawing.dwg"
+    file_path.write_bytes(b"0123456789ab")
+
+    assert client.upload_file("bucket", str(file_path)) == {"objectId": "urn:object"}
+
+    assert stub_aps.parts == {1: b"01234", 2: b"56789", 3: b"ab"}
+    assert stub_aps.completed_upload == {
+        "uploadKey": "upload-key",
+        "parts": [
+            {"partNumber": 1, "eTag": "etag-1"},
+            {"partNumber": 2, "eTag": "etag-2"},
+            {"partNumber": 3, "eTag": "etag-3"},
+        ],
+    }
+
+
+def test_wait_for_derivative_job_backs_off(stub_aps, client):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    manifest = asyncio.run(
+        client.wait_for_derivative_job(
+            "urn:object", initial_delay=1, max_delay=1.5, sleep=sleep
+        )
+    )
+
+    assert manifest == {"status": "success"}
+    assert delays == [1, 1.5]
+
+
+def test_wait_for_derivative_job_failed(stub_aps, client):
+    stub_aps.manifest_statuses = ["failed"]
+
+    with pytest.raises(AutodeskError):
+        asyncio.run(client.wait_for_derivative_job("urn:object"))
@@ -0,0 +1,182 @@
+"""Local cache for Langfuse prompts.
+
+Prompts are served from memory and refreshed in the background once they are
+older than the TTL (stale-while-revalidate). Prompts pinned to a version are
+immutable in Langfuse, so they are never refreshed. The last known text of
+every prompt is also kept in the database, so a process started while Langfuse
+is unreachable can still serve the prompts.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from django.db import connection
+
+from ai.models import LangfusePromptSnapshot
+
+logger = structlog.get_logger(__name__)
+
+__all__ = ("CachedPrompt", "LangfusePromptCache")
+
+PromptKey = tuple[str, int | None]
+
+
+@dataclass(frozen=True)
+class CachedPrompt:
+    """A prompt fetched from Langfuse (or restored from the last known copy)."""
+
+    name: str
+    version: int | None
+    langchain_prompt: str
+    langfuse_prompt: Any | None
+    fetched_at: float
+
+    @property
+    def is_fallback(self) -> bool:
+        """Whether the prompt was restored without reaching Langfuse."""
+        return self.langfuse_prompt is None
+
+
+class LangfusePromptCache:
+    """In-memory Langfuse prompt cache with background refresh."""
+
+    def __init__(
+        self,
+        *,
+        fetch: Callable[[str, int | None], Any],
+        ttl_seconds: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize instance.
+
+        `fetch` receives the prompt name and version and returns a Langfuse
+        prompt client (anything exposing `get_langchain_prompt()`).
+        """
+        self._fetch = fetch
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict[PromptKey, CachedPrompt] = {}
+        self._refreshing: set[PromptKey] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_snapshot_label(key: PromptKey) -> str:
+        version = key[1]
+        return str(version) if version is not None else "latest"
+
+    def get(self, name: str, version: int | None = None) -> CachedPrompt:
+        """Get a prompt, fetching it on the first use only."""
+        key = (name, version)
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._load(key)
+
+        is_stale = (
+            version is None and self._clock() - entry.fetched_at > self._ttl_seconds
+        )
+        if is_stale or entry.is_fallback:
+            self._refresh_in_background(key)
+
+        return entry
+
+    def clear(self) -> None:
+        """Forget every in-memory prompt."""
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, key: PromptKey) -> CachedPrompt:
+        try:
+            return self._store(key, self._fetch(*key))
+        except Exception:
+            last_known = LangfusePromptSnapshot.objects.filter(
+                name=key[0], label=self._get_snapshot_label(key)
+            ).first()
+            if last_known is None:
+                raise
+
+            logger.warning(
+                "Langfuse unreachable, using last known prompt",
+                prompt_name=key[0],
+                version=key[1],
+            )
+            entry = CachedPrompt(
+                name=key[0],
+                version=last_known.version,
+                langchain_prompt=last_known.langchain_prompt,
+                langfuse_prompt=None,
+                fetched_at=self._clock(),
+            )
+            with self._lock:
+                self._entries[key] = entry
+            return entry
+
+    def _store(self, key: PromptKey, langfuse_prompt: Any) -> CachedPrompt:
+        entry = CachedPrompt(
+            name=key[0],
+            version=getattr(langfuse_prompt, "version", key[1]),
+            langchain_prompt=langfuse_prompt.get_langchain_prompt(),
+            langfuse_prompt=langfuse_prompt,
+            fetched_at=self._clock(),
+        )
+        with self._lock:
+            previous_entry = self._entries.get(key)
+            self._entries[key] = entry
+
+        # Refreshes mostly fetch the same prompt, only changes are written
+        if (
+            previous_entry is not None
+            and not previous_entry.is_fallback
+            and previous_entry.version == entry.version
+            and previous_entry.langchain_prompt == entry.langchain_prompt
+        ):
+            return entry
+        try:
+            LangfusePromptSnapshot.objects.update_or_create(
+                name=key[0],
+                label=self._get_snapshot_label(key),
+                defaults={
+                    "version": entry.version,
+                    "langchain_prompt": entry.langchain_prompt,
+                },
+            )
+        except Exception:
+            # The last known copy is best effort, the in-memory entry is still valid
+            logger.warning(
+                "Failed to persist langfuse prompt", prompt_name=key[0], exc_info=True
+            )
+        return entry
+
+    def _refresh_in_background(self, key: PromptKey) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        threading.Thread(
+            target=self._refresh_in_thread, args=(key,), daemon=True
+        ).start()
+
+    def _refresh(self, key: PromptKey) -> None:
+        try:
+            self._store(key, self._fetch(*key))
+        except Exception:
+            # Keep serving the stale prompt, it will be retried on the next access
+            logger.warning(
+                "Failed to refresh langfuse prompt", prompt_name=key[0], exc_info=True
+            )
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refresh_in_thread(self, key: PromptKey) -> None:
+        try:
+            self._refresh(key)
+        finally:
+            # Every refresh runs in its own thread, with its own connection
+            connection.close()
@@ -0,0 +1,101 @@
+from unittest import mock
+
+import pytest
+
+from ai.models import LangfusePromptSnapshot
+from ai.services.prompt_cache import LangfusePromptCache
+
+pytestmark = pytest.mark.django_db
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MockLangfusePrompt:
+    def __init__(self, text: str, version: int = 1) -> None:
+        self.text = text
+        self.version = version
+
+    def get_langchain_prompt(self) -> str:
+        """Simulate `get_langchain_prompt`."""
+        return self.text
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def synchronous_refresh(prompt_cache: LangfusePromptCache) -> mock._patch:
+    return mock.patch.object(
+        prompt_cache, "_refresh_in_background", side_effect=prompt_cache._refresh
+    )
+
+
+def test_fetches_prompt_once(clock: FakeClock) -> None:
+    fetch = mock.Mock(return_value=MockLangfusePrompt("question {question}"))
+    prompt_cache = LangfusePromptCache(fetch=fetch, ttl_seconds=60, clock=clock)
+
+    prompt_cache.get("test")
+    cached_prompt = prompt_cache.get("test")
+
+    fetch.assert_called_once_with("test", None)
+    assert cached_prompt.langchain_prompt == "question {question}"
+
+
+def test_serves_stale_prompt_and_refreshes(clock: FakeClock) -> None:
+    fetch = mock.Mock(
+        side_effect=[MockLangfusePrompt("v1", 1), MockLangfusePrompt("v2", 2)]
+    )
+    prompt_cache = LangfusePromptCache(fetch=fetch, ttl_seconds=60, clock=clock)
+    prompt_cache.get("test")
+
+    clock.now = 61
+    with synchronous_refresh(prompt_cache):
+        stale_prompt = prompt_cache.get("test")
+
+    assert stale_prompt.langchain_prompt == "v1"
+    assert prompt_cache.get("test").langchain_prompt == "v2"
+
+
+def test_pinned_versions_are_not_refreshed(clock: FakeClock) -> None:
+    fetch = mock.Mock(return_value=MockLangfusePrompt("v3", 3))
+    prompt_cache = LangfusePromptCache(fetch=fetch, ttl_seconds=60, clock=clock)
+    prompt_cache.get("test", version=3)
+
+    clock.now = 3600
+    with synchronous_refresh(prompt_cache) as refresh_mock:
+        prompt_cache.get("test", version=3)
+
+    refresh_mock.assert_not_called()
+    fetch.assert_called_once_with("test", 3)
+
+
+def test_falls_back_to_last_known_prompt(clock: FakeClock) -> None:
+    LangfusePromptCache(
+        fetch=mock.Mock(return_value=MockLangfusePrompt("last known", 7)), clock=clock
+    ).get("test")
+
+    offline_cache = LangfusePromptCache(
+        fetch=mock.Mock(side_effect=ConnectionError()), clock=clock
+    )
+    cached_prompt = offline_cache.get("test")
+
+    assert cached_prompt.langchain_prompt == "last known"
+    assert cached_prompt.version == 7
+    assert cached_prompt.is_fallback
+    assert LangfusePromptSnapshot.objects.get(name="test", label="latest").version == 7
+
+
+def test_raises_without_last_known_prompt(clock: FakeClock) -> None:
+    prompt_cache = LangfusePromptCache(
+        fetch=mock.Mock(side_effect=ConnectionError()), clock=clock
+    )
+
+    with pytest.raises(ConnectionError):
+        prompt_cache.get("test")
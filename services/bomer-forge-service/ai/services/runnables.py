@@ -2,18 +2,34 @@ from langchain_openai.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langfuse import Langfuse
 from langfuse.callback import CallbackHandler as LangfuseCallbackHandler
-from core.db_constants import constants
+from ai.services.prompt_cache import LangfusePromptCache
+from core.constants import LANGFUSE_PROMPT_CACHE_TTL_SECONDS
+from core.db_constants import DBConstants, constants
 
 langfuse: Langfuse | None = None
 langfuse_callback_handler: LangfuseCallbackHandler = None
 
+LANGFUSE_CONSTANTS = ("LANGFUSE_HOST", "LANGFUSE_PUBLIC_KEY", "LANGFUSE_SECRET_KEY")
 
-# NOTE: This ensures a signle instance of Langfuse is used throughout the application
-# But it does not ensure that the instance is refreshed with the latest values from the database.
-# Restart the service if the langfuse keys are updated in the database.
+
+@constants.subscribe
+def reset_langfuse_clients(old_values: DBConstants, new_values: DBConstants) -> None:
+    """Rebuild the Langfuse clients on their next use when their keys change."""
+    global langfuse, langfuse_callback_handler
+    if any(
+        getattr(old_values, name) != getattr(new_values, name)
+        for name in LANGFUSE_CONSTANTS
+    ):
+        langfuse = None
+        langfuse_callback_handler = None
+
+
+# NOTE: This ensures a single instance of Langfuse is used throughout the application.
+# The instance is rebuilt by `reset_langfuse_clients` when the keys change.
 def get_langfuse_instance() -> Langfuse:
     """Get a Langfuse instance."""
     global langfuse
+    constants.refresh_if_outdated()
     if langfuse is None:
         constant_values = constants.values()
         langfuse_kwargs = {
@@ -29,6 +45,7 @@ def get_langfuse_instance() -> Langfuse:
 def get_langfuse_callback_handler() -> LangfuseCallbackHandler:
     """Get a Langfuse callback handler."""
     global langfuse_callback_handler
+    constants.refresh_if_outdated()
     if langfuse_callback_handler is None:
         constant_values = constants.values()
         langfuse_callback_handler_kwargs = {
@@ -48,15 +65,30 @@ def get_gpt(*, model: str = "gpt-4o-2024-08-06") -> ChatOpenAI:
     return ChatOpenAI(model=model, temperature=0)
 
 
+def _fetch_langfuse_prompt(prompt_name: str, version: int | None):
+    return get_langfuse_instance().get_prompt(prompt_name, version=version)
+
+
+langfuse_prompt_cache = LangfusePromptCache(
+    fetch=_fetch_langfuse_prompt,
+    ttl_seconds=LANGFUSE_PROMPT_CACHE_TTL_SECONDS,
+)
+
+
 def langchain_prompt_from_langfuse(
     *, prompt_name: str, version: int | None = None
 ) -> ChatPromptTemplate:
-    """Get a langchain prompt from text."""
-    langfuse_prompt = get_langfuse_instance().get_prompt(prompt_name, version=version)
+    """Get a langchain prompt from the locally cached langfuse prompt.
+
+    Pass `version` to pin the prompt, otherwise the latest production prompt is
+    used and refreshed in the background.
+    """
+    cached_prompt = langfuse_prompt_cache.get(prompt_name, version=version)
     template = ChatPromptTemplate.from_template(
-        langfuse_prompt.get_langchain_prompt(),
+        cached_prompt.langchain_prompt,
     )
-    template.metadata = {"langfuse_prompt": langfuse_prompt}
+    if cached_prompt.langfuse_prompt is not None:
+        template.metadata = {"langfuse_prompt": cached_prompt.langfuse_prompt}
     return template
 
 
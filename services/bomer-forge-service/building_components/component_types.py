@@ -0,0 +1,113 @@
+"""
+Hierarchy of the building component types.
+
+Components store a flat `BuildingComponentType`. The hierarchy the types
+used to have in the database ("Foundation" → "Footing" → "Continuous" /
+"Isolated") is kept here, in memory, so a filter on any node of the tree
+resolves to an `IN (...)` lookup on the type column without a query.
+"""
+
+from dataclasses import dataclass, field
+
+from building_components.models import BuildingComponentType
+
+
+class UnknownComponentTypeError(ValueError):
+    """
+    Raised when a name or path is not in the component type tree.
+    """
+
+
+@dataclass(frozen=True)
+class ComponentTypeNode:
+    """
+    This class represents a node of the component type tree.
+
+    `type` is the type stored for components of this node, or None for
+    grouping nodes that only exist to hold other nodes.
+    """
+
+    name: str
+    type: BuildingComponentType | None = None
+    children: tuple["ComponentTypeNode", ...] = ()
+    path: str = field(default="", compare=False)
+
+
+COMPONENT_TYPE_TREE = (
+    ComponentTypeNode(
+        name="Foundation",
+        children=(
+            ComponentTypeNode(
+                name="Footing",
+                type=BuildingComponentType.FOOTING,
+                children=(
+                    ComponentTypeNode(
+                        name="Continuous", type=BuildingComponentType.FOOTING
+                    ),
+                    ComponentTypeNode(
+                        name="Isolated", type=BuildingComponentType.FOOTING
+                    ),
+                ),
+            ),
+        ),
+    ),
+    ComponentTypeNode(name="Column", type=BuildingComponentType.COLUMN),
+    ComponentTypeNode(name="Beam", type=BuildingComponentType.BEAM),
+    ComponentTypeNode(name="Slab", type=BuildingComponentType.SLAB),
+)
+
+
+class ComponentTypeTree:
+    """
+    Component type tree indexed by name and path, built once per process.
+
+    Names and paths ("Foundation/Footing/Isolated") are case insensitive, so
+    the stored type values ("FOOTING") resolve to their node as well.
+    """
+
+    def __init__(self, roots: tuple[ComponentTypeNode, ...]):
+        self._nodes: dict[str, ComponentTypeNode] = {}
+        self._types: dict[str, list[BuildingComponentType]] = {}
+        for root in roots:
+            self._index(root, parent_path="")
+
+    def _index(
+        self, node: ComponentTypeNode, *, parent_path: str
+    ) -> set[BuildingComponentType]:
+        path = f"{parent_path}/{node.name}" if parent_path else node.name
+        node = ComponentTypeNode(
+            name=node.name, type=node.type, children=node.children, path=path
+        )
+
+        types = {node.type} if node.type else set()
+        for child in node.children:
+            types |= self._index(child, parent_path=path)
+
+        for key in {node.name.lower(), path.lower()}:
+            if key in self._nodes:
+                msg = f"Duplicated component type name: {node.name}"
+                raise ValueError(msg)
+            self._nodes[key] = node
+            self._types[key] = sorted(types)
+        return types
+
+    def get(self, name_or_path: str) -> ComponentTypeNode:
+        """
+        Get a node by its name or path.
+        """
+        try:
+            return self._nodes[name_or_path.lower()]
+        except KeyError as e:
+            msg = f"Unknown component type: {name_or_path}"
+            raise UnknownComponentTypeError(msg) from e
+
+    def get_types(self, name_or_path: str) -> list[BuildingComponentType]:
+        """
+        Get the stored types of a node and all its descendants, to filter
+        components with `type__in`.
+        """
+        self.get(name_or_path)
+        return self._types[name_or_path.lower()]
+
+
+component_type_tree = ComponentTypeTree(COMPONENT_TYPE_TREE)
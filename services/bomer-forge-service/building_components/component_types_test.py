@@ -0,0 +1,42 @@
+import pytest
+
+from building_components.component_types import (
+    ComponentTypeNode,
+    ComponentTypeTree,
+    UnknownComponentTypeError,
+    component_type_tree,
+)
+from building_components.models import BuildingComponentType
+
+
+def test_get_by_name_path_and_stored_type() -> None:
+    node = component_type_tree.get("Isolated")
+
+    assert node.path == "Foundation/Footing/Isolated"
+    assert component_type_tree.get("foundation/footing/isolated") is node
+    assert component_type_tree.get(BuildingComponentType.COLUMN).name == "Column"
+
+
+def test_get_types_expands_descendants() -> None:
+    assert component_type_tree.get_types("Foundation") == [
+        BuildingComponentType.FOOTING
+    ]
+    assert component_type_tree.get_types("Column") == [BuildingComponentType.COLUMN]
+
+
+def test_raises_for_unknown_type() -> None:
+    with pytest.raises(UnknownComponentTypeError):
+        component_type_tree.get_types("Wall")
+
+
+def test_rejects_duplicated_names() -> None:
+    with pytest.raises(ValueError, match="Duplicated"):
+        ComponentTypeTree(
+            (
+                ComponentTypeNode(name="Column", type=BuildingComponentType.COLUMN),
+                ComponentTypeNode(
+                    name="Other",
+                    children=(ComponentTypeNode(name="Column"),),
+                ),
+            )
+        )
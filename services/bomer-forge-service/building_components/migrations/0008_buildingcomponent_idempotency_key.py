@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('building_components', '0007_remove_buildingcomponent_floor_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='buildingcomponent',
+            name='idempotency_key',
+            field=models.CharField(blank=True, help_text='Key of the processing step that created the component', max_length=255, null=True, unique=True),
+        ),
+    ]
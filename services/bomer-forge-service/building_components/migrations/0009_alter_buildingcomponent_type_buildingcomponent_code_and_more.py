@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-19 12:05
+
+import django.db.models.fields.json
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('building_components', '0008_buildingcomponent_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='buildingcomponent',
+            name='type',
+            field=models.CharField(choices=[('FOOTING', 'Footing'), ('COLUMN', 'Column'), ('BEAM', 'Beam'), ('SLAB', 'Slab')], db_index=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='buildingcomponent',
+            name='code',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=django.db.models.fields.json.KeyTextTransform('code', 'component_data'), output_field=models.CharField(max_length=255)),
+        ),
+        migrations.AddField(
+            model_name='buildingcomponent',
+            name='steel_weight',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.fields.json.KeyTextTransform('steel_weight', django.db.models.fields.json.KeyTransform('bom', 'component_data')), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='buildingcomponent',
+            name='concrete_volume',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.fields.json.KeyTextTransform('concrete_volume', django.db.models.fields.json.KeyTransform('bom', 'component_data')), models.FloatField()), output_field=models.FloatField()),
+        ),
+    ]
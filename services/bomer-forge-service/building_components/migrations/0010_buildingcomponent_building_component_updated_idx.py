@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-19 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('building_components', '0009_alter_buildingcomponent_type_buildingcomponent_code_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='buildingcomponent',
+            index=models.Index(fields=['updated_at'], name='building_component_updated_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.fields.json import KeyTextTransform, KeyTransform
+from django.db.models.functions import Cast
 
 from core.base_model import BaseModel
 from treebeard.mp_tree import MP_Node
@@ -30,7 +32,47 @@ class BuildingComponent(BaseModel):
         null=True,
         blank=True,
     )
-    type = models.CharField(max_length=255, choices=BuildingComponentType.choices)
+    type = models.CharField(
+        max_length=255, choices=BuildingComponentType.choices, db_index=True
+    )
+    idempotency_key = models.CharField(
+        help_text="Key of the processing step that created the component",
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+    )
+    # Columns generated from `component_data`, so the hot JSON paths are indexed
+    code = models.GeneratedField(
+        expression=KeyTextTransform("code", "component_data"),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+        db_index=True,
+    )
+    steel_weight = models.GeneratedField(
+        expression=Cast(
+            KeyTextTransform("steel_weight", KeyTransform("bom", "component_data")),
+            models.FloatField(),
+        ),
+        output_field=models.FloatField(),
+        db_persist=True,
+        db_index=True,
+    )
+    concrete_volume = models.GeneratedField(
+        expression=Cast(
+            KeyTextTransform("concrete_volume", KeyTransform("bom", "component_data")),
+            models.FloatField(),
+        ),
+        output_field=models.FloatField(),
+        db_persist=True,
+        db_index=True,
+    )
+
+    class Meta:
+        indexes = [
+            # Changes of the components of a design since a cursor
+            models.Index(fields=["updated_at"], name="building_component_updated_idx"),
+        ]
 
     def __str__(self):
         """Return a string representation of the building component."""
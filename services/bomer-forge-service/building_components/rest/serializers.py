@@ -1,13 +1,70 @@
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
 from building_components.models import BuildingComponent, BuildingComponentType
 
+SUMMARY_REPRESENTATION = "summary"
+
+
+def get_requested_fields(request: Request) -> set[str] | None:
+    """
+    Get the fields of the `fields` query parameter (e.g. `?fields=uuid,type`),
+    or None to serialize all of them.
+    """
+    fields = request.query_params.get("fields")
+    if not fields:
+        return None
+    return {field.strip() for field in fields.split(",") if field.strip()}
+
+
+def is_summary_requested(request: Request) -> bool:
+    """
+    Whether the compact summary representation was requested with
+    `?representation=summary`.
+    """
+    return request.query_params.get("representation") == SUMMARY_REPRESENTATION
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Only serializes the fields of `context["fields"]`, also when nested.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested_fields = self.context.get("fields")
+        if not requested_fields:
+            return fields
 
-class BuildingComponentSerializer(serializers.ModelSerializer):
+        unknown_fields = requested_fields - fields.keys()
+        if unknown_fields:
+            raise ValidationError(
+                {"fields": f"Unknown fields: {', '.join(sorted(unknown_fields))}"}
+            )
+        return {
+            name: field for name, field in fields.items() if name in requested_fields
+        }
+
+
+class BuildingComponentSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = BuildingComponent
         fields = "__all__"
 
 
+class BuildingComponentSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact representation of a building component, without its component data.
+    """
+
+    class Meta:
+        model = BuildingComponent
+        fields = ["uuid", "type", "code", "steel_weight", "concrete_volume"]
+
+
 class CreateBuildingComponentSerializer(serializers.Serializer):
     draft_building_design_id = serializers.UUIDField()
     type = serializers.ChoiceField(choices=BuildingComponentType.choices)
@@ -0,0 +1,77 @@
+import pytest
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from building_components.models import BuildingComponent, BuildingComponentType
+from building_components.rest.serializers import (
+    BuildingComponentSerializer,
+    BuildingComponentSummarySerializer,
+    get_requested_fields,
+    is_summary_requested,
+)
+
+
+def make_request(query_string: str) -> Request:
+    return Request(APIRequestFactory().get(f"/building-components/?{query_string}"))
+
+
+@pytest.fixture()
+def building_component() -> BuildingComponent:
+    building_component = BuildingComponent.objects.create(
+        type=BuildingComponentType.COLUMN,
+        component_data={"code": "P1", "bom": {"steel_weight": 1.5}},
+    )
+    building_component.refresh_from_db()
+    return building_component
+
+
+@pytest.mark.parametrize(
+    "query_string, expected_fields",
+    [
+        ("fields=uuid,type", {"uuid", "type"}),
+        ("fields= uuid , ,type", {"uuid", "type"}),
+        ("fields=", None),
+        ("", None),
+    ],
+)
+def test_get_requested_fields(query_string, expected_fields):
+    assert get_requested_fields(make_request(query_string)) == expected_fields
+
+
+def test_is_summary_requested():
+    assert is_summary_requested(make_request("representation=summary"))
+    assert not is_summary_requested(make_request(""))
+
+
+@pytest.mark.django_db
+def test_building_component_serializer_sparse_fieldset(building_component):
+    serializer = BuildingComponentSerializer(
+        building_component, context={"fields": {"uuid", "type"}}
+    )
+
+    assert serializer.data == {
+        "uuid": str(building_component.uuid),
+        "type": "COLUMN",
+    }
+
+
+@pytest.mark.django_db
+def test_building_component_serializer_unknown_field(building_component):
+    serializer = BuildingComponentSerializer(
+        building_component, context={"fields": {"uuid", "unknown"}}
+    )
+
+    with pytest.raises(ValidationError):
+        serializer.data
+
+
+@pytest.mark.django_db
+def test_building_component_summary_serializer(building_component):
+    assert BuildingComponentSummarySerializer(building_component).data == {
+        "uuid": str(building_component.uuid),
+        "type": "COLUMN",
+        "code": "P1",
+        "steel_weight": 1.5,
+        "concrete_volume": None,
+    }
@@ -8,8 +8,13 @@ from rest_framework.viewsets import ModelViewSet
 from building_components.models import BuildingComponent
 from building_components.rest.serializers import (
     BuildingComponentSerializer,
+    BuildingComponentSummarySerializer,
     CreateBuildingComponentSerializer,
+    get_requested_fields,
+    is_summary_requested,
 )
+from core.rest.pagination import OptionalCursorPagination
+from core.rest.renderers import FAST_JSON_RENDERER_CLASSES
 
 logger = structlog.get_logger(__name__)
 
@@ -18,6 +23,33 @@ class BuildingComponentViewSet(ModelViewSet):
     queryset = BuildingComponent.objects.all()
     serializer_class = BuildingComponentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalCursorPagination
+    renderer_classes = FAST_JSON_RENDERER_CLASSES
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve") and is_summary_requested(self.request):
+            return queryset.defer("component_data", "description")
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in ("list", "retrieve") and is_summary_requested(self.request):
+            return BuildingComponentSummarySerializer
+        return super().get_serializer_class()
+
+    def perform_update(self, serializer):
+        from draft_building_designs.services.footing_reference_index import (
+            assign_footings_after_components_change,
+        )
+
+        building_component = serializer.save()
+        assign_footings_after_components_change([building_component])
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ("list", "retrieve"):
+            context["fields"] = get_requested_fields(self.request)
+        return context
 
     @action(
         detail=False,
@@ -29,10 +61,14 @@ class BuildingComponentViewSet(ModelViewSet):
         Create a new building component.
         """
         from draft_building_designs.models import DraftBuildingDesign
+        from draft_building_designs.services.footing_reference_index import (
+            assign_footings_after_components_change,
+        )
 
         serializer = CreateBuildingComponentSerializer(data=request.data, many=True)
         serializer.is_valid(raise_exception=True)
 
+        building_components = []
         for component in serializer.validated_data:
             logger.info("Creating building component", component=component)
             draft_building_design = DraftBuildingDesign.objects.get(
@@ -49,6 +85,9 @@ class BuildingComponentViewSet(ModelViewSet):
                 building_design_uuid=str(draft_building_design.uuid),
                 building_component_uuid=str(building_component.uuid),
             )
+            building_components.append(building_component)
+
+        assign_footings_after_components_change(building_components)
 
         return Response(
             {"message": "Building components created successfully"},
@@ -0,0 +1,130 @@
+"""
+Batched write-back of computed bills of materials.
+"""
+
+import json
+from typing import Any
+
+import structlog
+from django.db import transaction
+from django.db.models import F, Func, JSONField, Q, QuerySet, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from building_components.models import BuildingComponent
+from core.constants import BOM_RESULT_SINK_BATCH_SIZE
+
+logger = structlog.get_logger(__name__)
+
+BOM_COMPONENT_DATA_KEY = "bom"
+
+
+class JSONBSet(Func):
+    """
+    Postgres `jsonb_set` setting a single top level key of a JSON field.
+    """
+
+    function = "jsonb_set"
+    output_field = JSONField()
+
+    def __init__(self, field_name: str, key: str, value: Any, **extra: Any):
+        super().__init__(
+            Coalesce(F(field_name), Value({}, output_field=JSONField())),
+            Value(f"{{{key}}}"),
+            Cast(Value(json.dumps(value)), output_field=JSONField()),
+            Value(True),
+            **extra,
+        )
+
+
+def without_bom(
+    queryset: QuerySet[BuildingComponent],
+) -> QuerySet[BuildingComponent]:
+    """
+    Filter the components that don't have a BOM yet, to resume partial runs.
+    """
+    return queryset.filter(
+        Q(component_data__isnull=True)
+        | Q(**{f"component_data__{BOM_COMPONENT_DATA_KEY}__isnull": True})
+    )
+
+
+class BomResultSink:
+    """
+    Accumulates computed BOMs and writes them in batches.
+
+    Each flush is a single `UPDATE` setting the `bom` key of `component_data`
+    with `jsonb_set`, so the other keys of the component are left untouched.
+    Writing the same BOM twice is harmless, which makes interrupted runs
+    safe to resume. Use it as a context manager to flush what is left on
+    exit, including when the run fails midway.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = BOM_RESULT_SINK_BATCH_SIZE,
+        key: str = BOM_COMPONENT_DATA_KEY,
+    ):
+        self.batch_size = batch_size
+        self.key = key
+        self.written_count = 0
+        self._pending: dict[str, tuple[BuildingComponent, dict]] = {}
+
+    def __enter__(self) -> "BomResultSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def add(self, building_component: BuildingComponent, bom: dict) -> None:
+        """
+        Queue the BOM of a component, flushing when the batch is full.
+        """
+        self._pending[str(building_component.uuid)] = (building_component, bom)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write the queued BOMs, returning how many components were updated.
+        """
+        if not self._pending:
+            return 0
+
+        pending = list(self._pending.values())
+        self._pending = {}
+
+        now = timezone.now()
+        components = []
+        previous_component_data = []
+        for building_component, bom in pending:
+            previous_component_data.append(building_component.component_data)
+            building_component.component_data = JSONBSet(
+                "component_data", self.key, bom
+            )
+            # bulk_update skips auto_now fields
+            building_component.updated_at = now
+            components.append(building_component)
+
+        written = False
+        try:
+            with transaction.atomic():
+                BuildingComponent.objects.bulk_update(
+                    components, ["component_data", "updated_at"]
+                )
+            written = True
+        finally:
+            # Replace the expressions so the instances stay usable in memory
+            for (building_component, bom), component_data in zip(
+                pending, previous_component_data
+            ):
+                building_component.component_data = (
+                    {**(component_data or {}), self.key: bom}
+                    if written
+                    else component_data
+                )
+
+        self.written_count += len(components)
+        logger.info("Flushed BOM results", components_count=len(components))
+        return len(components)
@@ -0,0 +1,63 @@
+import pytest
+
+from building_components.models import BuildingComponent, BuildingComponentType
+from building_components.services.bom_result_sink import BomResultSink, without_bom
+
+BOM = {"steel_weight": 10.0, "concrete_volume": 1.5, "rationale": "rationale"}
+
+
+def create_component(component_data: dict | None = None) -> BuildingComponent:
+    return BuildingComponent.objects.create(
+        type=BuildingComponentType.COLUMN, component_data=component_data
+    )
+
+
+@pytest.mark.django_db()
+def test_flushes_in_batches() -> None:
+    components = [create_component({"code": str(i)}) for i in range(3)]
+    sink = BomResultSink(batch_size=2)
+
+    for component in components:
+        sink.add(component, BOM)
+
+    assert sink.written_count == 2
+    assert sink.flush() == 1
+    assert sink.written_count == 3
+
+
+@pytest.mark.django_db()
+def test_sets_bom_and_keeps_component_data() -> None:
+    component = create_component({"code": "P1"})
+    empty_component = create_component()
+
+    with BomResultSink() as sink:
+        sink.add(component, BOM)
+        sink.add(empty_component, BOM)
+
+    component.refresh_from_db()
+    empty_component.refresh_from_db()
+    assert component.component_data == {"code": "P1", "bom": BOM}
+    assert empty_component.component_data == {"bom": BOM}
+
+
+@pytest.mark.django_db()
+def test_writing_twice_is_idempotent() -> None:
+    component = create_component({"code": "P1"})
+
+    for _ in range(2):
+        with BomResultSink() as sink:
+            sink.add(component, BOM)
+
+    component.refresh_from_db()
+    assert component.component_data == {"code": "P1", "bom": BOM}
+
+
+@pytest.mark.django_db()
+def test_without_bom_skips_computed_components() -> None:
+    pending = create_component({"code": "P1"})
+    empty = create_component()
+    create_component({"code": "P2", "bom": BOM})
+
+    queryset = without_bom(BuildingComponent.objects.all())
+
+    assert set(queryset) == {pending, empty}
@@ -6,7 +6,13 @@ from typing import Any
 
 import structlog
 from celery import Celery
-from celery.signals import setup_logging, task_failure, task_internal_error
+from celery.schedules import crontab
+from celery.signals import (
+    setup_logging,
+    task_failure,
+    task_internal_error,
+    worker_init,
+)
 
 # from ddtrace import config as ddtrace_config
 # from ddtrace import patch
@@ -32,6 +38,10 @@ class QueuesNames(StrEnum):
     """Celery queues names."""
 
     FORGE_USER = "forge_user"
+    # Short jobs a user is waiting for (a single component or sheet)
+    FORGE_INTERACTIVE = "forge_interactive"
+    # Whole-design runs, sharded by project (see `celery_worker.queues`)
+    FORGE_BULK = "forge_bulk"
     DEFAULT = "celery"
 
 
@@ -48,7 +58,12 @@ app.conf.task_track_started = True
 app.conf.task_time_limit = 660  # 11 minutes
 app.conf.task_soft_time_limit = 600  # 10 minutes
 
+# Exact task names take precedence over the globs. Bulk tasks are sent to the
+# project's bulk shard with `celery_worker.queues.dispatch_bulk_task`.
 app.conf.task_routes = {
+    "draft_building_designs.tasks.generate_bill_of_materials_for_building_component_task": {
+        "queue": QueuesNames.FORGE_INTERACTIVE
+    },
     "draft_building_designs.tasks.*": {"queue": QueuesNames.FORGE_USER},
     "building_components.tasks.*": {"queue": QueuesNames.FORGE_USER},
 }
@@ -62,7 +77,13 @@ app.conf.task_routes = {
 #   },
 # }
 
-app.conf.beat_schedule = {}
+app.conf.beat_schedule = {
+    # Keeps the reads of the components changes free of deletes
+    "prune-components-tombstones-daily": {
+        "task": "draft_building_designs.tasks.prune_components_tombstones_task",
+        "schedule": crontab(hour=3, minute=0),
+    },
+}
 
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
@@ -71,10 +92,39 @@ app.autodiscover_tasks()
 @setup_logging.connect
 def receiver_setup_logging(*_args: Any, **_kwargs: Any) -> None:
     """Configure logging for celery."""
-    configure_logging()
+    from core.constants import (
+        LOG_ASYNC_HANDLER,
+        LOG_CALLSITE_PARAMETERS,
+        LOG_RATE_LIMITS,
+        LOG_SAMPLING_RATES,
+    )
+
+    configure_logging(
+        callsite_parameters=LOG_CALLSITE_PARAMETERS,
+        async_handler=LOG_ASYNC_HANDLER,
+        sampling_rates=LOG_SAMPLING_RATES,
+        rate_limits=LOG_RATE_LIMITS,
+    )
     logger.info("Celery logging configured")
 
 
+@worker_init.connect
+def receiver_preload_prompts(*_args: Any, **_kwargs: Any) -> None:
+    """Load the prompt registry before the worker starts consuming tasks."""
+    from draft_building_designs.prompts.registry import prompt_registry
+
+    prompt_registry.load()
+
+
+@worker_init.connect
+def receiver_warm_up_modules(*_args: Any, **_kwargs: Any) -> None:
+    """Import the heavy modules the services load lazily, before forking."""
+    from core.constants import CELERY_WORKER_WARM_UP_MODULES
+    from core.utils.lazy_import import warm_up_lazy_modules
+
+    warm_up_lazy_modules(CELERY_WORKER_WARM_UP_MODULES)
+
+
 @task_failure.connect
 @task_internal_error.connect
 def handle_task_failure(
@@ -5,23 +5,27 @@ import subprocess
 from typing import Any
 
 import structlog
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandParser
 from django.utils import autoreload
 
-from celery_worker.celery import QueuesNames
+from celery_worker.queues import WORKER_POOLS
 
 logger = structlog.getLogger(__name__)
 
 
-def restart_celery(*, queues: list[str] | None = None) -> None:
-    """Restart celery."""
+def restart_celery(*, pools: list[str]) -> None:
+    """Restart celery, with a worker per pool."""
     cmd = 'pkill -f "celery worker"'
     # ruff: noqa: S603
     subprocess.run(shlex.split(cmd))
-    subscribe_queues = ",".join(queues) if queues else "celery"
-    cmd = f"celery -A celery_worker.celery worker --loglevel=info --pool threads --queues={subscribe_queues}"
-    # ruff: noqa: S603
-    subprocess.run(shlex.split(cmd))
+    cmd = "celery -A celery_worker.celery worker --loglevel=info --pool threads"
+    workers = [
+        # ruff: noqa: S603
+        subprocess.Popen([*shlex.split(cmd), *WORKER_POOLS[pool].get_worker_args()])
+        for pool in pools
+    ]
+    for worker in workers:
+        worker.wait()
 
 
 class Command(BaseCommand):
@@ -29,10 +33,18 @@ class Command(BaseCommand):
 
     help = __doc__
 
-    def handle(self, *_: Any, **__: Any) -> None:
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the worker pools argument."""
+        parser.add_argument(
+            "--pools",
+            nargs="+",
+            choices=list(WORKER_POOLS),
+            default=list(WORKER_POOLS),
+            help="Worker pools to start, all of them by default.",
+        )
+
+    def handle(self, *_: Any, pools: list[str], **__: Any) -> None:
         """Start celery in a way such that it auto restarts on code changing."""
-        logger.info("Starting celery worker with autoreload...")
+        logger.info("Starting celery worker with autoreload...", pools=pools)
 
-        autoreload.run_with_reloader(
-            restart_celery, queues=[QueuesNames.DEFAULT, QueuesNames.FORGE_USER]
-        )
+        autoreload.run_with_reloader(restart_celery, pools=pools)
@@ -0,0 +1,91 @@
+"""Celery queues and worker pools.
+
+Work is split between an interactive queue, for short jobs a user is waiting
+for, and bulk queues, for whole-design runs. Bulk tasks are spread over
+`BULK_QUEUE_SHARDS` queues by project and the bulk workers consume every
+shard in turn, so a project submitting a large batch only delays the
+projects sharing its shard.
+"""
+
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+from celery import Task
+from celery.result import AsyncResult
+
+from celery_worker.celery import QueuesNames
+from core.constants import (
+    BULK_QUEUE_SHARDS,
+    BULK_WORKER_CONCURRENCY,
+    BULK_WORKER_PREFETCH_MULTIPLIER,
+    INTERACTIVE_WORKER_CONCURRENCY,
+    INTERACTIVE_WORKER_PREFETCH_MULTIPLIER,
+)
+
+__all__ = (
+    "WORKER_POOLS",
+    "WorkerPool",
+    "dispatch_bulk_task",
+    "get_bulk_queue_name",
+    "get_bulk_queues_names",
+)
+
+
+def get_bulk_queue_name(tenant: str, *, shards: int = BULK_QUEUE_SHARDS) -> str:
+    """Get the bulk queue shard of a tenant (a project)."""
+    shard = zlib.crc32(tenant.encode()) % shards
+    return f"{QueuesNames.FORGE_BULK}.{shard}"
+
+
+def get_bulk_queues_names(*, shards: int = BULK_QUEUE_SHARDS) -> list[str]:
+    """Get the names of every bulk queue shard."""
+    return [f"{QueuesNames.FORGE_BULK}.{shard}" for shard in range(shards)]
+
+
+def dispatch_bulk_task(
+    task: Task, *, tenant: str, kwargs: dict[str, Any], **options: Any
+) -> AsyncResult:
+    """Send a bulk task to the queue shard of its tenant."""
+    return task.apply_async(kwargs=kwargs, queue=get_bulk_queue_name(tenant), **options)
+
+
+@dataclass(frozen=True)
+class WorkerPool:
+    """A group of workers consuming the same queues with the same settings."""
+
+    name: str
+    queues: list[str]
+    concurrency: int
+    prefetch_multiplier: int
+
+    def get_worker_args(self) -> list[str]:
+        """Get the `celery worker` arguments to start the pool."""
+        return [
+            f"--hostname={self.name}@%h",
+            f"--queues={','.join(self.queues)}",
+            f"--concurrency={self.concurrency}",
+            f"--prefetch-multiplier={self.prefetch_multiplier}",
+        ]
+
+
+WORKER_POOLS = {
+    "default": WorkerPool(
+        name="default",
+        queues=[QueuesNames.DEFAULT, QueuesNames.FORGE_USER],
+        concurrency=INTERACTIVE_WORKER_CONCURRENCY,
+        prefetch_multiplier=INTERACTIVE_WORKER_PREFETCH_MULTIPLIER,
+    ),
+    "interactive": WorkerPool(
+        name="interactive",
+        queues=[QueuesNames.FORGE_INTERACTIVE],
+        concurrency=INTERACTIVE_WORKER_CONCURRENCY,
+        prefetch_multiplier=INTERACTIVE_WORKER_PREFETCH_MULTIPLIER,
+    ),
+    "bulk": WorkerPool(
+        name="bulk",
+        queues=get_bulk_queues_names(),
+        concurrency=BULK_WORKER_CONCURRENCY,
+        prefetch_multiplier=BULK_WORKER_PREFETCH_MULTIPLIER,
+    ),
+}
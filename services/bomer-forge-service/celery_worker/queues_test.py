@@ -0,0 +1,25 @@
+from celery_worker.queues import (
+    WORKER_POOLS,
+    get_bulk_queue_name,
+    get_bulk_queues_names,
+)
+
+
+def test_bulk_queue_name_is_stable_per_tenant() -> None:
+    assert get_bulk_queue_name("project-a", shards=4) == get_bulk_queue_name(
+        "project-a", shards=4
+    )
+    assert get_bulk_queue_name("project-a", shards=4) in get_bulk_queues_names(shards=4)
+
+
+def test_bulk_queues_spread_tenants() -> None:
+    queues = {get_bulk_queue_name(f"project-{i}", shards=4) for i in range(100)}
+
+    assert queues == set(get_bulk_queues_names(shards=4))
+
+
+def test_worker_args() -> None:
+    args = WORKER_POOLS["interactive"].get_worker_args()
+
+    assert "--queues=forge_interactive" in args
+    assert any(arg.startswith("--prefetch-multiplier=") for arg in args)
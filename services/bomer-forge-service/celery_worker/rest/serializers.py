@@ -20,3 +20,15 @@ class CeleryTaskStatus(StrEnum):
 class CeleryTaskResultSerializer(serializers.Serializer):
     status = serializers.ChoiceField(choices=CeleryTaskStatus)
     result = serializers.JSONField()
+
+
+class CeleryTaskResultsRequestSerializer(serializers.Serializer):
+    task_ids = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        allow_empty=False,
+        max_length=200,
+    )
+
+
+class CeleryTaskResultItemSerializer(CeleryTaskResultSerializer):
+    task_id = serializers.CharField()
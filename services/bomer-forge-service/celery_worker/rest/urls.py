@@ -1,7 +1,7 @@
 """Celery Worker REST URLs"""
 
 from django.urls import path
-from .views import CeleryTaskResultView
+from .views import CeleryTaskResultView, CeleryTaskResultsView
 
 urlpatterns = [
     path(
@@ -9,4 +9,9 @@ urlpatterns = [
         CeleryTaskResultView.as_view(),
         name="celery-task-result",
     ),
+    path(
+        "celery-task-results/",
+        CeleryTaskResultsView.as_view(),
+        name="celery-task-results",
+    ),
 ]
@@ -1,8 +1,11 @@
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from celery_worker.celery import app
-from .serializers import CeleryTaskResultSerializer
-from django_celery_results.models import TaskResult
+from celery_worker.task_results import get_task_results
+from .serializers import (
+    CeleryTaskResultItemSerializer,
+    CeleryTaskResultSerializer,
+    CeleryTaskResultsRequestSerializer,
+)
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -10,17 +13,27 @@ logger = structlog.get_logger(__name__)
 
 class CeleryTaskResultView(APIView):
     def get(self, request, task_id):
-        state = app.AsyncResult(task_id).state
+        task_result = get_task_results([task_id])[task_id]
 
-        task = (
-            TaskResult.objects.only("status", "result").filter(task_id=task_id).first()
-        )
+        return Response(CeleryTaskResultSerializer(task_result).data)
+
+
+class CeleryTaskResultsView(APIView):
+    """
+    Get the status of many tasks in a single request.
+    """
+
+    def post(self, request):
+        serializer = CeleryTaskResultsRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Keep the requested order, without duplicates
+        task_ids = list(dict.fromkeys(serializer.validated_data["task_ids"]))
+        task_results = get_task_results(task_ids)
 
         return Response(
-            CeleryTaskResultSerializer(
-                {
-                    "status": state,
-                    "result": task.result if task else None,
-                }
+            CeleryTaskResultItemSerializer(
+                [{"task_id": task_id, **task_results[task_id]} for task_id in task_ids],
+                many=True,
             ).data
         )
@@ -0,0 +1,53 @@
+"""Batched lookup of celery task results.
+
+Every lookup resolves the requested tasks with a single `TaskResult` query.
+Results of finished tasks never change, so they are kept in the Django cache
+(and pruned by its timeout) and not queried again.
+"""
+
+from typing import Any
+
+from celery import states
+from django.core.cache import cache
+from django_celery_results.models import TaskResult
+
+__all__ = ("TASK_RESULT_CACHE_TTL_SECONDS", "get_task_results")
+
+TASK_RESULT_CACHE_TTL_SECONDS = 10 * 60
+
+
+def _get_cache_key(task_id: str) -> str:
+    return f"celery_task_result_{task_id}"
+
+
+def get_task_results(task_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Get the status and result of many tasks, keyed by task id.
+
+    Unknown tasks are `PENDING`, as celery reports them.
+    """
+    cached_results = cache.get_many([_get_cache_key(task_id) for task_id in task_ids])
+    task_results = {
+        task_id: cached_results[_get_cache_key(task_id)]
+        for task_id in task_ids
+        if _get_cache_key(task_id) in cached_results
+    }
+
+    missing_task_ids = [task_id for task_id in task_ids if task_id not in task_results]
+    if not missing_task_ids:
+        return task_results
+
+    ready_results = {}
+    for task_id, status, result in TaskResult.objects.filter(
+        task_id__in=missing_task_ids
+    ).values_list("task_id", "status", "result"):
+        task_results[task_id] = {"status": status, "result": result}
+        if status in states.READY_STATES:
+            ready_results[_get_cache_key(task_id)] = task_results[task_id]
+
+    if ready_results:
+        cache.set_many(ready_results, timeout=TASK_RESULT_CACHE_TTL_SECONDS)
+
+    for task_id in missing_task_ids:
+        task_results.setdefault(task_id, {"status": states.PENDING, "result": None})
+
+    return task_results
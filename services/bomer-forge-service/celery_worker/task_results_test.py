@@ -0,0 +1,33 @@
+import pytest
+from celery import states
+from django_celery_results.models import TaskResult
+
+from celery_worker.task_results import get_task_results
+
+
+@pytest.mark.django_db()
+def test_resolves_many_tasks_in_one_query(django_assert_num_queries) -> None:
+    TaskResult.objects.create(task_id="done", status=states.SUCCESS, result='"ok"')
+    TaskResult.objects.create(task_id="running", status=states.STARTED)
+
+    with django_assert_num_queries(1):
+        task_results = get_task_results(["done", "running", "unknown"])
+
+    assert task_results == {
+        "done": {"status": states.SUCCESS, "result": '"ok"'},
+        "running": {"status": states.STARTED, "result": None},
+        "unknown": {"status": states.PENDING, "result": None},
+    }
+
+
+@pytest.mark.django_db()
+def test_caches_finished_tasks_only(django_assert_num_queries) -> None:
+    TaskResult.objects.create(task_id="done", status=states.SUCCESS, result='"ok"')
+    TaskResult.objects.create(task_id="running", status=states.STARTED)
+    get_task_results(["done", "running"])
+
+    with django_assert_num_queries(0):
+        get_task_results(["done"])
+
+    with django_assert_num_queries(1):
+        get_task_results(["done", "running"])
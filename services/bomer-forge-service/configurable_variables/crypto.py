@@ -2,6 +2,7 @@
 
 import hashlib
 from base64 import urlsafe_b64encode
+from functools import lru_cache
 
 from cryptography.fernet import Fernet, MultiFernet
 
@@ -10,6 +11,7 @@ from core.types.environment import env
 __all__ = ["key_hash", "encrypt", "decrypt", "rotate"]
 
 
+@lru_cache(maxsize=8)
 def _transform_key(key: bytes) -> bytes:
     """Transform the given key into a hash with a fixed length."""
     return urlsafe_b64encode(hashlib.sha256(key).digest())
@@ -22,16 +24,20 @@ def key_hash(key: bytes | None = None) -> bytes:
     return _transform_key(key)
 
 
+@lru_cache(maxsize=8)
+def _get_fernet(hashed_key: bytes) -> Fernet:
+    """Get the Fernet instance of a key hash, built once per key."""
+    return Fernet(hashed_key)
+
+
 def encrypt(value: bytes) -> bytes:
     """Encrypt the given value using the DJANGO_SECRET_KEY."""
-    f = Fernet(key_hash())
-    return f.encrypt(value)
+    return _get_fernet(key_hash()).encrypt(value)
 
 
 def decrypt(value: bytes) -> str:
     """Decrypt the given value using the DJANGO_SECRET_KEY."""
-    f = Fernet(key_hash())
-    return str(f.decrypt(value), "utf-8")
+    return str(_get_fernet(key_hash()).decrypt(value), "utf-8")
 
 
 def rotate(value: bytes, old_key: bytes, new_key: bytes) -> bytes:
@@ -70,3 +70,12 @@ def test_rotate() -> None:
         decrypted_rotated_value = crypto.decrypt(rotated_value)
 
     assert decrypted_rotated_value == "value"
+
+
+def test_fernet_is_built_once_per_key() -> None:
+    with patch("configurable_variables.crypto.env") as mock_env:
+        mock_env.str.return_value = "key"
+        crypto.encrypt(b"value")
+        fernet = crypto._get_fernet(crypto.key_hash())
+
+        assert crypto._get_fernet(crypto.key_hash()) is fernet
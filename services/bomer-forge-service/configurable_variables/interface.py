@@ -1,8 +1,23 @@
-"""Public interface for the configurable_variables app."""
+"""Public interface for the configurable_variables app.
 
+Variables are loaded with a single query and each one is decrypted on its
+first read, once per process. Saving or deleting a variable increments a
+version in the database, which every process checks at most every
+CONFIGURABLE_VARIABLES_VERSION_CHECK_SECONDS, reloading its variables once
+the version changed.
+"""
+
+import threading
+import time
+
+from asgiref.sync import sync_to_async
 from cryptography.fernet import InvalidToken
 
-from configurable_variables.models import ConfigurableVariable
+from configurable_variables.models import (
+    ConfigurableVariable,
+    ConfigurableVariablesVersion,
+)
+from core.constants import CONFIGURABLE_VARIABLES_VERSION_CHECK_SECONDS
 
 __all__ = ["app_config", "DecryptionError", "NoSuchVariableError"]
 
@@ -16,31 +31,108 @@ class NoSuchVariableError(Exception):
 
 
 class _App_Config:  # noqa: N801
+    def __init__(self) -> None:
+        """Initialize instance."""
+        self._variables: dict[str, ConfigurableVariable] = {}
+        self._values: dict[str, str] = {}
+        self._undecryptable: set[str] = set()
+        self._version: int | None = None
+        # The last version read from the database, and when
+        self._checked_version: int | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
     def get(self, variable_name: str) -> str:
         """Get the value of the named configurable variable.
 
         If a configurable variable with the given name does not exist, raise a NoSuchVariableError.
         If the variable cannot be decrypted, raise a DecryptionError.
         """
-        try:
-            return ConfigurableVariable.objects.get(name=variable_name).value
-        except ConfigurableVariable.DoesNotExist as e:
+        self._load_if_outdated()
+
+        if variable_name in self._values:
+            return self._values[variable_name]
+        if variable_name not in self._variables:
             msg = f"No configurable variable found with name {variable_name}"
-            raise NoSuchVariableError(msg) from e
-        except InvalidToken as e:
+            raise NoSuchVariableError(msg)
+        if variable_name in self._undecryptable:
             msg = f"Failed to decrypt variable: {variable_name}"
-            raise DecryptionError(msg) from e
+            raise DecryptionError(msg)
 
-    async def aget(self, variable_name: str) -> str:
-        """Async version of get."""
         try:
-            return (await ConfigurableVariable.objects.aget(name=variable_name)).value
-        except ConfigurableVariable.DoesNotExist as e:
-            msg = f"No configurable variable found with name {variable_name}"
-            raise NoSuchVariableError(msg) from e
+            value = self._variables[variable_name].value
         except InvalidToken as e:
+            self._undecryptable.add(variable_name)
             msg = f"Failed to decrypt variable: {variable_name}"
             raise DecryptionError(msg) from e
 
+        self._values[variable_name] = value
+        return value
+
+    async def aget(self, variable_name: str) -> str:
+        """Async version of get."""
+        return await sync_to_async(self.get)(variable_name)
+
+    def get_many(self, variable_names: list[str] | None = None) -> dict[str, str]:
+        """Get the decrypted values of many variables, all of them by default.
+
+        Missing or undecryptable variables are left out.
+        """
+        self._load_if_outdated()
+
+        values = {}
+        for name in self._variables if variable_names is None else variable_names:
+            try:
+                values[name] = self.get(name)
+            except (NoSuchVariableError, DecryptionError):
+                continue
+        return values
+
+    def get_version(self) -> int:
+        """Get the version of the variables, it changes on every edit."""
+        return self._get_version()
+
+    def invalidate(self) -> None:
+        """Make every process reload its variables on the next read."""
+        version = ConfigurableVariablesVersion.increment()
+        self._checked_version, self._checked_at = version, time.monotonic()
+
+    def clear(self) -> None:
+        """Forget the loaded variables, they are loaded again on the next read."""
+        with self._lock:
+            self._variables = {}
+            self._values = {}
+            self._undecryptable = set()
+            self._version = None
+            self._checked_version = None
+            self._checked_at = 0.0
+
+    def _get_version(self) -> int:
+        now = time.monotonic()
+        if (
+            self._checked_version is None
+            or now - self._checked_at >= CONFIGURABLE_VARIABLES_VERSION_CHECK_SECONDS
+        ):
+            self._checked_version = ConfigurableVariablesVersion.get_version()
+            self._checked_at = now
+        return self._checked_version
+
+    def _load_if_outdated(self) -> None:
+        version = self._get_version()
+        if version == self._version:
+            return
+
+        with self._lock:
+            if version == self._version:
+                return
+
+            self._variables = {
+                variable.name: variable
+                for variable in ConfigurableVariable.objects.all()
+            }
+            self._values = {}
+            self._undecryptable = set()
+            self._version = version
+
 
 app_config = _App_Config()
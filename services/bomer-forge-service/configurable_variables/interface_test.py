@@ -10,7 +10,10 @@ from configurable_variables.interface import (
     NoSuchVariableError,
     app_config,
 )
-from configurable_variables.models import ConfigurableVariable
+from configurable_variables.models import (
+    ConfigurableVariable,
+    ConfigurableVariablesVersion,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -87,3 +90,76 @@ def test_aget_raises_decryption_error() -> None:
         with pytest.raises(DecryptionError):
             async_to_sync(app_config.aget)("TEST_VARIABLE")
         assert mock_value.call_count == 1
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("configurable_variable")
+def test_get_decrypts_once() -> None:
+    with patch.object(
+        ConfigurableVariable, "value", new_callable=PropertyMock
+    ) as mock_value:
+        mock_value.return_value = "decrypted_value"
+        app_config.get("TEST_VARIABLE")
+        assert app_config.get("TEST_VARIABLE") == "decrypted_value"
+        assert mock_value.call_count == 1
+
+
+@pytest.mark.django_db()
+def test_get_reloads_after_variable_is_saved(
+    configurable_variable: ConfigurableVariable,
+) -> None:
+    with patch.object(
+        ConfigurableVariable, "value", new_callable=PropertyMock
+    ) as mock_value:
+        mock_value.return_value = "decrypted_value"
+        app_config.get("TEST_VARIABLE")
+
+        configurable_variable.save()
+        mock_value.return_value = "new_value"
+
+        assert app_config.get("TEST_VARIABLE") == "new_value"
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("configurable_variable")
+def test_get_reloads_after_another_process_edits_a_variable() -> None:
+    with (
+        patch.object(
+            ConfigurableVariable, "value", new_callable=PropertyMock
+        ) as mock_value,
+        patch(
+            "configurable_variables.interface.CONFIGURABLE_VARIABLES_VERSION_CHECK_SECONDS",
+            0,
+        ),
+    ):
+        mock_value.return_value = "decrypted_value"
+        app_config.get("TEST_VARIABLE")
+
+        # Another process only increments the version in the database
+        ConfigurableVariablesVersion.increment()
+        mock_value.return_value = "new_value"
+
+        assert app_config.get("TEST_VARIABLE") == "new_value"
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("configurable_variable")
+def test_get_checks_the_version_once_per_interval() -> None:
+    app_config.get("TEST_VARIABLE")
+
+    with patch.object(ConfigurableVariablesVersion, "get_version") as get_version:
+        app_config.get("TEST_VARIABLE")
+
+    get_version.assert_not_called()
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("configurable_variable")
+def test_get_many_skips_missing_variables() -> None:
+    with patch.object(
+        ConfigurableVariable, "value", new_callable=PropertyMock
+    ) as mock_value:
+        mock_value.return_value = "decrypted_value"
+        assert app_config.get_many(["TEST_VARIABLE", "NON_EXISTENT_VARIABLE"]) == {
+            "TEST_VARIABLE": "decrypted_value"
+        }
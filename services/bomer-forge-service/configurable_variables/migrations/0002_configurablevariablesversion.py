@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+def create_version_row(apps, schema_editor):
+    ConfigurableVariablesVersion = apps.get_model('configurable_variables', 'ConfigurableVariablesVersion')
+    ConfigurableVariablesVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('configurable_variables', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfigurableVariablesVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_version_row, migrations.RunPython.noop),
+    ]
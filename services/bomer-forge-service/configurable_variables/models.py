@@ -6,7 +6,8 @@ import structlog
 from asgiref.sync import async_to_sync
 from cryptography.fernet import InvalidToken
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from configurable_variables.crypto import decrypt, encrypt, key_hash, rotate
@@ -51,13 +52,44 @@ class ConfigurableVariable(models.Model):
         self.enc_key_hash = key_hash().decode("utf-8")
 
 
+class ConfigurableVariablesVersion(models.Model):
+    """Version of the configurable variables, incremented on every edit.
+
+    The table holds a single row, read by every process to find out whether
+    its variables are outdated.
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
+
+    ROW_ID = 1
+
+    @classmethod
+    def get_version(cls) -> int:
+        """Return the current version."""
+        version = (
+            cls.objects.filter(pk=cls.ROW_ID).values_list("version", flat=True).first()
+        )
+        return version or 0
+
+    @classmethod
+    def increment(cls) -> int:
+        """Increment the version and return the new one."""
+        cls.objects.get_or_create(pk=cls.ROW_ID)
+        cls.objects.filter(pk=cls.ROW_ID).update(version=F("version") + 1)
+        return cls.get_version()
+
+
 @receiver(post_save, sender=ConfigurableVariable)
+@receiver(post_delete, sender=ConfigurableVariable)
 def refresh_db_constants(
     sender: Any, instance: Any, **kwargs: dict
 ) -> None:  # noqa: ARG001
-    """Refresh the `constants` object when a `ConfigurableVariable` is saved."""
+    """Refresh the `constants` object when a `ConfigurableVariable` is saved or deleted."""
     logger.info("Refreshing constants")
 
+    from configurable_variables.interface import app_config
     from core.db_constants import constants
 
+    # Other processes pick the change up from the version in the database
+    app_config.invalidate()
     constants.set_values()
@@ -21,8 +21,15 @@ class AiMocks:
 
 @pytest.fixture(autouse=True)
 def clear_cache() -> None:
-    """Clear the Django cache before test runs."""
+    """Clear the Django cache, in-memory prompt cache, variables and constants before test runs."""
+    from ai.services.runnables import langfuse_prompt_cache
+    from configurable_variables.interface import app_config
+    from core.db_constants import constants
+
     cache.clear()
+    langfuse_prompt_cache.clear()
+    app_config.clear()
+    constants.clear()
 
 
 @pytest.fixture(autouse=True)
@@ -1,4 +1,4 @@
-"""JSON Codec with Datetime and UUID support."""
+"""JSON Codec with Datetime and UUID support, backed by orjson when requested and installed."""
 
 from __future__ import annotations
 
@@ -6,18 +6,27 @@ import contextlib
 import dataclasses
 import importlib
 import inspect
+import math
 import re
+from collections.abc import Iterable, Iterator
 from datetime import UTC, datetime
 from json import JSONDecodeError, JSONDecoder, JSONEncoder
-from typing import Any
+from typing import Any, ClassVar, Literal
 from uuid import UUID
 
-from core.types import JsonScalarValueType, JsonValueType
+from core.types.json import JsonScalarValueType, JsonValueType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 JsonScalarValueExtendedType = JsonScalarValueType | UUID | datetime
 JsonVectorValueExtendedType = list["JsonValueExtendedType"]
 JsonMapValueExtendedType = dict[str, "JsonValueExtendedType"]
-JsonValueExtendedType = JsonScalarValueExtendedType | JsonVectorValueExtendedType | JsonMapValueExtendedType
+JsonValueExtendedType = (
+    JsonScalarValueExtendedType | JsonVectorValueExtendedType | JsonMapValueExtendedType
+)
 
 
 __all__ = (
@@ -53,18 +62,75 @@ class JsonExtendedCodec(JSONDecoder, JSONEncoder):
     )
 
     # UUID Format
-    RFC4122_RE = re.compile(r"^[0-9a-f]{8}-(?:[0-9a-f]{4}-){3}[0-9a-f]{12}$", re.IGNORECASE | re.UNICODE)
+    RFC4122_RE = re.compile(
+        r"^[0-9a-f]{8}-(?:[0-9a-f]{4}-){3}[0-9a-f]{12}$", re.IGNORECASE | re.UNICODE
+    )
+
+    # Shortest string accepted by `datetime.fromisoformat`, e.g. "2011W01"
+    ISOFORMAT_MIN_LENGTH = 7
+
+    # Types orjson encodes as json does, the exact types and not their subclasses
+    ORJSON_EXACT_TYPES = frozenset((str, int, bool, UUID, datetime))
 
-    def __init__(self, **kwargs: Any) -> None:
+    # Classes of the decoded dataclasses, by (module, class)
+    type_registry: ClassVar[dict[tuple[str, str], type]] = {}
+
+    def __init__(
+        self, backend: Literal["json", "orjson"] = "json", **kwargs: Any
+    ) -> None:
         """Initialize the instance as both a JSONDecoder and JSONEncoder."""
+        self.backend = backend
         JSONDecoder.__init__(
             self,
-            **{name: value for name, value in kwargs.items() if name in JsonExtendedCodec.DECODER_KWARGS_KEYS},
+            **{
+                name: value
+                for name, value in kwargs.items()
+                if name in JsonExtendedCodec.DECODER_KWARGS_KEYS
+            },
         )
 
         JSONEncoder.__init__(
             self,
-            **{name: value for name, value in kwargs.items() if name in JsonExtendedCodec.ENCODER_KWARGS_KEYS},
+            **{
+                name: value
+                for name, value in kwargs.items()
+                if name in JsonExtendedCodec.ENCODER_KWARGS_KEYS
+            },
+        )
+
+    @classmethod
+    def resolve_type(cls, module_path: str, class_name: str) -> type:
+        """Get a class by module and name, imported and looked up only once."""
+        key = (module_path, class_name)
+        klass = cls.type_registry.get(key)
+        if klass is None:
+            klass = getattr(importlib.import_module(name=module_path), class_name, None)
+            if not inspect.isclass(klass):
+                msg = f"{module_path}.{class_name} is not a class"
+                raise TypeError(msg)
+            cls.type_registry[key] = klass
+        return klass
+
+    @property
+    def use_orjson_encoder(self) -> bool:
+        """Whether orjson can encode with the options of the instance."""
+        return (
+            self.backend == "orjson"
+            and orjson is not None
+            and self.indent is None
+            and not self.skipkeys
+        )
+
+    @property
+    def use_orjson_decoder(self) -> bool:
+        """Whether orjson can decode with the hooks of the instance."""
+        return (
+            self.backend == "orjson"
+            and orjson is not None
+            and self.object_hook is None
+            and self.object_pairs_hook is None
+            and self.parse_float is float
+            and self.parse_int is int
         )
 
     def default(self, obj: Any) -> Any:
@@ -101,9 +167,7 @@ class JsonExtendedCodec(JSONDecoder, JSONEncoder):
             if not isinstance(class_name, str):
                 raise TypeError
 
-            module = importlib.import_module(name=module_path)
-            module_classes = inspect.getmembers(module, inspect.isclass)
-            klass = next(module_class for name, module_class in module_classes if name == class_name)
+            klass = JsonExtendedCodec.resolve_type(module_path, class_name)
             del value["__type__"]
             decode_value = self._decode_extend(value)
             return klass(**decode_value)
@@ -115,19 +179,87 @@ class JsonExtendedCodec(JSONDecoder, JSONEncoder):
             return [self._decode_extend(value) for value in value]
 
         if isinstance(value, str):
-            if JsonExtendedCodec.RFC4122_RE.match(value):
+            # Most strings are neither, so they are ruled out before any parsing
+            if value[8:9] == "-" and JsonExtendedCodec.RFC4122_RE.match(value):
                 return UUID(value)
 
-            with contextlib.suppress(ValueError):
-                return datetime.fromisoformat(value)
+            if (
+                len(value) >= JsonExtendedCodec.ISOFORMAT_MIN_LENGTH
+                and value[:4].isdigit()
+            ):
+                with contextlib.suppress(ValueError):
+                    return datetime.fromisoformat(value)
 
         return value
 
-    def decode(self, string: str, *args: Any, **kwargs: Any) -> JsonValueExtendedType:  # type: ignore[override]
+    @classmethod
+    def is_orjson_encodable(cls, value: Any) -> bool:
+        """Whether orjson encodes a value as json does.
+
+        orjson encodes NaN and infinities as null, and encodes enums, dates and
+        times natively where json calls `default`, so any of them is left to json.
+        """
+        value_type = type(value)
+        if value_type in JsonExtendedCodec.ORJSON_EXACT_TYPES or value is None:
+            return True
+        if value_type is float:
+            return math.isfinite(value)
+        if value_type is dict:
+            return all(
+                type(key) is str and cls.is_orjson_encodable(item)
+                for key, item in value.items()
+            )
+        if value_type is list or value_type is tuple:
+            return all(cls.is_orjson_encodable(item) for item in value)
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return all(
+                cls.is_orjson_encodable(getattr(value, field.name))
+                for field in dataclasses.fields(value)
+            )
+        return False
+
+    def encode(self, o: Any) -> str:
+        """Encode with orjson when possible, falling back to json for what orjson encodes differently or rejects."""
+        if self.use_orjson_encoder and JsonExtendedCodec.is_orjson_encodable(o):
+            option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            # e.g. non-str keys or big integers, which json encodes or rejects in its own way
+            with contextlib.suppress(orjson.JSONEncodeError):
+                return orjson.dumps(o, default=self.default, option=option).decode()
+
+        return JSONEncoder.encode(self, o)
+
+    def iterencode_list(self, values: Iterable[Any]) -> Iterator[str]:
+        """Encode a list lazily, item by item, as `encode` would encode it at once."""
+        if self.indent is not None:
+            yield from self.iterencode(list(values))
+            return
+
+        yield "["
+        for index, value in enumerate(values):
+            if index:
+                yield self.item_separator
+            yield self.encode(value)
+        yield "]"
+
+    def decode(self, string: str | bytes, *args: Any, **kwargs: Any) -> JsonValueExtendedType:  # type: ignore[override]
         """Extend decoding to support transforming strings into other types."""
-        value = JSONDecoder.decode(self, string, *args, **kwargs)
+        value = self._decode_json(string, *args, **kwargs)
         try:
             return self._decode_extend(value)
         except (TypeError, KeyError, StopIteration) as exc:
             msg = f"{self.__class__.__name__!r} decoding extension failed"
             raise JSONDecodeError(msg=msg, doc=string, pos=0) from exc
+
+    def _decode_json(
+        self, string: str | bytes, *args: Any, **kwargs: Any
+    ) -> JsonValueType:
+        if self.use_orjson_decoder and not args and not kwargs:
+            # e.g. NaN or big integers, which json decodes or rejects in its own way
+            with contextlib.suppress(orjson.JSONDecodeError):
+                return orjson.loads(string)
+
+        if isinstance(string, bytes):
+            string = string.decode()
+        return JSONDecoder.decode(self, string, *args, **kwargs)
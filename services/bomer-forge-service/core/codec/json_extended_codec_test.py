@@ -0,0 +1,166 @@
+import json
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from enum import Enum, IntEnum
+from uuid import UUID
+
+import pytest
+
+from core.codec.json_extended_codec import JsonExtendedCodec
+
+
+@dataclass
+class MockComponent:
+    uuid: UUID
+    created_at: datetime
+    quantities: dict[str, float]
+
+
+class Color(Enum):
+    RED = "red"
+
+
+class Level(IntEnum):
+    FIRST = 1
+
+
+MOCK_UUID = UUID("0b6a8b5e-3f0c-4c4e-9a43-3b4f0c9a1d2e")
+MOCK_DATETIME = datetime(2024, 5, 1, 12, 30, tzinfo=UTC)
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+class TestJsonExtendedCodec:
+    def test_wire_format(self, backend: str) -> None:
+        value = {
+            "component": MockComponent(
+                uuid=MOCK_UUID, created_at=MOCK_DATETIME, quantities={"concrete": 1.5}
+            ),
+            "uuids": [MOCK_UUID],
+        }
+
+        encoded = json.dumps(value, cls=JsonExtendedCodec, backend=backend)
+
+        assert json.loads(encoded) == {
+            "component": {
+                "__type__": {"module": __name__, "class": "MockComponent"},
+                "uuid": str(MOCK_UUID),
+                "created_at": "2024-05-01T12:30:00+00:00",
+                "quantities": {"concrete": 1.5},
+            },
+            "uuids": [str(MOCK_UUID)],
+        }
+        assert json.loads(encoded, cls=JsonExtendedCodec, backend=backend) == value
+
+    def test_decode_strings(self, backend: str) -> None:
+        strings = [
+            "P1",
+            "20x40",
+            "2024",
+            "2024-05-01",
+            "2011W01",
+            str(MOCK_UUID),
+            f"{MOCK_UUID}-x",
+        ]
+
+        decoded = json.loads(
+            json.dumps(strings), cls=JsonExtendedCodec, backend=backend
+        )
+
+        assert decoded == [
+            "P1",
+            "20x40",
+            "2024",
+            datetime(2024, 5, 1),
+            datetime(2011, 1, 3),
+            MOCK_UUID,
+            f"{MOCK_UUID}-x",
+        ]
+
+    def test_fallback_to_json(self, backend: str) -> None:
+        value = {1: 2**70, "nan": float("nan")}
+
+        encoded = json.dumps(value, cls=JsonExtendedCodec, backend=backend)
+
+        assert encoded == json.dumps(value)
+        assert json.loads(encoded, cls=JsonExtendedCodec, backend=backend).keys() == {
+            "1",
+            "nan",
+        }
+        with pytest.raises(TypeError):
+            json.dumps({1, 2}, cls=JsonExtendedCodec, backend=backend)
+
+    def test_same_values_as_json(self, backend: str) -> None:
+        value = {
+            "nan": float("nan"),
+            "infinity": [float("inf")],
+            "component": MockComponent(
+                uuid=MOCK_UUID,
+                created_at=MOCK_DATETIME,
+                quantities={"concrete": float("nan")},
+            ),
+            "level": Level.FIRST,
+        }
+
+        encoded = json.dumps(value, cls=JsonExtendedCodec, backend=backend)
+
+        assert encoded == json.dumps(value, cls=JsonExtendedCodec)
+        assert '"nan": NaN' in encoded
+        with pytest.raises(ValueError):
+            json.dumps(value, cls=JsonExtendedCodec, backend=backend, allow_nan=False)
+        for rejected_value in (Color.RED, date(2024, 5, 1)):
+            with pytest.raises(TypeError):
+                json.dumps(
+                    {"value": rejected_value}, cls=JsonExtendedCodec, backend=backend
+                )
+
+    def test_unknown_type(self, backend: str) -> None:
+        encoded = json.dumps({"__type__": {"module": __name__, "class": "MOCK_UUID"}})
+
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(encoded, cls=JsonExtendedCodec, backend=backend)
+
+    def test_iterencode_list(self, backend: str) -> None:
+        codec = JsonExtendedCodec(backend=backend)
+        values = [{"uuid": MOCK_UUID, "created_at": MOCK_DATETIME}] * 3
+
+        encoded = "".join(codec.iterencode_list(iter(values)))
+
+        assert json.loads(encoded, cls=JsonExtendedCodec) == values
+        assert "".join(codec.iterencode_list([])) == "[]"
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ({"uuid": MOCK_UUID, "values": [1, 1.5, "P1", True, None]}, True),
+        ({"value": float("nan")}, False),
+        ({1: "key"}, False),
+        ({"value": Color.RED}, False),
+        ({"value": Level.FIRST}, False),
+        (
+            MockComponent(
+                uuid=MOCK_UUID, created_at=MOCK_DATETIME, quantities={"concrete": 1.5}
+            ),
+            True,
+        ),
+        (
+            MockComponent(
+                uuid=MOCK_UUID,
+                created_at=MOCK_DATETIME,
+                quantities={"concrete": float("inf")},
+            ),
+            False,
+        ),
+    ],
+)
+def test_is_orjson_encodable(value: object, expected: bool) -> None:
+    assert JsonExtendedCodec.is_orjson_encodable(value) is expected
+
+
+def test_resolve_type() -> None:
+    JsonExtendedCodec.type_registry.clear()
+
+    assert JsonExtendedCodec.resolve_type(__name__, "MockComponent") is MockComponent
+    assert JsonExtendedCodec.type_registry == {
+        (__name__, "MockComponent"): MockComponent
+    }
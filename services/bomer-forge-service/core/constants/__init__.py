@@ -1,6 +1,9 @@
+from .ai import *
+from .celery import *
 from .cors import *
 from .django import *
 from .gunicorn import *
+from .logging import *
 from .s3 import *
 from .service import *
 from .uwsgi import *
@@ -0,0 +1,21 @@
+"""AI services configuration values."""
+
+from core.types.environment import env
+
+__all__ = (
+    "BOM_BATCH_MAX_ATTEMPTS",
+    "BOM_BATCH_MAX_PROMPT_TOKENS",
+    "BOM_BATCH_MAX_SIZE",
+    "BOM_RESULT_SINK_BATCH_SIZE",
+    "LANGFUSE_PROMPT_CACHE_TTL_SECONDS",
+)
+
+LANGFUSE_PROMPT_CACHE_TTL_SECONDS = env.int("LANGFUSE_PROMPT_CACHE_TTL_SECONDS", 60)
+
+# Batched BOM generation: components packed per LLM request
+BOM_BATCH_MAX_PROMPT_TOKENS = env.int("BOM_BATCH_MAX_PROMPT_TOKENS", 12000)
+BOM_BATCH_MAX_SIZE = env.int("BOM_BATCH_MAX_SIZE", 25)
+BOM_BATCH_MAX_ATTEMPTS = env.int("BOM_BATCH_MAX_ATTEMPTS", 3)
+
+# Components written per UPDATE when saving computed BOMs
+BOM_RESULT_SINK_BATCH_SIZE = env.int("BOM_RESULT_SINK_BATCH_SIZE", 100)
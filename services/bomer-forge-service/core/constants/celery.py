@@ -0,0 +1,32 @@
+"""Celery workers configuration values."""
+
+from core.types.environment import env
+
+__all__ = (
+    "BULK_QUEUE_SHARDS",
+    "BULK_WORKER_CONCURRENCY",
+    "BULK_WORKER_PREFETCH_MULTIPLIER",
+    "CELERY_WORKER_WARM_UP_MODULES",
+    "INTERACTIVE_WORKER_CONCURRENCY",
+    "INTERACTIVE_WORKER_PREFETCH_MULTIPLIER",
+)
+
+# Interactive work (a single component or sheet) is short, let workers prefetch
+INTERACTIVE_WORKER_CONCURRENCY = env.int("INTERACTIVE_WORKER_CONCURRENCY", 4)
+INTERACTIVE_WORKER_PREFETCH_MULTIPLIER = env.int(
+    "INTERACTIVE_WORKER_PREFETCH_MULTIPLIER", 4
+)
+
+# Bulk work (whole designs) is long, take one task at a time per process
+BULK_WORKER_CONCURRENCY = env.int("BULK_WORKER_CONCURRENCY", 2)
+BULK_WORKER_PREFETCH_MULTIPLIER = env.int("BULK_WORKER_PREFETCH_MULTIPLIER", 1)
+
+# Bulk tasks are spread by project over this many queues, consumed in turn
+BULK_QUEUE_SHARDS = env.int("BULK_QUEUE_SHARDS", 8)
+
+# Heavy modules imported before the worker forks its processes, so tasks don't
+# pay for them. Workers that don't extract drawings can set it to []
+CELERY_WORKER_WARM_UP_MODULES = env.json(
+    "CELERY_WORKER_WARM_UP_MODULES",
+    ["cv2", "pytesseract", "PIL.Image", "ezdxf", "ezdxf.units", "sklearn.cluster"],
+)
@@ -5,6 +5,7 @@ from uuid import uuid4
 from core.types.environment import env
 
 __all__ = (
+    "CONFIGURABLE_VARIABLES_VERSION_CHECK_SECONDS",
     "DJANGO_ALLOWED_HOSTS",
     "DJANGO_CSRF_COOKIE_SAMESITE",
     "DJANGO_CSRF_COOKIE_SECURE",
@@ -54,3 +55,9 @@ DJANGO_CSRF_TRUSTED_ORIGINS = env.json(
 )
 
 DJANGO_STATIC_ROOT = env.str("DJANGO_STATIC_ROOT", "/srv/http/static")
+
+# How long a process uses its configurable variables before checking the
+# version in the database, edits made in the same process apply at once
+CONFIGURABLE_VARIABLES_VERSION_CHECK_SECONDS = env.int(
+    "CONFIGURABLE_VARIABLES_VERSION_CHECK_SECONDS", 5
+)
@@ -6,7 +6,9 @@ __all__ = (
     "GUNICORN_DOMAIN_SOCKET",
     "GUNICORN_PIDFILE",
     "GUNICORN_PRELOAD_APP",
+    "GUNICORN_THREADS",
     "GUNICORN_TIMEOUT",
+    "GUNICORN_WORKER_CLASS",
     "GUNICORN_WORKERS",
 )
 
@@ -14,4 +16,7 @@ GUNICORN_DOMAIN_SOCKET = env.str("GUNICORN_DOMAIN_SOCKET", "")
 GUNICORN_PIDFILE = env.str("GUNICORN_PIDFILE", "")
 GUNICORN_PRELOAD_APP = env.bool("GUNICORN_PRELOAD_APP", True)
 GUNICORN_TIMEOUT = env.int("GUNICORN_TIMEOUT", 30)
+# Threaded workers, the progress event streams hold a thread each while open
+GUNICORN_WORKER_CLASS = env.str("GUNICORN_WORKER_CLASS", "gthread")
+GUNICORN_THREADS = env.int("GUNICORN_THREADS", 16)
 GUNICORN_WORKERS = env.int("GUNICORN_WORKERS", 1)
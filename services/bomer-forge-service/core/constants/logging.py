@@ -0,0 +1,22 @@
+"""Logging configuration values."""
+
+from core.types.environment import env
+
+__all__ = (
+    "LOG_ASYNC_HANDLER",
+    "LOG_CALLSITE_PARAMETERS",
+    "LOG_RATE_LIMITS",
+    "LOG_SAMPLING_RATES",
+)
+
+# Write the logs from a thread, so requests and tasks don't wait for them
+LOG_ASYNC_HANDLER = env.bool("LOG_ASYNC_HANDLER", True)
+
+# File, function and line of every event, found by inspecting the stack
+LOG_CALLSITE_PARAMETERS = env.bool("LOG_CALLSITE_PARAMETERS", True)
+
+# Share of the events kept, by logger or event name, e.g. {"ai.services": 0.1}
+LOG_SAMPLING_RATES = env.json("LOG_SAMPLING_RATES", {})
+
+# Events kept per second, by logger or event name, e.g. {"Target data": 5}
+LOG_RATE_LIMITS = env.json("LOG_RATE_LIMITS", {})
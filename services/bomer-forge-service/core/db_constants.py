@@ -1,15 +1,27 @@
-"""ConfigurableVariables for this repo."""
+"""ConfigurableVariables for this repo.
+
+The constants follow the version of `app_config`, kept in the database: they
+are rebuilt (decrypting only the variables declared here) when any variable
+changed, in this or another process. Subscribers are called with the old and
+new values so the singletons built from them (e.g. the Langfuse client) can be
+rebuilt without a restart.
+"""
+
+import threading
+from collections.abc import Callable
 
 import structlog
 from pydantic import BaseModel
 
-from configurable_variables.models import ConfigurableVariable
+from configurable_variables.interface import app_config
 
 logger = structlog.getLogger(__name__)
 
+ConstantsSubscriber = Callable[["DBConstants", "DBConstants"], None]
+
 
-class _Constants(BaseModel):
-    """ConfigurableVariables for this repo."""
+class DBConstants(BaseModel):
+    """ConfigurableVariables for this repo, as passed to the subscribers."""
 
     OPENAI_API_KEY: str | None = None
     GOOGLE_CLIENT_ID: str | None = None
@@ -25,12 +37,19 @@ class _Constants(BaseModel):
 class _AppConstants:
     """Get all configurable variables from the database."""
 
-    _values: _Constants | None = None
+    def __init__(self) -> None:
+        """Initialize instance."""
+        self._values: DBConstants | None = None
+        self._version: int | None = None
+        self._subscribers: list[ConstantsSubscriber] = []
+        self._lock = threading.Lock()
 
-    def values(self) -> _Constants:
-        """Get the app constants from the database."""
+    def values(self) -> DBConstants:
+        """Get the app constants, reloading them if any variable changed."""
         if self._values is None:
             self.set_values()
+        else:
+            self.refresh_if_outdated()
 
         if not self._values:
             msg = "DB constants have not been set."
@@ -40,9 +59,42 @@ class _AppConstants:
 
     def set_values(self) -> None:
         """Set all configurable variables from the database."""
-        self._values = _Constants(
-            **{conf.name: conf.value for conf in ConfigurableVariable.objects.all()}
-        )
+        with self._lock:
+            version = app_config.get_version()
+            previous_values = self._values
+            self._values = DBConstants(
+                **app_config.get_many(list(DBConstants.model_fields))
+            )
+            self._version = version
+            subscribers = list(self._subscribers)
+
+        if previous_values is None or previous_values == self._values:
+            return
+
+        for subscriber in subscribers:
+            try:
+                subscriber(previous_values, self._values)
+            except Exception:
+                logger.exception("DB constants subscriber failed")
+
+    def refresh_if_outdated(self) -> None:
+        """Reload the constants if they were loaded and a variable changed since."""
+        if self._values is not None and app_config.get_version() != self._version:
+            self.set_values()
+
+    def clear(self) -> None:
+        """Forget the loaded constants, they are loaded again on the next read."""
+        with self._lock:
+            self._values = None
+            self._version = None
+
+    def subscribe(self, subscriber: ConstantsSubscriber) -> ConstantsSubscriber:
+        """Call `subscriber(old, new)` whenever the constants change.
+
+        Returns the subscriber so it can be used as a decorator.
+        """
+        self._subscribers.append(subscriber)
+        return subscriber
 
 
 constants = _AppConstants()
@@ -0,0 +1,42 @@
+from unittest import mock
+
+import pytest
+
+from core.db_constants import _AppConstants
+
+
+@pytest.fixture()
+def app_config_mock():
+    with mock.patch("core.db_constants.app_config") as app_config_mock:
+        app_config_mock.get_version.return_value = 1
+        app_config_mock.get_many.return_value = {"LANGFUSE_SECRET_KEY": "secret"}
+        yield app_config_mock
+
+
+def test_loads_values_once_per_version(app_config_mock: mock.Mock) -> None:
+    constants = _AppConstants()
+
+    constants.values()
+    assert constants.values().LANGFUSE_SECRET_KEY == "secret"
+    app_config_mock.get_many.assert_called_once()
+
+    app_config_mock.get_version.return_value = 2
+    app_config_mock.get_many.return_value = {"LANGFUSE_SECRET_KEY": "new secret"}
+
+    assert constants.values().LANGFUSE_SECRET_KEY == "new secret"
+
+
+def test_notifies_subscribers_of_changes(app_config_mock: mock.Mock) -> None:
+    constants = _AppConstants()
+    subscriber = constants.subscribe(mock.Mock())
+    first_values = constants.values()
+
+    app_config_mock.get_version.return_value = 2
+    constants.values()
+    subscriber.assert_not_called()
+
+    app_config_mock.get_version.return_value = 3
+    app_config_mock.get_many.return_value = {"LANGFUSE_SECRET_KEY": "new secret"}
+    new_values = constants.values()
+
+    subscriber.assert_called_once_with(first_values, new_values)
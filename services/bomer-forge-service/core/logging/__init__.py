@@ -1 +1,2 @@
 from .configure_logging import configure_logging
+from .processors import LazyPayload
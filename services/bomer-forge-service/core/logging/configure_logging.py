@@ -4,6 +4,7 @@ Configures logging to:
  - Output on Lmabda correctly
  - Be in JSON format
  - Adds a few useful additional fields for analysis
+ - Optionally write from a thread, and sample or rate limit noisy events
 """
 
 from __future__ import annotations
@@ -13,9 +14,11 @@ from typing import TYPE_CHECKING
 
 import structlog
 
+from .handlers import AsyncQueueHandler
+from .processors import EventRateLimiter, EventSampler, render_lazy_payloads
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Mapping, Sequence
 
 
 __all__ = ("configure_logging",)
@@ -27,8 +30,17 @@ def configure_logging(
     pre_processors: Sequence | None = None,
     shared_processors: Sequence | None = None,
     additional_processors: Sequence | None = None,
+    callsite_parameters: bool = True,
+    async_handler: bool = False,
+    sampling_rates: Mapping[str, float] | None = None,
+    rate_limits: Mapping[str, float] | None = None,
 ) -> None:
-    """Configure structlog."""
+    """Configure structlog.
+
+    Callsite parameters inspect the stack of every event, they can be turned off in production.
+    Sampling rates and rate limits apply to the events of a logger (and its children) or to the
+    events of a name, see `EventSampler` and `EventRateLimiter`.
+    """
     log_level = log_level or "INFO"
     log_format = log_format or "plain"
 
@@ -47,14 +59,27 @@ def configure_logging(
     if pre_processors:
         processors.extend(pre_processors)
 
+    processors.append(structlog.stdlib.filter_by_level)
+
+    # Dropped events skip the processors below
+    if sampling_rates:
+        processors.append(EventSampler(sampling_rates))
+    if rate_limits:
+        processors.append(EventRateLimiter(rate_limits))
+
     processors.extend(
         [
-            structlog.stdlib.filter_by_level,
             *shared_processors,
             # TraceInjector(),
             structlog.contextvars.merge_contextvars,
             structlog.stdlib.PositionalArgumentsFormatter(),
             structlog.processors.UnicodeDecoder(),
+            render_lazy_payloads,
+        ],
+    )
+
+    if callsite_parameters:
+        processors.append(
             structlog.processors.CallsiteParameterAdder(
                 parameters=(
                     structlog.processors.CallsiteParameter.FILENAME,
@@ -62,8 +87,7 @@ def configure_logging(
                     structlog.processors.CallsiteParameter.LINENO,
                 ),
             ),
-        ],
-    )
+        )
 
     if additional_processors:
         processors.extend(additional_processors)
@@ -84,7 +108,10 @@ def configure_logging(
     else:
         renderer = structlog.processors.JSONRenderer()
 
-    handler = logging.StreamHandler()
+    handler: logging.Handler = logging.StreamHandler()
+    if async_handler:
+        # Events are rendered when logged and written by a thread, off the requests and tasks
+        handler = AsyncQueueHandler(handler)
     handler.setFormatter(
         structlog.stdlib.ProcessorFormatter(
             foreign_pre_chain=shared_processors,  # type: ignore
@@ -0,0 +1,54 @@
+"""Log handlers writing off the logging threads."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+__all__ = ("AsyncQueueHandler",)
+
+
+class AsyncQueueHandler(QueueHandler):
+    """Handler formatting the records with its formatter, and queueing them for a thread that writes them with `handlers`.
+
+    Records are formatted when they are logged, as the values of structlog events may change afterwards; only the
+    writing is left to the thread. The thread is started on the first record of each process, so forked workers get
+    their own.
+    """
+
+    def __init__(self, *handlers: logging.Handler) -> None:
+        """Initialize instance."""
+        super().__init__(queue.SimpleQueue())
+        self.target_handlers = handlers
+        self._listener: QueueListener | None = None
+        self._pid: int | None = None
+        atexit.register(self.stop)
+
+    def start(self) -> None:
+        """Start the thread of the current process, unless it is started already."""
+        # The handler lock is reset in forked processes by logging
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            # A forked process gets a copy of the queue, without the thread reading it
+            self.queue = queue.SimpleQueue()
+            self._listener = QueueListener(
+                self.queue, *self.target_handlers, respect_handler_level=True
+            )
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def stop(self) -> None:
+        """Write the queued records and stop the thread."""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue a record, starting the thread first in a new process."""
+        if self._pid != os.getpid():
+            self.start()
+        super().emit(record)
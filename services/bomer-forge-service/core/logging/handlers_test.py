@@ -0,0 +1,92 @@
+import logging
+import threading
+from logging.handlers import QueueListener
+
+from core.logging.handlers import AsyncQueueHandler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(self.format(record))
+
+
+def test_async_queue_handler() -> None:
+    target_handler = ListHandler()
+    handler = AsyncQueueHandler(target_handler)
+    logger = logging.getLogger("core.logging.handlers_test")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    footings = ["P1"]
+
+    try:
+        logger.info("Extracted footings: %s", footings)
+        footings.append("P2")
+    finally:
+        logger.removeHandler(handler)
+        handler.stop()
+
+    assert target_handler.messages == ["Extracted footings: ['P1']"]
+
+
+def test_async_queue_handler_after_fork(mocker) -> None:
+    target_handler = ListHandler()
+    handler = AsyncQueueHandler(target_handler)
+    handler.handle(logging.makeLogRecord({"msg": "Parent", "levelno": logging.INFO}))
+    mocker.patch("core.logging.handlers.os.getpid", return_value=-1)
+
+    handler.handle(logging.makeLogRecord({"msg": "Child", "levelno": logging.INFO}))
+    handler.stop()
+
+    assert target_handler.messages[-1] == "Child"
+
+
+def test_async_queue_handler_formats_events_when_logged() -> None:
+    target_handler = ListHandler()
+    handler = AsyncQueueHandler(target_handler)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    footings = ["P1"]
+
+    handler.handle(
+        logging.makeLogRecord(
+            {
+                "msg": {"event": "Extracted", "footings": footings},
+                "levelno": logging.INFO,
+            }
+        )
+    )
+    footings.append("P2")
+    handler.stop()
+
+    assert target_handler.messages == ["{'event': 'Extracted', 'footings': ['P1']}"]
+
+
+def test_async_queue_handler_starts_once(mocker) -> None:
+    target_handler = ListHandler()
+    handler = AsyncQueueHandler(target_handler)
+    start_listener = mocker.spy(QueueListener, "start")
+    threads = [
+        threading.Thread(
+            target=handler.emit,
+            args=(
+                logging.makeLogRecord(
+                    {"msg": f"Record {index}", "levelno": logging.INFO}
+                ),
+            ),
+        )
+        for index in range(8)
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    handler.stop()
+
+    assert start_listener.call_count == 1
+    assert sorted(target_handler.messages) == sorted(
+        f"Record {index}" for index in range(8)
+    )
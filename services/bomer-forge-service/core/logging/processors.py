@@ -0,0 +1,134 @@
+"""Structlog processors keeping hot paths cheap to log.
+
+Sampling and rate limits drop events before the other processors run, and
+lazy payloads are only rendered for the events that are kept.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from structlog.typing import EventDict, WrappedLogger
+
+
+__all__ = (
+    "EventRateLimiter",
+    "EventSampler",
+    "LazyPayload",
+    "render_lazy_payloads",
+)
+
+# Warnings and errors are always logged
+UNLIMITED_METHOD_NAMES = frozenset(
+    ("warning", "warn", "error", "exception", "critical", "fatal")
+)
+
+
+class LazyPayload:
+    """Value of a log event rendered only when the event is logged, and the logger enabled for `level` if given."""
+
+    __slots__ = ("level", "render")
+
+    def __init__(self, render: Callable[[], Any], level: int | None = None) -> None:
+        """Initialize instance."""
+        self.render = render
+        self.level = level
+
+
+def render_lazy_payloads(
+    logger: WrappedLogger, method_name: str, event_dict: EventDict
+) -> EventDict:
+    """Render the lazy payloads of an event, dropping the ones of a disabled level."""
+    for key, value in list(event_dict.items()):
+        if isinstance(value, LazyPayload):
+            if value.level is None or logger.isEnabledFor(value.level):
+                event_dict[key] = value.render()
+            else:
+                del event_dict[key]
+    return event_dict
+
+
+class _EventRules:
+    """Values matched by event name, or by logger name and its parents."""
+
+    def __init__(self, rules: Mapping[str, float]) -> None:
+        """Initialize instance."""
+        self.rules = dict(rules)
+        self._logger_rules: dict[str, str | None] = {}
+
+    def match(self, logger: WrappedLogger, event_dict: EventDict) -> str | None:
+        """Get the key of the rule of an event, if any."""
+        event = event_dict.get("event")
+        if isinstance(event, str) and event in self.rules:
+            return event
+
+        logger_name = getattr(logger, "name", None)
+        if logger_name is None:
+            return None
+        if logger_name not in self._logger_rules:
+            name = logger_name
+            while name and name not in self.rules:
+                name = name.rpartition(".")[0]
+            self._logger_rules[logger_name] = name or None
+        return self._logger_rules[logger_name]
+
+
+class EventSampler(_EventRules):
+    """Keep only a share of the events, e.g. {"ai.services": 0.1} keeps 1 in 10 events of that logger."""
+
+    def __call__(
+        self, logger: WrappedLogger, method_name: str, event_dict: EventDict
+    ) -> EventDict:
+        if method_name in UNLIMITED_METHOD_NAMES:
+            return event_dict
+
+        key = self.match(logger, event_dict)
+        if key is not None and random.random() >= self.rules[key]:
+            raise structlog.DropEvent
+        return event_dict
+
+
+class EventRateLimiter(_EventRules):
+    """Keep at most a number of events per second, e.g. {"Target data": 5}.
+
+    The next event kept tells how many were dropped in between.
+    """
+
+    def __init__(self, rules: Mapping[str, float]) -> None:
+        """Initialize instance."""
+        super().__init__(rules)
+        self._lock = threading.Lock()
+        # Tokens, last refill and dropped events by rule
+        self._buckets: dict[str, tuple[float, float, int]] = {}
+
+    def __call__(
+        self, logger: WrappedLogger, method_name: str, event_dict: EventDict
+    ) -> EventDict:
+        if method_name in UNLIMITED_METHOD_NAMES:
+            return event_dict
+
+        key = self.match(logger, event_dict)
+        if key is None:
+            return event_dict
+
+        rate = self.rules[key]
+        now = time.monotonic()
+        with self._lock:
+            tokens, refilled_at, dropped = self._buckets.get(key, (rate, now, 0))
+            tokens = min(rate, tokens + (now - refilled_at) * rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now, dropped + 1)
+                raise structlog.DropEvent
+            self._buckets[key] = (tokens - 1, now, 0)
+
+        if dropped:
+            event_dict["dropped_events"] = dropped
+        return event_dict
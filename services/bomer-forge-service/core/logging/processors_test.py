@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+import structlog
+
+from core.logging.processors import (
+    EventRateLimiter,
+    EventSampler,
+    LazyPayload,
+    render_lazy_payloads,
+)
+
+
+def test_render_lazy_payloads() -> None:
+    logger = logging.getLogger("core.logging.test")
+    logger.setLevel(logging.INFO)
+    event_dict = {
+        "event": "Extracted footings",
+        "footings_count": 2,
+        "footings": LazyPayload(lambda: ["P1", "P2"]),
+        "debug_footings": LazyPayload(pytest.fail, level=logging.DEBUG),
+    }
+
+    assert render_lazy_payloads(logger, "info", event_dict) == {
+        "event": "Extracted footings",
+        "footings_count": 2,
+        "footings": ["P1", "P2"],
+    }
+
+
+def test_event_sampler(mocker) -> None:
+    sampler = EventSampler({"draft_building_designs.services": 0.25, "Target data": 0})
+    logger = logging.getLogger("draft_building_designs.services.ai.measure")
+    mocker.patch("core.logging.processors.random.random", return_value=0.5)
+
+    with pytest.raises(structlog.DropEvent):
+        sampler(logger, "info", {"event": "Measuring"})
+    with pytest.raises(structlog.DropEvent):
+        sampler(logging.getLogger("ai"), "debug", {"event": "Target data"})
+
+    assert sampler(
+        logging.getLogger("draft_building_designs.rest"), "info", {"event": "Measuring"}
+    )
+    assert sampler(logger, "error", {"event": "Measuring failed"})
+
+
+def test_event_rate_limiter(mocker) -> None:
+    rate_limiter = EventRateLimiter({"ai": 2})
+    logger = logging.getLogger("ai.services.runnables")
+    monotonic = mocker.patch("core.logging.processors.time.monotonic", return_value=0)
+
+    assert rate_limiter(logger, "info", {"event": "Response"}) == {"event": "Response"}
+    assert rate_limiter(logger, "info", {"event": "Response"}) == {"event": "Response"}
+    for _ in range(3):
+        with pytest.raises(structlog.DropEvent):
+            rate_limiter(logger, "info", {"event": "Response"})
+    assert rate_limiter(logger, "warning", {"event": "Retrying"}) == {
+        "event": "Retrying"
+    }
+
+    monotonic.return_value = 1
+    assert rate_limiter(logger, "info", {"event": "Response"}) == {
+        "event": "Response",
+        "dropped_events": 3,
+    }
@@ -0,0 +1,27 @@
+"""Pagination of the REST API list endpoints."""
+
+from rest_framework.pagination import CursorPagination
+
+__all__ = ("OptionalCursorPagination",)
+
+
+class OptionalCursorPagination(CursorPagination):
+    """Cursor pagination, used only when the client asks for a page.
+
+    Clients that don't send `page_size` or `cursor` keep receiving the full
+    unpaginated list.
+    """
+
+    ordering = "created_at"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate the queryset if the request asks for a page."""
+        if (
+            self.page_size_query_param not in request.query_params
+            and self.cursor_query_param not in request.query_params
+        ):
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,36 @@
+"""Renderers of the REST API."""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = ("FAST_JSON_RENDERER_CLASSES", "ORJSONRenderer")
+
+_drf_json_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer backed by orjson, using the DRF encoder for other types."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON bytes."""
+        if data is None:
+            return b""
+        return orjson.dumps(
+            data,
+            default=_drf_json_encoder.default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+
+
+# orjson is an optional dependency, the default renderers are used without it
+FAST_JSON_RENDERER_CLASSES = (
+    [ORJSONRenderer, *api_settings.DEFAULT_RENDERER_CLASSES]
+    if orjson
+    else list(api_settings.DEFAULT_RENDERER_CLASSES)
+)
@@ -1,6 +1,6 @@
 from pathlib import Path
 import os
-from google.oauth2 import service_account
+from django.utils.functional import SimpleLazyObject
 
 from core.constants import (
     DJANGO_ALLOWED_HOSTS,
@@ -73,9 +73,17 @@ CSRF_USE_SESSIONS = DJANGO_CSRF_USE_SESSIONS
 # Google Cloud Storage Settings
 GS_BUCKET_NAME = "bomer-forge-service-bucket"
 
-GS_CREDENTIALS = service_account.Credentials.from_service_account_file(
-    os.path.join(BASE_DIR, "secrets/bomer-ai-5903df29fa96.json")
-)
+
+def get_gs_credentials():
+    from google.oauth2 import service_account
+
+    return service_account.Credentials.from_service_account_file(
+        os.path.join(BASE_DIR, "secrets/bomer-ai-5903df29fa96.json")
+    )
+
+
+# Loaded on the first use of the storage, not when the settings are imported
+GS_CREDENTIALS = SimpleLazyObject(get_gs_credentials)
 
 GS_PROJECT_ID = "bomer-ai"
 
@@ -0,0 +1,58 @@
+"""Lazy imports of the heavy dependencies, loaded on their first use."""
+
+import importlib
+import time
+from types import ModuleType
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Every lazy module by name, so workers can warm them up
+lazy_modules: dict[str, "LazyModule"] = {}
+
+
+class LazyModule:
+    """Module imported on the first access to one of its attributes."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize instance."""
+        self._name = name
+        self._module: ModuleType | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the module is imported already."""
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        """Import the module, once."""
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.load(), attribute)
+
+    def __repr__(self) -> str:
+        return f"<LazyModule {self._name}{'' if self.is_loaded else ' (not loaded)'}>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Get a module imported on its first use, instead of at import time."""
+    if name not in lazy_modules:
+        lazy_modules[name] = LazyModule(name)
+    return lazy_modules[name]
+
+
+def warm_up_lazy_modules(names: list[str] | None = None) -> None:
+    """Import the lazy modules (all of them by default) ahead of their first use."""
+    for name in names if names is not None else list(lazy_modules):
+        started_at = time.perf_counter()
+        lazy_import(name).load()
+        logger.info(
+            "Lazy module loaded",
+            module=name,
+            duration_ms=round((time.perf_counter() - started_at) * 1000),
+        )
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+from core.utils.lazy_import import LazyModule, lazy_import, warm_up_lazy_modules
+
+# Modules the web process and the task autodiscovery must not import
+HEAVY_MODULES = (
+    "cv2",
+    "pytesseract",
+    "ezdxf",
+    "sklearn",
+    "langchain",
+    "langchain_openai",
+    "pdf2image",
+)
+
+STARTUP_STATEMENT = """
+import django
+django.setup()
+import core.urls
+import draft_building_designs.tasks
+"""
+
+
+def get_import_times(statement: str) -> dict[str, int]:
+    """Get the cumulative import time (in us) of every module a statement imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "core.settings"},
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+def test_lazy_import():
+    module = lazy_import("colorsys")
+
+    assert isinstance(module, LazyModule)
+    assert lazy_import("colorsys") is module
+    assert module.hls_to_rgb(0, 1, 0) == (1, 1, 1)
+    assert module.is_loaded
+
+
+def test_warm_up_lazy_modules():
+    module = lazy_import("wave")
+
+    warm_up_lazy_modules(["wave"])
+
+    assert module.is_loaded
+
+
+def test_startup_does_not_import_heavy_modules():
+    import_times = get_import_times(STARTUP_STATEMENT)
+
+    assert "django" in import_times
+    assert [name for name in import_times if name.split(".")[0] in HEAVY_MODULES] == []
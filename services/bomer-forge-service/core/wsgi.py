@@ -10,10 +10,21 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from core.constants import (
+    LOG_ASYNC_HANDLER,
+    LOG_CALLSITE_PARAMETERS,
+    LOG_RATE_LIMITS,
+    LOG_SAMPLING_RATES,
+)
 from core.logging import configure_logging
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_wsgi_application()
 
-configure_logging()
+configure_logging(
+    callsite_parameters=LOG_CALLSITE_PARAMETERS,
+    async_handler=LOG_ASYNC_HANDLER,
+    sampling_rates=LOG_SAMPLING_RATES,
+    rate_limits=LOG_RATE_LIMITS,
+)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from draft_building_designs.models import DraftBuildingDesignDrawingDocument
+from draft_building_designs.services.drawing_document_upload import (
+    backfill_drawing_document_hashes,
+)
+
+
+class Command(BaseCommand):
+    help = "Hash the drawing documents uploaded before they were deduplicated"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--draft-building-design",
+            help="Hash the documents of this design only",
+        )
+
+    def handle(self, *args, **kwargs):
+        drawing_documents = DraftBuildingDesignDrawingDocument.objects.all()
+        if kwargs["draft_building_design"]:
+            drawing_documents = drawing_documents.filter(
+                draft_building_design=kwargs["draft_building_design"]
+            )
+
+        outcomes = backfill_drawing_document_hashes(drawing_documents)
+        self.stdout.write(
+            f"{outcomes['hashed']} hashed, {outcomes['duplicate']} duplicates, "
+            f"{outcomes['unreadable']} unreadable"
+        )
@@ -1,31 +1,55 @@
-import numpy as np
 from django.core.management.base import BaseCommand
-from sklearn.cluster import DBSCAN
 
-from draft_building_designs.models import DXFEntity
-
-
-def get_dxf_entity_point(dxf_entity: DXFEntity) -> tuple[float, float] | None:
-    match dxf_entity.metadata.get("type"):
-        case "POLYLINE":
-            return np.mean(dxf_entity.metadata["coordinates"], axis=0)
-        case "LINE":
-            return np.array(dxf_entity.metadata["coordinates"])
-        case _:
-            return None
-
-
-def clusterize_dxf_entities(dxfentities: list[DXFEntity]) -> list[DXFEntity]:
-    points = np.array(
-        [[entity.metadata["x"], entity.metadata["y"]] for entity in dxfentities]
-    )
-    dbscan = DBSCAN(eps=10, min_samples=2, metric="cosine")
-    dbscan.fit(points)
-    return dbscan.labels_
+from draft_building_designs.models import DraftBuildingDesign
+from draft_building_designs.services.dxf_entity_clustering import (
+    DXF_CLUSTERING_EPS,
+    DXF_CLUSTERING_MIN_SAMPLES,
+    DXF_CLUSTERING_TILE_SIZE,
+    cluster_dxf_entities,
+    update_dxf_entity_clusters,
+)
 
 
 class Command(BaseCommand):
     help = "Clusterize DXF entities"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--draft-building-design",
+            help="Clusterize the entities of this design only",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only clusterize again the entities changed since the last run",
+        )
+        parser.add_argument("--eps", type=float, default=DXF_CLUSTERING_EPS)
+        parser.add_argument(
+            "--min-samples", type=int, default=DXF_CLUSTERING_MIN_SAMPLES
+        )
+        parser.add_argument("--tile-size", type=float, default=DXF_CLUSTERING_TILE_SIZE)
+
     def handle(self, *args, **kwargs):
-        clusterize_dxf_entities(DXFEntity.objects.all())
+        draft_building_designs = DraftBuildingDesign.objects.filter(
+            dxf_entities__isnull=False
+        ).distinct()
+        if kwargs["draft_building_design"]:
+            draft_building_designs = draft_building_designs.filter(
+                uuid=kwargs["draft_building_design"]
+            )
+
+        clusterize = (
+            update_dxf_entity_clusters
+            if kwargs["incremental"]
+            else cluster_dxf_entities
+        )
+        for draft_building_design in draft_building_designs:
+            clusters_count = clusterize(
+                draft_building_design,
+                eps=kwargs["eps"],
+                min_samples=kwargs["min_samples"],
+                tile_size=kwargs["tile_size"],
+            )
+            self.stdout.write(
+                f"{draft_building_design.name}: {clusters_count} clusters"
+            )
@@ -8,11 +8,21 @@ from django.core.management.base import BaseCommand
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
-from draft_building_designs.models import DXFEntity
+from draft_building_designs.embeddings import EmbeddingsGenerator
+from draft_building_designs.models import DXFEntity, DraftBuildingDesign
+from draft_building_designs.services.dxf_column_extraction_context import (
+    DXF_CONTEXT_DESCRIPTION,
+    DXF_CONTEXT_TOKENS_BUDGET,
+    build_column_extraction_contexts,
+)
+from draft_building_designs.services.dxf_entity_clustering import (
+    cluster_dxf_entities,
+)
 
 logger = structlog.get_logger(__name__)
 
 ASSISTANT_ID = "asst_FQaQDG1GGSNy4BIqmo5zQQn1"
+COLUMN_EMBEDDING_QUERY = "Column code, width, length and height (e.g. P1 30x30)"
 
 
 class Column(BaseModel):
@@ -74,14 +84,51 @@ def upload_files():
 class Command(BaseCommand):
     help = "Extract columns from the drawing design"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--draft-building-design",
+            help="Extract the columns of this design, the first one by default",
+        )
+        parser.add_argument(
+            "--tokens-budget", type=int, default=DXF_CONTEXT_TOKENS_BUDGET
+        )
+        parser.add_argument("--max-concurrency", type=int, default=8)
+        parser.add_argument(
+            "--use-embeddings",
+            action="store_true",
+            help="Keep the entities most similar to a column first in the context",
+        )
+
     def handle(self, *args, **kwargs):
         from ai.services.runnables import langchain_prompt_from_text
 
-        content = []
-        for document in DXFEntity.objects.exclude(
-            metadata__type__in=["POLYLINE", "LINE"]
-        ):
-            content.append(document.metadata)
+        draft_building_design = (
+            DraftBuildingDesign.objects.get(uuid=kwargs["draft_building_design"])
+            if kwargs["draft_building_design"]
+            else DraftBuildingDesign.objects.first()
+        )
+        if not draft_building_design.dxf_entities.filter(
+            clustered_at__isnull=False
+        ).exists():
+            cluster_dxf_entities(draft_building_design)
+
+        query_embedding = None
+        if kwargs["use_embeddings"]:
+            EmbeddingsGenerator.init_models()
+            query_embedding = EmbeddingsGenerator.embed_openai(
+                texts=[COLUMN_EMBEDDING_QUERY]
+            )[0]
+
+        contexts = build_column_extraction_contexts(
+            draft_building_design,
+            query_embedding=query_embedding,
+            tokens_budget=kwargs["tokens_budget"],
+        )
+        logger.info(
+            "Column extraction contexts built",
+            regions_count=len(contexts),
+            tokens_count=sum(context.tokens_count for context in contexts),
+        )
 
         gpt = ChatOpenAI(
             model="grok-2-latest",
@@ -99,21 +146,35 @@ class Command(BaseCommand):
             The code is a string that starts with "P" followed by a number.
             The height is the sum of the intervals between the top of the column and the bottom of the column.
             The width and length are the width and length of the column.
+            This region of the drawing holds the columns {column_codes}.
 
+            {context_description}
             {context}
             """
             )
             | gpt.with_structured_output(Columns, method="json_schema")
         )
 
-        response = chain.invoke(
-            {
-                "context": json.dumps(content),
-            },
+        # One request per region
+        responses = chain.batch(
+            [
+                {
+                    "column_codes": ", ".join(context.column_codes),
+                    "context_description": DXF_CONTEXT_DESCRIPTION,
+                    "context": context.context,
+                }
+                for context in contexts
+            ],
             config={
                 "callbacks": [get_langfuse_callback_handler()],
                 "run_name": "grok_extract_columns",
+                "max_concurrency": kwargs["max_concurrency"],
             },
         )
 
-        logger.info(f"Columns: {response}")
+        columns: dict[str, Column] = {}
+        for response in responses:
+            for column in response.columns:
+                columns.setdefault(column.code, column)
+
+        logger.info(f"Columns: {list(columns.values())}")
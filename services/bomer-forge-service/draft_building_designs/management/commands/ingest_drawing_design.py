@@ -101,4 +101,7 @@ class Command(BaseCommand):
                 f"Ingested {entity.text} - {entity.coordinates} - {entity.dxftype}"
             )
 
+        # bulk_create doesn't call save
+        for dxfentity in dxfentities:
+            dxfentity.set_bbox()
         DXFEntity.objects.bulk_create(dxfentities)
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:12
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0020_remove_draftbuildingdesignbuildingcomponent_bom_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DraftBuildingDesignProcessingCheckpoint',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('stage', models.CharField(choices=[('FOOTINGS', 'Footings'), ('COLUMNS', 'Columns')], max_length=255)),
+                ('components_count', models.PositiveIntegerField(default=0)),
+                ('draft_building_design', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='processing_checkpoints', to='draft_building_designs.draftbuildingdesign')),
+                ('drawing_document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='processing_checkpoints', to='draft_building_designs.draftbuildingdesigndrawingdocument')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('drawing_document', 'stage'), name='unique_drawing_document_processing_stage')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0021_draftbuildingdesignprocessingcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='draftbuildingdesign',
+            name='footing_reference_index',
+            field=models.JSONField(blank=True, help_text='Column codes referenced by the footings of the design', null=True),
+        ),
+    ]
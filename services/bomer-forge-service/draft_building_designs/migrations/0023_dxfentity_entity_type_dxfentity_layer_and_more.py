@@ -0,0 +1,105 @@
+# Generated by Django 5.1.6 on 2026-10-19 12:05
+
+import django.db.models.fields.json
+from django.db import migrations, models
+
+BBOX_BACKFILL_BATCH_SIZE = 1000
+
+
+def get_dxf_entity_bbox(metadata):
+    # Copy of draft_building_designs.models.get_dxf_entity_bbox as of this
+    # migration, so later changes to the model helpers don't change it
+    if not metadata:
+        return None
+
+    coordinates = metadata.get('coordinates')
+    if coordinates is None and 'x' in metadata and 'y' in metadata:
+        coordinates = [metadata['x'], metadata['y']]
+    if not coordinates:
+        return None
+
+    points = coordinates if isinstance(coordinates[0], (list, tuple)) else [coordinates]
+    try:
+        xs, ys = zip(*[(float(point[0]), float(point[1])) for point in points])
+    except (IndexError, TypeError, ValueError):
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def backfill_dxf_entities_bbox(apps, schema_editor):
+    DXFEntity = apps.get_model('draft_building_designs', 'DXFEntity')
+    batch = []
+    for dxf_entity in DXFEntity.objects.only('uuid', 'metadata').iterator(
+        chunk_size=BBOX_BACKFILL_BATCH_SIZE
+    ):
+        bbox = get_dxf_entity_bbox(dxf_entity.metadata)
+        if bbox is None:
+            continue
+        (
+            dxf_entity.bbox_min_x,
+            dxf_entity.bbox_min_y,
+            dxf_entity.bbox_max_x,
+            dxf_entity.bbox_max_y,
+        ) = bbox
+        batch.append(dxf_entity)
+        if len(batch) >= BBOX_BACKFILL_BATCH_SIZE:
+            DXFEntity.objects.bulk_update(
+                batch, ['bbox_min_x', 'bbox_min_y', 'bbox_max_x', 'bbox_max_y']
+            )
+            batch = []
+    DXFEntity.objects.bulk_update(
+        batch, ['bbox_min_x', 'bbox_min_y', 'bbox_max_x', 'bbox_max_y']
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0022_draftbuildingdesign_footing_reference_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dxfentity',
+            name='entity_type',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.fields.json.KeyTextTransform('type', 'metadata'), output_field=models.CharField(max_length=255)),
+        ),
+        migrations.AddField(
+            model_name='dxfentity',
+            name='layer',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.fields.json.KeyTextTransform('layer', 'metadata'), output_field=models.CharField(max_length=255)),
+        ),
+        migrations.AddField(
+            model_name='dxfentity',
+            name='bbox_min_x',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dxfentity',
+            name='bbox_min_y',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dxfentity',
+            name='bbox_max_x',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dxfentity',
+            name='bbox_max_y',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='dxfentity',
+            index=models.Index(fields=['draft_building_design', 'entity_type'], name='dxf_entity_design_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dxfentity',
+            index=models.Index(fields=['draft_building_design', 'layer'], name='dxf_entity_design_layer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dxfentity',
+            index=models.Index(fields=['draft_building_design', 'bbox_min_x', 'bbox_min_y'], name='dxf_entity_design_bbox_idx'),
+        ),
+        migrations.RunPython(backfill_dxf_entities_bbox, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-19 13:20
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0023_dxfentity_entity_type_dxfentity_layer_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DraftBuildingDesignBuildingComponentTombstone',
+            fields=[
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('draft_building_design_uuid', models.UUIDField()),
+                ('draft_building_design_building_component_uuid', models.UUIDField()),
+                ('building_component_uuid', models.UUIDField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['draft_building_design_uuid', 'created_at'], name='dbd_component_tombstone_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='draftbuildingdesignbuildingcomponent',
+            index=models.Index(fields=['draft_building_design', 'updated_at'], name='dbd_component_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0024_draftbuildingdesignbuildingcomponenttombstone_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dxfentity',
+            name='cluster_label',
+            field=models.IntegerField(blank=True, help_text='Spatial cluster of the entity in its design, -1 for noise', null=True),
+        ),
+        migrations.AddField(
+            model_name='dxfentity',
+            name='clustered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='dxfentity',
+            index=models.Index(fields=['draft_building_design', 'cluster_label'], name='dxf_entity_design_cluster_idx'),
+        ),
+    ]
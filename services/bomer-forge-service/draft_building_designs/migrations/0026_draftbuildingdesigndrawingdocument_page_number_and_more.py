@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-19 15:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0025_dxfentity_cluster_label_dxfentity_clustered_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='draftbuildingdesigndrawingdocument',
+            name='page_number',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='draftbuildingdesigndrawingdocument',
+            name='source_document',
+            field=models.ForeignKey(blank=True, help_text='PDF document this document is a page of', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pages', to='draft_building_designs.draftbuildingdesigndrawingdocument'),
+        ),
+        migrations.AddConstraint(
+            model_name='draftbuildingdesigndrawingdocument',
+            constraint=models.UniqueConstraint(fields=('source_document', 'page_number'), name='unique_drawing_document_page'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-19 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0026_draftbuildingdesigndrawingdocument_page_number_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='draftbuildingdesigndrawingdocument',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the file, unique in the design', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='draftbuildingdesigndrawingdocument',
+            name='perceptual_hash',
+            field=models.CharField(blank=True, help_text='Difference hash of the image of the file', max_length=16, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='draftbuildingdesigndrawingdocument',
+            index=models.Index(fields=['draft_building_design', 'perceptual_hash'], name='drawing_document_phash_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='draftbuildingdesigndrawingdocument',
+            constraint=models.UniqueConstraint(fields=('draft_building_design', 'content_hash'), name='unique_drawing_document_content_hash'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-19 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0027_draftbuildingdesigndrawingdocument_content_hash_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DraftBuildingDesignProgressEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('data', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('draft_building_design', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_events', to='draft_building_designs.draftbuildingdesign')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['draft_building_design', 'id'], name='dbd_progress_event_idx'), models.Index(fields=['created_at'], name='dbd_progress_event_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-19 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0028_draftbuildingdesignprogressevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='draftbuildingdesignbuildingcomponenttombstone',
+            index=models.Index(fields=['created_at'], name='dbd_tombstone_created_at_idx'),
+        ),
+    ]
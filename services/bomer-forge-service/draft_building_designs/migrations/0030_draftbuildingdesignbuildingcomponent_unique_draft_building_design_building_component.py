@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-19 18:10
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def delete_duplicate_building_component_links(apps, schema_editor):
+    DraftBuildingDesignBuildingComponent = apps.get_model(
+        'draft_building_designs', 'DraftBuildingDesignBuildingComponent'
+    )
+    # Keep the oldest link of every design and component pair
+    duplicates = (
+        DraftBuildingDesignBuildingComponent.objects.values(
+            'draft_building_design', 'building_component'
+        )
+        .annotate(links_count=Count('uuid'))
+        .filter(links_count__gt=1)
+        .order_by()
+    )
+    for duplicate in duplicates:
+        links = DraftBuildingDesignBuildingComponent.objects.filter(
+            draft_building_design=duplicate['draft_building_design'],
+            building_component=duplicate['building_component'],
+        ).order_by('created_at', 'uuid')
+        first_link = links.first()
+        links.exclude(uuid=first_link.uuid).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0029_draftbuildingdesignbuildingcomponenttombstone_dbd_tombstone_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_duplicate_building_component_links, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='draftbuildingdesignbuildingcomponent',
+            constraint=models.UniqueConstraint(fields=('draft_building_design', 'building_component'), name='unique_draft_building_design_building_component'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.6 on 2026-10-19 18:40
+
+import django.db.models.fields.json
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('draft_building_designs', '0030_draftbuildingdesignbuildingcomponent_unique_draft_building_design_building_component'),
+    ]
+
+    # Generated fields can't be altered, they are dropped and added again
+    operations = [
+        migrations.RemoveIndex(
+            model_name='dxfentity',
+            name='dxf_entity_design_type_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='dxfentity',
+            name='dxf_entity_design_layer_idx',
+        ),
+        migrations.RemoveField(
+            model_name='dxfentity',
+            name='entity_type',
+        ),
+        migrations.RemoveField(
+            model_name='dxfentity',
+            name='layer',
+        ),
+        migrations.AddField(
+            model_name='dxfentity',
+            name='entity_type',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Coalesce(django.db.models.fields.json.KeyTextTransform('type', 'metadata'), django.db.models.fields.json.KeyTextTransform('dxftype', 'metadata')), null=True, output_field=models.CharField(max_length=255)),
+        ),
+        migrations.AddField(
+            model_name='dxfentity',
+            name='layer',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.fields.json.KeyTextTransform('layer', 'metadata'), null=True, output_field=models.CharField(max_length=255)),
+        ),
+        migrations.AddIndex(
+            model_name='dxfentity',
+            index=models.Index(fields=['draft_building_design', 'entity_type'], name='dxf_entity_design_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dxfentity',
+            index=models.Index(fields=['draft_building_design', 'layer'], name='dxf_entity_design_layer_idx'),
+        ),
+    ]
@@ -1,5 +1,9 @@
 import structlog
 from django.db import models
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 
 from building_components.models import BuildingComponent
 from core.base_model import BaseModel
@@ -79,6 +83,11 @@ class DraftBuildingDesign(BaseModel):
         related_name="draft_building_designs",
         through="draft_building_designs.DraftBuildingDesignBuildingComponent",
     )
+    footing_reference_index = models.JSONField(
+        help_text="Column codes referenced by the footings of the design",
+        null=True,
+        blank=True,
+    )
 
     objects: DraftBuildingDesignManager = DraftBuildingDesignManager()
 
@@ -160,6 +169,138 @@ class DraftBuildingDesignDrawingDocument(BaseModel):
         choices=DraftBuildingDesignDrawingDocumentType.choices,
         default=DraftBuildingDesignDrawingDocumentType.FOOTING,
     )
+    source_document = models.ForeignKey(
+        "self",
+        help_text="PDF document this document is a page of",
+        on_delete=models.CASCADE,
+        related_name="pages",
+        null=True,
+        blank=True,
+    )
+    page_number = models.PositiveIntegerField(null=True, blank=True)
+    content_hash = models.CharField(
+        help_text="SHA-256 of the file, unique in the design",
+        max_length=64,
+        null=True,
+        blank=True,
+    )
+    perceptual_hash = models.CharField(
+        help_text="Difference hash of the image of the file",
+        max_length=16,
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_document", "page_number"],
+                name="unique_drawing_document_page",
+            ),
+            models.UniqueConstraint(
+                fields=["draft_building_design", "content_hash"],
+                name="unique_drawing_document_content_hash",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["draft_building_design", "perceptual_hash"],
+                name="drawing_document_phash_idx",
+            ),
+        ]
+
+    @property
+    def is_pdf(self) -> bool:
+        """
+        Whether the document is a PDF, whose pages are registered as their own
+        documents.
+        """
+        return self.file.name.lower().endswith(".pdf")
+
+    @property
+    def is_dxf(self) -> bool:
+        """
+        Whether the document is a DXF drawing, whose components are extracted
+        from its entities instead of an image.
+        """
+        return self.file.name.lower().endswith(".dxf")
+
+
+class DraftBuildingDesignProcessingStage(models.TextChoices):
+    """
+    A stage of the draft building design components pipeline.
+    """
+
+    FOOTINGS = "FOOTINGS"
+    COLUMNS = "COLUMNS"
+
+
+class DraftBuildingDesignProcessingCheckpoint(BaseModel):
+    """
+    A processing checkpoint records that a stage of the components pipeline
+    finished for a drawing document, so a retry can skip it.
+    """
+
+    draft_building_design = models.ForeignKey(
+        DraftBuildingDesign,
+        on_delete=models.CASCADE,
+        related_name="processing_checkpoints",
+    )
+    drawing_document = models.ForeignKey(
+        DraftBuildingDesignDrawingDocument,
+        on_delete=models.CASCADE,
+        related_name="processing_checkpoints",
+    )
+    stage = models.CharField(
+        max_length=255,
+        choices=DraftBuildingDesignProcessingStage.choices,
+    )
+    components_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["drawing_document", "stage"],
+                name="unique_drawing_document_processing_stage",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.drawing_document_id} - {self.stage}"
+
+
+class DraftBuildingDesignProgressEvent(models.Model):
+    """
+    A progress event of the processing of a draft building design, streamed
+    to the clients as a server-sent event.
+
+    Unlike the other models it has an auto-incremented id, which orders the
+    events of a design and is the id of the server-sent event.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    draft_building_design = models.ForeignKey(
+        DraftBuildingDesign,
+        on_delete=models.CASCADE,
+        related_name="progress_events",
+    )
+    data = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["draft_building_design", "id"],
+                name="dbd_progress_event_idx",
+            ),
+            models.Index(
+                fields=["created_at"],
+                name="dbd_progress_event_created_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.draft_building_design_id} - {self.id}"
 
 
 class DraftBuildingDesignBuildingComponent(BaseModel):
@@ -174,6 +315,74 @@ class DraftBuildingDesignBuildingComponent(BaseModel):
         BuildingComponent, on_delete=models.CASCADE
     )
 
+    class Meta:
+        constraints = [
+            # Lets the pipeline link its components with ignore_conflicts
+            models.UniqueConstraint(
+                fields=["draft_building_design", "building_component"],
+                name="unique_draft_building_design_building_component",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["draft_building_design", "updated_at"],
+                name="dbd_component_updated_at_idx",
+            ),
+        ]
+
+
+class DraftBuildingDesignBuildingComponentTombstone(BaseModel):
+    """
+    A tombstone records that a building component was removed from a design,
+    so clients syncing the changes of the design can drop it.
+
+    It keeps plain uuids instead of foreign keys, the rows they point to are
+    gone.
+    """
+
+    draft_building_design_uuid = models.UUIDField()
+    draft_building_design_building_component_uuid = models.UUIDField()
+    building_component_uuid = models.UUIDField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["draft_building_design_uuid", "created_at"],
+                name="dbd_component_tombstone_idx",
+            ),
+            # Pruning of the tombstones past the retention
+            models.Index(
+                fields=["created_at"],
+                name="dbd_tombstone_created_at_idx",
+            ),
+        ]
+
+
+@receiver(post_delete, sender=DraftBuildingDesignBuildingComponent)
+def create_building_component_tombstone(
+    sender, instance: DraftBuildingDesignBuildingComponent, **kwargs
+) -> None:
+    """
+    Record the removal of a building component from its design.
+    """
+    DraftBuildingDesignBuildingComponentTombstone.objects.create(
+        draft_building_design_uuid=instance.draft_building_design_id,
+        draft_building_design_building_component_uuid=instance.uuid,
+        building_component_uuid=instance.building_component_id,
+    )
+
+
+@receiver(post_delete, sender=DraftBuildingDesign)
+def delete_building_component_tombstones(
+    sender, instance: DraftBuildingDesign, **kwargs
+) -> None:
+    """
+    Delete the tombstones of a deleted design, its links are deleted first.
+    """
+    DraftBuildingDesignBuildingComponentTombstone.objects.filter(
+        draft_building_design_uuid=instance.uuid
+    ).delete()
+
 
 class DXFEntity(BaseModel):
     """
@@ -192,11 +401,106 @@ class DXFEntity(BaseModel):
     tags = models.JSONField(
         help_text="Array of tags of the element in the DXF file", null=True, blank=True
     )
+    # The ingestion stores the type under `dxftype`
+    entity_type = models.GeneratedField(
+        expression=Coalesce(
+            KeyTextTransform("type", "metadata"),
+            KeyTextTransform("dxftype", "metadata"),
+        ),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+        null=True,
+    )
+    layer = models.GeneratedField(
+        expression=KeyTextTransform("layer", "metadata"),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+        null=True,
+    )
+    # The bounding box can't be generated from the coordinates array, it is set
+    # on save from the metadata
+    bbox_min_x = models.FloatField(null=True, blank=True)
+    bbox_min_y = models.FloatField(null=True, blank=True)
+    bbox_max_x = models.FloatField(null=True, blank=True)
+    bbox_max_y = models.FloatField(null=True, blank=True)
+    cluster_label = models.IntegerField(
+        help_text="Spatial cluster of the entity in its design, -1 for noise",
+        null=True,
+        blank=True,
+    )
+    clustered_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         verbose_name = "DXF Entity"
         verbose_name_plural = "DXF Entities"
         ordering = ["created_at"]
+        indexes = [
+            models.Index(
+                fields=["draft_building_design", "entity_type"],
+                name="dxf_entity_design_type_idx",
+            ),
+            models.Index(
+                fields=["draft_building_design", "layer"],
+                name="dxf_entity_design_layer_idx",
+            ),
+            models.Index(
+                fields=["draft_building_design", "bbox_min_x", "bbox_min_y"],
+                name="dxf_entity_design_bbox_idx",
+            ),
+            models.Index(
+                fields=["draft_building_design", "cluster_label"],
+                name="dxf_entity_design_cluster_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.draft_building_design.name} - {self.metadata}"
+
+    def set_bbox(self) -> None:
+        """
+        Set the bounding box of the entity from the coordinates of its metadata.
+        """
+        bbox = get_dxf_entity_bbox(self.metadata)
+        self.bbox_min_x, self.bbox_min_y, self.bbox_max_x, self.bbox_max_y = (
+            bbox if bbox else (None, None, None, None)
+        )
+
+    def save(self, *args, **kwargs):
+        self.set_bbox()
+        super().save(*args, **kwargs)
+
+
+def get_dxf_entity_points(metadata: dict | None) -> list[tuple[float, float]]:
+    """
+    Get the points of the metadata of a DXF entity, which holds either a point
+    or a list of points in `coordinates`.
+    """
+    if not metadata:
+        return []
+
+    coordinates = metadata.get("coordinates")
+    if coordinates is None and "x" in metadata and "y" in metadata:
+        coordinates = [metadata["x"], metadata["y"]]
+    if not coordinates:
+        return []
+
+    points = coordinates if isinstance(coordinates[0], (list, tuple)) else [coordinates]
+    try:
+        return [(float(point[0]), float(point[1])) for point in points]
+    except (IndexError, TypeError, ValueError):
+        return []
+
+
+def get_dxf_entity_bbox(
+    metadata: dict | None,
+) -> tuple[float, float, float, float] | None:
+    """
+    Get the (min x, min y, max x, max y) bounding box of the metadata of a DXF
+    entity.
+    """
+    points = get_dxf_entity_points(metadata)
+    if not points:
+        return None
+
+    xs, ys = zip(*points)
+    return min(xs), min(ys), max(xs), max(ys)
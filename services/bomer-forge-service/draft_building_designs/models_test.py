@@ -0,0 +1,87 @@
+import pytest
+from django.contrib.auth.models import User
+
+from building_components.models import BuildingComponent, BuildingComponentType
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DXFEntity,
+    get_dxf_entity_bbox,
+)
+from projects.models import Project
+
+
+@pytest.mark.parametrize(
+    "metadata, expected_bbox",
+    [
+        ({"coordinates": [1.0, 2.0]}, (1.0, 2.0, 1.0, 2.0)),
+        ({"coordinates": [[3, 1], [0, 4], [2, 2]]}, (0.0, 1.0, 3.0, 4.0)),
+        ({"x": 5, "y": 6}, (5.0, 6.0, 5.0, 6.0)),
+        ({"coordinates": []}, None),
+        ({"coordinates": [["a", 1]]}, None),
+        (None, None),
+    ],
+)
+def test_get_dxf_entity_bbox(metadata, expected_bbox):
+    assert get_dxf_entity_bbox(metadata) == expected_bbox
+
+
+@pytest.mark.django_db
+def test_dxf_entity_indexed_columns():
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    draft_building_design = DraftBuildingDesign.objects.create(
+        project=project, name="design"
+    )
+
+    dxf_entity = DXFEntity.objects.create(
+        draft_building_design=draft_building_design,
+        metadata={"type": "LINE", "layer": "PIL", "coordinates": [[0, 0], [2, 1]]},
+    )
+    dxf_entity.refresh_from_db()
+
+    assert dxf_entity.entity_type == "LINE"
+    assert dxf_entity.layer == "PIL"
+    assert (dxf_entity.bbox_max_x, dxf_entity.bbox_max_y) == (2.0, 1.0)
+    assert DXFEntity.objects.filter(entity_type__in=["LINE"]).count() == 1
+
+    # Shape of the metadata written by the ingestion
+    ingested_dxf_entity = DXFEntity.objects.create(
+        draft_building_design=draft_building_design,
+        metadata={
+            "text": "P1",
+            "coordinates": [1.0, 2.0],
+            "layer": "PIL",
+            "dxftype": "TEXT",
+        },
+    )
+    untyped_dxf_entity = DXFEntity.objects.create(
+        draft_building_design=draft_building_design, metadata={}
+    )
+    ingested_dxf_entity.refresh_from_db()
+    untyped_dxf_entity.refresh_from_db()
+
+    assert ingested_dxf_entity.entity_type == "TEXT"
+    assert untyped_dxf_entity.entity_type is None
+    assert untyped_dxf_entity.layer is None
+
+
+@pytest.mark.django_db
+def test_building_component_indexed_columns():
+    building_component = BuildingComponent.objects.create(
+        type=BuildingComponentType.COLUMN,
+        component_data={
+            "code": "P1",
+            "bom": {"steel_weight": 12.5, "concrete_volume": 0.4},
+        },
+    )
+    building_component.refresh_from_db()
+
+    assert building_component.code == "P1"
+    assert building_component.steel_weight == 12.5
+    assert building_component.concrete_volume == 0.4
@@ -229,6 +229,44 @@ def get_generate_component_bom_prompt() -> tuple[str, str]:
     )
 
 
+class CalculoComponente(Calculo):
+    id: str = Field(
+        ...,
+        description="O identificador do componente, exatamente igual ao recebido no contexto",
+    )
+
+
+class Calculos(BaseModel):
+    calculos: list[CalculoComponente]
+
+
+def get_generate_components_bom_batch_prompt() -> tuple[str, str]:
+    """Returns the prompt for calculating the BOM of a list of components in Portuguese"""
+    return (
+        """
+        Você é um especialista em engenharia civil. Seu objetivo é calcular o volume de betão e o peso da armadura de cada componente de uma lista de componentes de um projeto de estrutura. Os componentes podem ser: sapata, viga de equilíbrio, pilar, pilar IPE, viga ou laje.
+
+        **Calcule cada componente de forma independente. Caso um componente não especifique uma das armaduras, faça o cálculo com as armaduras existentes e ignore a armadura que não está especificada. O importante é sempre calcular o volume de betão e o peso da armadura.**
+
+        *O contexto contem uma lista JSON de componentes. Cada componente possui um "id", um "type" e as medidas em "data".*
+
+        {context}
+
+        **Saida de dados:**
+        - Retorne exatamente um calculo para cada componente do contexto, sem repetir nem omitir componentes.
+        - id: O identificador do componente, exatamente igual ao recebido no contexto
+        - volume_de_betao_em_metros_cubicos: O volume de betão em metros cúbicos, caso não seja possível calcular, retorne 0
+        - peso_da_armadura_em_quilogramas: O peso da armadura em quilogramas, caso não seja possível calcular, retorne 0
+        - raciocinio: O raciocinio para chegar ao calculo de quantidade de materiais
+
+        *Dicionario de dados:*
+        13Ø12a/13 -> 13Ø12 a 13cm
+        Ø8/30 -> 30 unidades de Ø8 espaçadas de acordo com a largura/comprimento do componente se especificado.
+        """,
+        Calculos.__name__,
+    )
+
+
 # -
 
 
@@ -0,0 +1,188 @@
+"""Process-wide registry of the language-specific prompts.
+
+Every language package under `draft_building_designs.prompts` (e.g. `pt`,
+`pt.v2`) exposes `get_<prompt_name>_prompt()` functions returning a
+`(prompt_text, model_name)` tuple. The registry imports those modules once,
+renders the JSON schema of every response model and keeps the result so
+extraction calls don't pay the import/schema generation cost per request.
+"""
+
+from __future__ import annotations
+
+import importlib
+import pkgutil
+import re
+import threading
+from dataclasses import dataclass, field
+from string import Formatter
+from types import ModuleType
+from typing import Any
+
+import structlog
+from pydantic import BaseModel
+
+logger = structlog.get_logger(__name__)
+
+__all__ = (
+    "DEFAULT_PROMPT_VERSION",
+    "PromptNotFoundError",
+    "PromptRegistry",
+    "RegisteredPrompt",
+    "prompt_registry",
+)
+
+PROMPTS_PACKAGE = "draft_building_designs.prompts"
+
+# Modules holding the `get_<prompt_name>_prompt` functions
+PROMPT_MODULE_NAMES = ("prompt", "prompts")
+
+# Prompts living directly in the language package (e.g. `pt/prompt.py`)
+DEFAULT_PROMPT_VERSION = "default"
+
+PROMPT_GETTER_RE = re.compile(r"^get_(?P<prompt_name>\w+)_prompt$")
+VERSION_RE = re.compile(r"^v\d+$")
+
+
+class PromptNotFoundError(ValueError):
+    """Raised when a (language, prompt, version) is not registered."""
+
+
+@dataclass(frozen=True)
+class RegisteredPrompt:
+    """A prompt with its response model and precomputed schema."""
+
+    language_code: str
+    prompt_name: str
+    version: str
+    model_class: type[BaseModel]
+    prompt_text: str
+    json_schema: dict[str, Any] = field(repr=False)
+    rendered_text: str = field(repr=False)
+
+
+def _render(prompt_text: str, json_schema: dict[str, Any]) -> str:
+    """Fill the `{schema}` placeholder, leaving prompts with other fields untouched.
+
+    Prompts that expect runtime values (e.g. `{context}`) are formatted by the
+    caller, so only prompts whose single placeholder is the schema are rendered.
+    """
+    fields = {name for _, name, _, _ in Formatter().parse(prompt_text) if name}
+    if fields == {"schema"}:
+        return prompt_text.format(schema=json_schema)
+    return prompt_text
+
+
+class PromptRegistry:
+    """Registry of prompts indexed by (language_code, prompt_name, version)."""
+
+    def __init__(self, package: str = PROMPTS_PACKAGE) -> None:
+        """Initialize instance."""
+        self._package = package
+        self._prompts: dict[tuple[str, str, str], RegisteredPrompt] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self, *, force: bool = False) -> None:
+        """Import every language module and precompute its prompts."""
+        with self._lock:
+            if self._loaded and not force:
+                return
+
+            prompts: dict[tuple[str, str, str], RegisteredPrompt] = {}
+            package = importlib.import_module(self._package)
+            for module_info in pkgutil.walk_packages(
+                package.__path__, prefix=f"{self._package}."
+            ):
+                relative_path = module_info.name.removeprefix(
+                    f"{self._package}."
+                ).split(".")
+                if (
+                    len(relative_path) < 2
+                    or relative_path[-1] not in PROMPT_MODULE_NAMES
+                ):
+                    continue
+
+                language_code, *version_path, _ = relative_path
+                if version_path and not all(
+                    VERSION_RE.match(part) for part in version_path
+                ):
+                    continue
+                version = ".".join(version_path) or DEFAULT_PROMPT_VERSION
+
+                module = importlib.import_module(module_info.name)
+                for prompt in self._prompts_from_module(
+                    module, language_code=language_code, version=version
+                ):
+                    prompts[
+                        (prompt.language_code, prompt.prompt_name, prompt.version)
+                    ] = prompt
+
+            self._prompts = prompts
+            self._loaded = True
+
+        logger.info("Prompt registry loaded", prompts_count=len(prompts))
+
+    @staticmethod
+    def _prompts_from_module(
+        module: ModuleType, *, language_code: str, version: str
+    ) -> list[RegisteredPrompt]:
+        prompts = []
+        for attribute_name in dir(module):
+            match = PROMPT_GETTER_RE.match(attribute_name)
+            if not match:
+                continue
+
+            prompt_name = match.group("prompt_name")
+            try:
+                prompt_text, model_name = getattr(module, attribute_name)()
+                model_class = getattr(module, model_name)
+                json_schema = model_class.model_json_schema()
+            except Exception:
+                logger.exception(
+                    "Failed to register prompt",
+                    module=module.__name__,
+                    prompt_name=prompt_name,
+                )
+                continue
+
+            prompts.append(
+                RegisteredPrompt(
+                    language_code=language_code,
+                    prompt_name=prompt_name,
+                    version=version,
+                    model_class=model_class,
+                    prompt_text=prompt_text,
+                    json_schema=json_schema,
+                    rendered_text=_render(prompt_text, json_schema),
+                )
+            )
+        return prompts
+
+    def get(
+        self, language_code: str, prompt_name: str, version: str | None = None
+    ) -> RegisteredPrompt:
+        """Get a registered prompt, loading the registry on first use."""
+        if not self._loaded:
+            self.load()
+
+        key = (language_code, prompt_name, version or DEFAULT_PROMPT_VERSION)
+        try:
+            return self._prompts[key]
+        except KeyError as e:
+            msg = f"Unsupported language code or prompt: {language_code}, {prompt_name}, {key[2]}"
+            raise PromptNotFoundError(msg) from e
+
+    def versions(self, language_code: str, prompt_name: str) -> list[str]:
+        """List the registered versions of a prompt."""
+        if not self._loaded:
+            self.load()
+
+        return sorted(
+            version
+            for registered_language_code, registered_prompt_name, version in self._prompts
+            if registered_language_code == language_code
+            and registered_prompt_name == prompt_name
+        )
+
+
+prompt_registry = PromptRegistry()
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+import pytest
+
+from draft_building_designs.prompts.pt import prompt as pt_prompt
+from draft_building_designs.prompts.registry import (
+    DEFAULT_PROMPT_VERSION,
+    PromptNotFoundError,
+    PromptRegistry,
+)
+
+
+def test_loads_language_package_and_versioned_prompts() -> None:
+    registry = PromptRegistry()
+
+    default_prompt = registry.get("pt", "generate_component_bom")
+    v2_prompt = registry.get(
+        "pt", "extract_columns_metadata_from_design_drawing_file", "v2"
+    )
+
+    assert default_prompt.version == DEFAULT_PROMPT_VERSION
+    assert default_prompt.model_class is pt_prompt.Calculo
+    assert v2_prompt.model_class.__name__ == "Pilares"
+    assert registry.versions("pt", "generate_component_bom") == [
+        DEFAULT_PROMPT_VERSION,
+        "v2",
+    ]
+
+
+def test_renders_schema_once() -> None:
+    registry = PromptRegistry()
+    registry.load()
+
+    with patch.object(pt_prompt.Sapatas, "model_json_schema") as mock_schema:
+        prompt = registry.get("pt", "extract_footings_from_design_drawing_document")
+        registry.get("pt", "extract_footings_from_design_drawing_document")
+
+        mock_schema.assert_not_called()
+
+    assert prompt.rendered_text == prompt.prompt_text.format(
+        schema=pt_prompt.Sapatas.model_json_schema()
+    )
+
+
+def test_does_not_render_prompts_with_runtime_fields() -> None:
+    prompt = PromptRegistry().get("pt", "generate_component_bom")
+
+    assert "{context}" in prompt.rendered_text
+
+
+def test_raises_for_unknown_prompt() -> None:
+    with pytest.raises(PromptNotFoundError):
+        PromptRegistry().get("pt", "unknown")
@@ -1,44 +1,70 @@
-import importlib
-from typing import Type
+from typing import Type, get_args, get_origin
 
 import structlog
 from pydantic import BaseModel
 
+from draft_building_designs.prompts.registry import (
+    PromptNotFoundError,
+    RegisteredPrompt,
+    prompt_registry,
+)
+
 logger = structlog.get_logger(__name__)
 
 
 class LanguageModelFactory:
+    @staticmethod
+    def get_prompt(
+        language_code: str, prompt_name: str, version: str | None = None
+    ) -> RegisteredPrompt:
+        """
+        Get the registered prompt with its precomputed schema and rendered text
+
+        Args:
+            language_code: The language code (e.g., 'pt', 'en_us')
+            prompt_name: The prompt name to load (e.g., 'generate_component_bom')
+            version: The prompt version (e.g., 'v2'), defaults to the language package prompts
+
+        Returns:
+            The RegisteredPrompt
+        """
+        try:
+            return prompt_registry.get(language_code, prompt_name, version)
+        except PromptNotFoundError as e:
+            logger.error(f"Failed to load language model: {e}")
+            raise
+
     @staticmethod
     def get_language_model(
-        language_code: str, prompt_name: str
+        language_code: str, prompt_name: str, version: str | None = None
     ) -> tuple[Type[BaseModel], str]:
         """
         Factory method to get the appropriate language model and prompt
 
         Args:
-            language_code: The language code (e.g., 'pt_pt', 'en_us')
-            model_name: The model name to load (e.g., 'footing')
+            language_code: The language code (e.g., 'pt', 'en_us')
+            prompt_name: The prompt name to load (e.g., 'generate_component_bom')
+            version: The prompt version (e.g., 'v2'), defaults to the language package prompts
 
         Returns:
             A tuple containing (ModelClass, prompt_text)
         """
-        try:
-            # Import the language-specific module
-            module_path = f"draft_building_designs.prompts.{language_code}.prompt"
-            language_module = importlib.import_module(module_path)
-
-            # Get the model class and prompt
-            prompt_text, model_name = getattr(
-                language_module, f"get_{prompt_name}_prompt"
-            )()
-            model_class = getattr(language_module, model_name)
-
-            return model_class, prompt_text
-        except (ImportError, AttributeError) as e:
-            logger.error(f"Failed to load language model: {e}")
-            raise ValueError(
-                f"Unsupported language code or model: {language_code}, {model_name}"
-            )
+        prompt = LanguageModelFactory.get_prompt(language_code, prompt_name, version)
+        return prompt.model_class, prompt.prompt_text
+
+
+def _get_list_item_class(
+    model_class: Type[BaseModel], field_name: str
+) -> Type[BaseModel] | None:
+    """Gets the model of the items of a list field, if it's a list of models"""
+    field = model_class.model_fields.get(field_name)
+    if field is None or get_origin(field.annotation) is not list:
+        return None
+
+    [item_class] = get_args(field.annotation)
+    if isinstance(item_class, type) and issubclass(item_class, BaseModel):
+        return item_class
+    return None
 
 
 class ModelMapper:
@@ -87,6 +113,12 @@ class ModelMapper:
                 "peso_da_armadura_em_quilogramas": "steel_weight_in_kilograms",
                 "raciocinio": "rationale",
             },
+            "CalculoComponente": {
+                "id": "id",
+                "volume_de_betao_em_metros_cubicos": "concrete_volume_in_cubic_meters",
+                "peso_da_armadura_em_quilogramas": "steel_weight_in_kilograms",
+                "raciocinio": "rationale",
+            },
             "Calculos": {
                 "calculos": "boms",
             },
@@ -108,11 +140,12 @@ class ModelMapper:
                 if isinstance(source_value, list) and all(
                     isinstance(item, BaseModel) for item in source_value
                 ):
-                    # Determine the target item class based on naming convention
-                    # For example, if target_model_class is Columns, the items should be Column
-                    target_item_class = globals().get(
-                        target_field.rstrip("s").capitalize()
-                    )
+                    # Determine the target item class from the target field, or based on
+                    # naming convention: if target_model_class is Columns, the items
+                    # should be Column
+                    target_item_class = _get_list_item_class(
+                        target_model_class, target_field
+                    ) or globals().get(target_field.rstrip("s").capitalize())
                     if target_item_class:
                         target_data[target_field] = [
                             ModelMapper.map_to_domain(item, target_item_class)
@@ -0,0 +1,87 @@
+"""
+Server-sent events stream of the draft building design progress.
+"""
+
+import json
+import time
+from collections.abc import Callable, Iterator
+
+from rest_framework.renderers import BaseRenderer
+
+from draft_building_designs.services.progress import (
+    ProgressEventListener,
+    get_progress_events,
+)
+
+# Delay before EventSource reconnects after the stream ends
+PROGRESS_STREAM_RETRY_MILLISECONDS = 1000
+# A stream holds a thread of a (gthread) worker and its database connection
+# while it's open, so it ends after a while and the client reconnects with
+# Last-Event-ID to resume it
+PROGRESS_STREAM_TIMEOUT_SECONDS = 5 * 60
+# Comments keep proxies from closing an idle connection
+PROGRESS_STREAM_HEARTBEAT_SECONDS = 5
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer accepting `text/event-stream`, the response is streamed by the view.
+
+    Only the error responses are rendered, as a single `error` event.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return ""
+        return f"event: error\ndata: {json.dumps(data)}\n\n"
+
+
+def iter_progress_event_stream(
+    *,
+    draft_building_design_uuid: str,
+    last_event_id: int = 0,
+    timeout: float = PROGRESS_STREAM_TIMEOUT_SECONDS,
+    clock: Callable[[], float] = time.monotonic,
+    listener: ProgressEventListener | None = None,
+) -> Iterator[str]:
+    """
+    Yield the progress events as SSE messages until the final event or timeout.
+
+    The events are queried when their notification is received, not polled.
+    The event ids are the sequence numbers, so a client reconnecting with
+    `Last-Event-ID`, as EventSource does after the timeout, only receives the
+    events it missed.
+    """
+    if listener is None:
+        listener = ProgressEventListener(
+            draft_building_design_uuid=draft_building_design_uuid
+        )
+
+    started_at = clock()
+    yield f"retry: {PROGRESS_STREAM_RETRY_MILLISECONDS}\n\n"
+
+    with listener:
+        # The events published before listening are queried first
+        notified = True
+        while (remaining := timeout - (clock() - started_at)) > 0:
+            if notified:
+                for event in get_progress_events(
+                    draft_building_design_uuid=draft_building_design_uuid,
+                    after=last_event_id,
+                ):
+                    last_event_id = event.sequence
+                    yield (
+                        f"id: {event.sequence}\n"
+                        "event: progress\n"
+                        f"data: {event.model_dump_json()}\n\n"
+                    )
+                    if event.is_final:
+                        return
+
+            notified = listener.wait(min(remaining, PROGRESS_STREAM_HEARTBEAT_SECONDS))
+            if not notified:
+                yield ": heartbeat\n\n"
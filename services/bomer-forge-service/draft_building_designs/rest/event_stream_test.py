@@ -0,0 +1,128 @@
+import pytest
+from django.contrib.auth.models import User
+
+from draft_building_designs.models import DraftBuildingDesign
+from draft_building_designs.rest.event_stream import iter_progress_event_stream
+from draft_building_designs.services.progress import (
+    ProgressEvent,
+    publish_progress_event,
+)
+from projects.models import Project
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeListener:
+    """
+    Listener receiving no notification, the time passes while it waits.
+    """
+
+    def __init__(self, clock: FakeClock) -> None:
+        self.clock = clock
+        self.is_listening = False
+
+    def __enter__(self) -> "FakeListener":
+        self.is_listening = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.is_listening = False
+
+    def wait(self, timeout: float) -> bool:
+        self.clock.now += timeout
+        return False
+
+
+@pytest.fixture()
+def draft_building_design_uuid() -> str:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return str(DraftBuildingDesign.objects.create(project=project, name="design").uuid)
+
+
+@pytest.mark.django_db
+def test_streams_until_final_event(draft_building_design_uuid) -> None:
+    events = [
+        publish_progress_event(
+            draft_building_design_uuid=draft_building_design_uuid,
+            event=ProgressEvent(status="CREATING_COLUMN_COMPONENTS", documents_total=2),
+        ),
+        publish_progress_event(
+            draft_building_design_uuid=draft_building_design_uuid,
+            event=ProgressEvent(status="CREATING_BEAM_COMPONENTS", is_final=True),
+        ),
+    ]
+    clock = FakeClock()
+
+    messages = list(
+        iter_progress_event_stream(
+            draft_building_design_uuid=draft_building_design_uuid,
+            clock=clock,
+            listener=FakeListener(clock),
+        )
+    )
+
+    assert messages[0].startswith("retry: ")
+    assert [message.split("\n")[0] for message in messages[1:]] == [
+        f"id: {event.sequence}" for event in events
+    ]
+
+
+@pytest.mark.django_db
+def test_resumes_from_last_event_id_and_times_out(draft_building_design_uuid) -> None:
+    event = publish_progress_event(
+        draft_building_design_uuid=draft_building_design_uuid,
+        event=ProgressEvent(status="CREATING_COLUMN_COMPONENTS"),
+    )
+    clock = FakeClock()
+
+    messages = list(
+        iter_progress_event_stream(
+            draft_building_design_uuid=draft_building_design_uuid,
+            last_event_id=event.sequence,
+            timeout=10,
+            clock=clock,
+            listener=FakeListener(clock),
+        )
+    )
+
+    assert not any(message.startswith("id:") for message in messages)
+    assert messages.count(": heartbeat\n\n") == 2
+    assert clock.now == 10
+
+
+@pytest.mark.django_db
+def test_queries_events_when_notified(draft_building_design_uuid) -> None:
+    clock = FakeClock()
+
+    class NotifiedListener(FakeListener):
+        def wait(self, timeout: float) -> bool:
+            publish_progress_event(
+                draft_building_design_uuid=draft_building_design_uuid,
+                event=ProgressEvent(status="CREATING_BEAM_COMPONENTS", is_final=True),
+            )
+            return True
+
+    listener = NotifiedListener(clock)
+    messages = list(
+        iter_progress_event_stream(
+            draft_building_design_uuid=draft_building_design_uuid,
+            clock=clock,
+            listener=listener,
+        )
+    )
+
+    assert [message.split("\n")[1] for message in messages[1:]] == ["event: progress"]
+    assert not listener.is_listening
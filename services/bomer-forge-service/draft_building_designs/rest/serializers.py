@@ -2,9 +2,14 @@ from rest_framework import serializers
 from draft_building_designs.models import (
     DraftBuildingDesign,
     DraftBuildingDesignBuildingComponent,
+    DraftBuildingDesignBuildingComponentTombstone,
     DraftBuildingDesignCalculationModule,
+    DraftBuildingDesignDrawingDocument,
+)
+from building_components.rest.serializers import (
+    BuildingComponentSerializer,
+    BuildingComponentSummarySerializer,
 )
-from building_components.rest.serializers import BuildingComponentSerializer
 
 
 class DraftBuildingDesignSerializer(serializers.ModelSerializer):
@@ -25,6 +30,26 @@ class UploadDesignDrawingSerializer(serializers.Serializer):
     type = serializers.ChoiceField(choices=["FOOTING", "COLUMN", "BEAM", "SLAB"])
 
 
+class DraftBuildingDesignDrawingDocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DraftBuildingDesignDrawingDocument
+        fields = [
+            "uuid",
+            "file",
+            "type",
+            "content_hash",
+            "perceptual_hash",
+            "source_document",
+            "page_number",
+            "created_at",
+        ]
+
+
+class UploadedDrawingDocumentSerializer(serializers.Serializer):
+    drawing_document = DraftBuildingDesignDrawingDocumentSerializer()
+    is_duplicate = serializers.BooleanField()
+
+
 class DraftBuildingDesignBuildingComponentSerializer(serializers.ModelSerializer):
     building_component = BuildingComponentSerializer()
 
@@ -33,6 +58,32 @@ class DraftBuildingDesignBuildingComponentSerializer(serializers.ModelSerializer
         fields = "__all__"
 
 
+class DraftBuildingDesignBuildingComponentSummarySerializer(
+    serializers.ModelSerializer
+):
+    building_component = BuildingComponentSummarySerializer()
+
+    class Meta:
+        model = DraftBuildingDesignBuildingComponent
+        fields = ["uuid", "building_component"]
+
+
+class DraftBuildingDesignBuildingComponentTombstoneSerializer(
+    serializers.ModelSerializer
+):
+    class Meta:
+        model = DraftBuildingDesignBuildingComponentTombstone
+        fields = [
+            "draft_building_design_building_component_uuid",
+            "building_component_uuid",
+            "created_at",
+        ]
+
+
+class DraftBuildingDesignComponentsChangesQuerySerializer(serializers.Serializer):
+    since = serializers.DateTimeField(required=False)
+
+
 class DraftBuildingDesignCalculationModuleSerializer(serializers.ModelSerializer):
     class Meta:
         model = DraftBuildingDesignCalculationModule
@@ -1,21 +1,51 @@
+import logging
+
 import structlog
+from building_components.component_types import (
+    UnknownComponentTypeError,
+    component_type_tree,
+)
 from building_components.models import BuildingComponent, BuildingComponentType
+from building_components.rest.serializers import (
+    get_requested_fields,
+    is_summary_requested,
+)
+from core.logging import LazyPayload
+from core.rest.pagination import OptionalCursorPagination
+from core.rest.renderers import FAST_JSON_RENDERER_CLASSES
 from django.core.cache import cache
-from django.db.models import F
+from django.db.models import F, Q
+from django.http import StreamingHttpResponse
 from draft_building_designs.models import (
     DraftBuildingDesign,
     DraftBuildingDesignBuildingComponent,
     DraftBuildingDesignCalculationModule,
     DraftBuildingDesignDrawingDocument,
 )
+from draft_building_designs.rest.event_stream import (
+    EventStreamRenderer,
+    iter_progress_event_stream,
+)
 from draft_building_designs.rest.serializers import (
     CreateDraftBuildingDesignSerializer,
     DraftBuildingDesignBomSerializer,
     DraftBuildingDesignBuildingComponentSerializer,
+    DraftBuildingDesignBuildingComponentSummarySerializer,
+    DraftBuildingDesignBuildingComponentTombstoneSerializer,
     DraftBuildingDesignCalculationModuleSerializer,
+    DraftBuildingDesignComponentsChangesQuerySerializer,
     DraftBuildingDesignSerializer,
     UploadDesignDrawingSerializer,
+    UploadedDrawingDocumentSerializer,
 )
+from draft_building_designs.services.components_changes import (
+    ComponentsChangesCursorTooOldError,
+    get_components_changes,
+)
+from draft_building_designs.services.drawing_document_upload import (
+    upload_drawing_document,
+)
+from draft_building_designs.tasks import enqueue_ingest_pdf_drawing_document
 from projects.models import Project
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -34,6 +64,43 @@ class DraftBuildingDesignViewSet(viewsets.ModelViewSet):
     queryset = DraftBuildingDesign.objects.all()
     serializer_class = DraftBuildingDesignSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalCursorPagination
+
+    def _serialize_building_components(self, request, query, *, paginate: bool):
+        """
+        Serialize the building components of a design with the requested fields
+        or summary representation, returning the serializer and the page.
+        """
+        fields = get_requested_fields(request)
+        if is_summary_requested(request):
+            serializer_class = DraftBuildingDesignBuildingComponentSummarySerializer
+            query = query.defer(
+                "building_component__component_data",
+                "building_component__description",
+            )
+        else:
+            serializer_class = DraftBuildingDesignBuildingComponentSerializer
+            if fields is not None and "component_data" not in fields:
+                query = query.defer("building_component__component_data")
+
+        context = {**self.get_serializer_context(), "fields": fields}
+        page = self.paginate_queryset(query) if paginate else None
+        serializer = serializer_class(
+            query if page is None else page, many=True, context=context
+        )
+        return serializer, page
+
+    def _list_building_components(self, request, query):
+        """
+        List the building components of a design, paginated when the client
+        asks for a page.
+        """
+        serializer, page = self._serialize_building_components(
+            request, query, paginate=True
+        )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     def create(self, request, *args, **kwargs):
         serializer = CreateDraftBuildingDesignSerializer(data=request.data)
@@ -92,15 +159,9 @@ class DraftBuildingDesignViewSet(viewsets.ModelViewSet):
         if serializer.validated_data["type"] == "FOOTING":
             # TODO: refactor
             if serializer.validated_data["is_strip_footing"]:
-                component_building_type = BuildingComponentType.objects.filter(
-                    name="Continuous"
-                ).first()
+                component_building_type = component_type_tree.get("Continuous").type
             else:
-                component_building_type = BuildingComponentType.objects.filter(
-                    name="Isolated"
-                ).first()
-            if not component_building_type:
-                raise ValidationError({"detail": "Building component type not found"})
+                component_building_type = component_type_tree.get("Isolated").type
 
             for document in documents:
                 # ai generate footing components
@@ -109,7 +170,12 @@ class DraftBuildingDesignViewSet(viewsets.ModelViewSet):
                 )
                 logger.info(
                     "Extracted footings from drawing design document",
-                    footings=footings,
+                    drawing_document_uuid=document.uuid,
+                    footings_count=len(footings),
+                    footings=LazyPayload(
+                        lambda: [footing.model_dump() for footing in footings],
+                        level=logging.DEBUG,
+                    ),
                 )
                 # TODO: need to add the footing length if it's a strip footing
                 footing_components = [
@@ -132,18 +198,19 @@ class DraftBuildingDesignViewSet(viewsets.ModelViewSet):
 
         # TODO: refactor this
         if serializer.validated_data["type"] == "COLUMN":
-            component_building_type = BuildingComponentType.objects.filter(
-                name="Column"
-            ).first()
-            if not component_building_type:
-                raise ValidationError({"detail": "Building component type not found"})
+            component_building_type = component_type_tree.get("Column").type
             for document in documents:
                 columns = extract_columns_from_drawing_design_document(
                     drawing_document_uuid=str(document.uuid),
                 )
                 logger.info(
                     "Extracted columns from drawing design document",
-                    columns=columns,
+                    drawing_document_uuid=document.uuid,
+                    columns_count=len(columns),
+                    columns=LazyPayload(
+                        lambda: [column.model_dump() for column in columns],
+                        level=logging.DEBUG,
+                    ),
                 )
                 column_components = [
                     BuildingComponent(
@@ -172,30 +239,57 @@ class DraftBuildingDesignViewSet(viewsets.ModelViewSet):
         url_path="upload-files",
     )
     def upload_files(self, request, *args, **kwargs):
+        """
+        Upload the drawing documents of a draft building design. A file the
+        design has already is linked to its existing document, which isn't
+        extracted again.
+        """
         serializer = UploadDesignDrawingSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         draft_building_design = DraftBuildingDesign.objects.get(
             uuid=serializer.validated_data["draft_building_design_uuid"]
         )
+        uploaded_documents = []
         for file in serializer.validated_data["files"]:
-            DraftBuildingDesignDrawingDocument.objects.create(
+            uploaded_document = upload_drawing_document(
                 draft_building_design=draft_building_design,
                 file=file,
                 type=serializer.validated_data["type"],
             )
+            drawing_document = uploaded_document.drawing_document
+            # A PDF uploaded again is ingested again if it has no pages yet, in
+            # case its ingestion failed, the registered pages are kept
+            if drawing_document.is_pdf and (
+                not uploaded_document.is_duplicate
+                or not drawing_document.pages.exists()
+            ):
+                enqueue_ingest_pdf_drawing_document(drawing_document=drawing_document)
+            uploaded_documents.append(uploaded_document)
 
-        return Response(status=status.HTTP_200_OK)
+        return Response(
+            {
+                "drawing_documents": UploadedDrawingDocumentSerializer(
+                    uploaded_documents, many=True, context={"request": request}
+                ).data
+            },
+            status=status.HTTP_200_OK,
+        )
 
     @action(
         detail=True,
         methods=["get"],
         url_path="building-components",
         serializer_class=DraftBuildingDesignBuildingComponentSerializer,
+        renderer_classes=FAST_JSON_RENDERER_CLASSES,
     )
     def building_components(self, request, *args, **kwargs):
         """
         Get all building components for a draft building design.
-        Filter by component type using the 'type' query parameter.
+        Filter by component type using the 'type' query parameter, any name or
+        path of the component type tree (e.g. "Foundation") is accepted.
+        Select the building component fields with 'fields' (e.g. "uuid,type"),
+        or the compact representation with 'representation=summary'.
+        Paginate with 'page_size' and the returned cursors.
         """
         draft_building_design = DraftBuildingDesign.objects.get(uuid=self.kwargs["pk"])
 
@@ -209,34 +303,81 @@ class DraftBuildingDesignViewSet(viewsets.ModelViewSet):
 
         # Apply type filter if provided
         if component_type:
-            query = query.filter(building_component__type=component_type)
+            try:
+                component_types = component_type_tree.get_types(component_type)
+            except UnknownComponentTypeError as e:
+                raise ValidationError({"type": str(e)}) from e
+            query = query.filter(building_component__type__in=component_types)
 
-        serializer = DraftBuildingDesignBuildingComponentSerializer(query, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self._list_building_components(request, query)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="components-changes",
+        serializer_class=DraftBuildingDesignBuildingComponentSerializer,
+        renderer_classes=FAST_JSON_RENDERER_CLASSES,
+    )
+    def components_changes(self, request, *args, **kwargs):
+        """
+        Get the building components of a draft building design changed after
+        the 'since' cursor, with the links deleted since then. The response
+        'cursor' is the 'since' of the next call, without it every component
+        is returned. A 'since' older than the retention of the deleted links
+        gets a 410, and the client must get every component again. Accepts the
+        'fields' and 'representation' parameters of 'building-components'.
+        """
+        draft_building_design = DraftBuildingDesign.objects.get(uuid=self.kwargs["pk"])
+        query_serializer = DraftBuildingDesignComponentsChangesQuerySerializer(
+            data=request.query_params
+        )
+        query_serializer.is_valid(raise_exception=True)
+
+        try:
+            changes = get_components_changes(
+                draft_building_design,
+                since=query_serializer.validated_data.get("since"),
+            )
+        except ComponentsChangesCursorTooOldError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_410_GONE)
+        serializer, _ = self._serialize_building_components(
+            request, changes.components, paginate=False
+        )
+        return Response(
+            {
+                "cursor": changes.cursor.isoformat(),
+                "components": serializer.data,
+                "deleted": DraftBuildingDesignBuildingComponentTombstoneSerializer(
+                    changes.deleted, many=True
+                ).data,
+            },
+            status=status.HTTP_200_OK,
+        )
 
     @action(
         detail=True,
         methods=["get"],
         url_path="column-components",
         serializer_class=DraftBuildingDesignBuildingComponentSerializer,
+        renderer_classes=FAST_JSON_RENDERER_CLASSES,
     )
     def list_column_components(self, request, *args, **kwargs):
         """
-        Get all column components for a draft building design.
+        Get all column components for a draft building design, with the same
+        field selection, summary and pagination as 'building-components'.
         """
         draft_building_design = DraftBuildingDesign.objects.get(uuid=self.kwargs["pk"])
 
         column_draft_building_design_building_components = (
             DraftBuildingDesignBuildingComponent.objects.filter(
                 draft_building_design=draft_building_design,
-                building_component__type__name="Column",
+                building_component__type__in=component_type_tree.get_types("Column"),
             ).select_related("building_component")
         )
 
-        serializer = DraftBuildingDesignBuildingComponentSerializer(
-            column_draft_building_design_building_components, many=True
+        return self._list_building_components(
+            request, column_draft_building_design_building_components
         )
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
     # TODO: remove
     @action(
@@ -259,13 +400,12 @@ class DraftBuildingDesignViewSet(viewsets.ModelViewSet):
 
         documents = []
         for file in serializer.validated_data["files"]:
-            draft_building_design_drawing_document = (
-                DraftBuildingDesignDrawingDocument.objects.create(
-                    draft_building_design=draft_building_design,
-                    file=file,
-                )
+            uploaded_document = upload_drawing_document(
+                draft_building_design=draft_building_design,
+                file=file,
+                type=serializer.validated_data["type"],
             )
-            documents.append(draft_building_design_drawing_document)
+            documents.append(uploaded_document.drawing_document)
 
         pass
 
@@ -289,6 +429,41 @@ class DraftBuildingDesignViewSet(viewsets.ModelViewSet):
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="progress-events",
+        renderer_classes=[EventStreamRenderer],
+    )
+    def progress_events(self, request, *args, **kwargs):
+        """
+        Stream the processing progress of a draft building design as
+        server-sent events, instead of polling the design and task status.
+        """
+        draft_building_design = self.get_object()
+        # A stream would hold a single-threaded worker until it ends
+        if not request.META.get("wsgi.multithread", True):
+            return Response(
+                {"detail": "Progress events require a threaded worker."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        try:
+            last_event_id = int(request.headers.get("Last-Event-ID", 0))
+        except ValueError:
+            last_event_id = 0
+
+        response = StreamingHttpResponse(
+            iter_progress_event_stream(
+                draft_building_design_uuid=str(draft_building_design.uuid),
+                last_event_id=last_event_id,
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Disable proxy buffering so the events are sent right away
+        response["X-Accel-Buffering"] = "no"
+        return response
+
     @action(
         detail=True,
         methods=["get"],
@@ -308,26 +483,27 @@ class DraftBuildingDesignViewSet(viewsets.ModelViewSet):
             serializer = self.get_serializer(cached_bom)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
-        # Optimize query to get all components in a single query with their BOM data
-        components = draft_building_design.building_components.annotate(
-            component_type=F("type"),
-            steel_weight=F("component_data__bom__steel_weight"),
-            concrete_volume=F("component_data__bom__concrete_volume"),
-        ).values(
-            "component_type",
-            "uuid",
-            "steel_weight",
-            "concrete_volume",
-            "component_data",
+        # Optimize query to get all components in a single query with their BOM data,
+        # filtered on the indexed columns generated from it
+        components = (
+            draft_building_design.building_components.filter(
+                steel_weight__isnull=False, concrete_volume__isnull=False
+            )
+            .exclude(Q(steel_weight=0) | Q(concrete_volume=0))
+            .annotate(component_type=F("type"))
+            .values(
+                "component_type",
+                "uuid",
+                "steel_weight",
+                "concrete_volume",
+                "component_data",
+            )
         )
 
         # Process components by type
         bom = {"footings": [], "columns": [], "beams": [], "slabs": []}
 
         for component in components:
-            if not component["steel_weight"] or not component["concrete_volume"]:
-                continue
-
             item = {
                 "id": str(component["uuid"]),
                 "steel_weight": float(component["steel_weight"]),
@@ -2,16 +2,39 @@
 This module contains the logic for calculating the materials for the draft building design.
 """
 
+import json
+import math
+from typing import Any, cast
+
 import structlog
 from ai.services.runnables import (
     get_gpt,
     get_langfuse_callback_handler,
     langchain_prompt_from_langfuse,
+    langchain_prompt_from_text,
 )
 from pydantic import BaseModel, Field
 
+from core.constants import (
+    BOM_BATCH_MAX_ATTEMPTS,
+    BOM_BATCH_MAX_PROMPT_TOKENS,
+    BOM_BATCH_MAX_SIZE,
+)
 from draft_building_designs.models import DraftBuildingDesign
+from draft_building_designs.prompts.utils import LanguageModelFactory, ModelMapper
+from draft_building_designs.services.ai.draft_building_design_components_measure import (
+    Beam,
+    Column,
+    Footing,
+    Slab,
+)
+from draft_building_designs.utils.component_data import (
+    ComponentDataView,
+    compile_component_data_view,
+    hydrate_component_data_views,
+)
 from building_components.models import BuildingComponent, BuildingComponentType
+from building_components.services.bom_result_sink import BomResultSink, without_bom
 
 logger = structlog.get_logger(__name__)
 
@@ -79,106 +102,135 @@ class SlabComponentData(BaseModel):
     thickness: str
 
 
-def _get_column_component_data(
-    *, building_component: BuildingComponent
-) -> ColumnComponentData:
+# Views of the component_data of each type, hydrated once per component
+COMPONENT_DATA_VIEWS: dict[str, type[ComponentDataView]] = {
+    BuildingComponentType.COLUMN: compile_component_data_view(Column),
+    BuildingComponentType.FOOTING: compile_component_data_view(Footing),
+    BuildingComponentType.BEAM: compile_component_data_view(Beam),
+    BuildingComponentType.SLAB: compile_component_data_view(Slab),
+}
+
+FOOTING_REINFORCEMENTS = (
+    "top_reinforcement_x",
+    "bottom_reinforcement_x",
+    "top_reinforcement_y",
+    "bottom_reinforcement_y",
+)
+
+
+def _get_column_component_data(*, component_data: Any) -> ColumnComponentData:
     """
     This function gets the data for a column component.
     """
     return ColumnComponentData(
-        height=f"{building_component.component_data.get('height')}cm",
-        width=f"{building_component.component_data.get('width')}cm",
-        length=f"{building_component.component_data.get('length')}cm",
-        longitudinal_reinforcement=building_component.component_data.get(
-            "longitudinal_rebar"
-        ),
-        transverse_reinforcement=building_component.component_data.get("stirrups"),
+        height=f"{component_data.height}cm",
+        width=f"{component_data.width}cm",
+        length=f"{component_data.length}cm",
+        longitudinal_reinforcement=component_data.longitudinal_rebar,
+        transverse_reinforcement=component_data.stirrups,
     )
 
 
-def _get_footing_component_data(
-    *, building_component: BuildingComponent
-) -> FootingComponentData:
+def _get_footing_component_data(*, component_data: Any) -> FootingComponentData:
     """
     This function gets the data for a footing component.
     """
     reinforcement_bars = []
-    reinforcements = [
-        "top_reinforcement_x",
-        "bottom_reinforcement_x",
-        "top_reinforcement_y",
-        "bottom_reinforcement_y",
-    ]
-    for reinforcement in reinforcements:
-        if building_component.component_data.get(reinforcement):
-            reinforcement_bars.append(
-                building_component.component_data.get(reinforcement)
-            )
+    for reinforcement in FOOTING_REINFORCEMENTS:
+        reinforcement_bar = getattr(component_data, reinforcement)
+        if reinforcement_bar:
+            reinforcement_bars.append(reinforcement_bar)
 
     return FootingComponentData(
-        height=f"{building_component.component_data.get('height')}cm",
-        width=f"{building_component.component_data.get('width')}cm",
-        length=f"{building_component.component_data.get('length')}cm",
+        height=f"{component_data.height}cm",
+        width=f"{component_data.width}cm",
+        length=f"{component_data.length}cm",
         reinforcement_bars=reinforcement_bars,
     )
 
 
-def _get_beam_component_data(
-    *, building_component: BuildingComponent
-) -> BeamComponentData:
+def _get_beam_component_data(*, component_data: Any) -> BeamComponentData:
     """
     This function gets the data for a beam component.
     """
-    longitudinal_reinforcement = f"{building_component.component_data.get('longitudinal_reinforcement_quantity')}Ø{building_component.component_data.get('longitudinal_reinforcement_diameter')}"
+    longitudinal_reinforcement = (
+        f"{component_data.longitudinal_reinforcement_quantity}"
+        f"Ø{component_data.longitudinal_reinforcement_diameter}"
+    )
     stirrups = [
-        f"{building_component.component_data.get('stirrups_quantity')}Ø{building_component.component_data.get('stirrups_diameter')}"
+        f"{component_data.stirrups_quantity}Ø{component_data.stirrups_diameter}"
     ]
 
     return BeamComponentData(
-        height=f"{building_component.component_data.get('height')}cm",
-        width=f"{building_component.component_data.get('width')}cm",
-        length=f"{building_component.component_data.get('length')}cm",
+        height=f"{component_data.height}cm",
+        width=f"{component_data.width}cm",
+        length=f"{component_data.length}cm",
         longitudinal_reinforcement=longitudinal_reinforcement,
         stirrups=stirrups,
     )
 
 
-def _get_slab_component_data(
-    *, building_component: BuildingComponent
-) -> SlabComponentData:
+def _get_slab_component_data(*, component_data: Any) -> SlabComponentData:
     """
     This function gets the data for a slab component.
     """
     return SlabComponentData(
-        area=f"{building_component.component_data.get('area')}m²",
-        thickness=f"{building_component.component_data.get('thickness')}cm",
+        area=f"{component_data.area}m²",
+        thickness=f"{component_data.thickness}cm",
     )
 
 
-def get_component_data(*, building_component: BuildingComponent) -> BaseModel:
+def get_component_data(
+    *,
+    building_component: BuildingComponent,
+    component_data: ComponentDataView | None = None,
+) -> BaseModel:
     """
-    This function gets the data for a building component.
+    This function gets the data for a building component, from the view of
+    its component_data when it's hydrated already.
     """
+    if component_data is None and building_component.type in COMPONENT_DATA_VIEWS:
+        component_data = COMPONENT_DATA_VIEWS[building_component.type].hydrate(
+            building_component.component_data
+        )
+
     match building_component.type:
         case BuildingComponentType.COLUMN:
-            return _get_column_component_data(building_component=building_component)
+            return _get_column_component_data(component_data=component_data)
         case BuildingComponentType.FOOTING:
-            return _get_footing_component_data(building_component=building_component)
+            return _get_footing_component_data(component_data=component_data)
         case BuildingComponentType.BEAM:
-            return _get_beam_component_data(building_component=building_component)
+            return _get_beam_component_data(component_data=component_data)
         case BuildingComponentType.SLAB:
-            return _get_slab_component_data(building_component=building_component)
+            return _get_slab_component_data(component_data=component_data)
         case _:
             raise ValueError(
-                f"Invalid building component type: {building_component.component_type}"
+                f"Invalid building component type: {building_component.type}"
             )
 
 
+def _log_invalid_component_data(
+    *, building_component: BuildingComponent, error: Exception
+) -> None:
+    """
+    This function logs a building component skipped for its invalid data.
+    """
+    logger.warning(
+        "Skipping building component with invalid data",
+        building_component_uuid=building_component.uuid,
+        error=str(error),
+    )
+
+
 def generate_draft_building_design_components_bom(
-    *, draft_building_design_uuid: str
-) -> ComponentBillOfMaterials:
+    *, draft_building_design_uuid: str, overwrite: bool = False
+) -> None:
     """
-    This function generates the bill of materials for the footing.
+    This function generates the bill of materials for the components of a
+    draft building design.
+
+    Components that already have a BOM are skipped unless `overwrite` is set,
+    so a run that failed midway resumes where it stopped.
     """
     gpt = get_gpt()
 
@@ -186,24 +238,270 @@ def generate_draft_building_design_components_bom(
         uuid=draft_building_design_uuid
     )
 
-    building_components = draft_building_design.building_components.filter()
-
-    for building_component in building_components:
-        chain = langchain_prompt_from_langfuse(
-            prompt_name="calculate_building_component_bom"
-        ) | gpt.with_structured_output(ComponentBillOfMaterials, method="json_schema")
-
-        bom = chain.invoke(
-            {
-                "context": get_component_data(
-                    building_component=building_component
-                ).model_dump_json()
-            },
-            config={
-                "callbacks": [get_langfuse_callback_handler()],
-                "run_name": "generate_draft_building_design_components_bom",
-            },
+    building_components = draft_building_design.building_components.all()
+    if not overwrite:
+        building_components = without_bom(building_components)
+
+    # The prompt is fetched (and the chain built) once for every component
+    chain = langchain_prompt_from_langfuse(
+        prompt_name="calculate_building_component_bom"
+    ) | gpt.with_structured_output(ComponentBillOfMaterials, method="json_schema")
+
+    building_components = list(building_components)
+    component_data_views = hydrate_component_data_views(
+        building_components, COMPONENT_DATA_VIEWS
+    )
+    with BomResultSink() as sink:
+        for building_component, component_data in zip(
+            building_components, component_data_views
+        ):
+            if isinstance(component_data, Exception):
+                _log_invalid_component_data(
+                    building_component=building_component, error=component_data
+                )
+                continue
+
+            bom = chain.invoke(
+                {
+                    "context": get_component_data(
+                        building_component=building_component,
+                        component_data=component_data,
+                    ).model_dump_json()
+                },
+                config={
+                    "callbacks": [get_langfuse_callback_handler()],
+                    "run_name": "generate_draft_building_design_components_bom",
+                },
+            )
+            sink.add(building_component, bom.model_dump())
+
+
+# -
+
+# Rough average for the models we use, good enough to size the batches
+CHARS_PER_TOKEN = 4
+
+
+# Base domain model for the BOM of a component in a batch
+class ComponentBom(BaseModel):
+    id: str
+    concrete_volume_in_cubic_meters: float
+    steel_weight_in_kilograms: float
+    rationale: str
+
+
+class ComponentBoms(BaseModel):
+    boms: list[ComponentBom]
+
+
+class BomBatchItem(BaseModel):
+    """
+    This class represents a component sent in a batched BOM request.
+    """
+
+    id: str
+    type: str
+    data: dict
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    This function estimates the number of tokens of a prompt text.
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def plan_bom_batches(
+    items: list[BomBatchItem], *, token_budget: int, max_batch_size: int
+) -> list[list[BomBatchItem]]:
+    """
+    This function packs the items into batches that fit the token budget.
+
+    A single item bigger than the budget still gets its own batch.
+    """
+    batches: list[list[BomBatchItem]] = []
+    batch: list[BomBatchItem] = []
+    batch_tokens = 0
+    for item in items:
+        item_tokens = estimate_tokens(item.model_dump_json())
+        if batch and (
+            batch_tokens + item_tokens > token_budget or len(batch) >= max_batch_size
+        ):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(item)
+        batch_tokens += item_tokens
+
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def validate_bom_batch_response(
+    response: BaseModel, batch: list[BomBatchItem]
+) -> dict[str, ComponentBillOfMaterials]:
+    """
+    This function validates a batched BOM response, in the model of the
+    prompt's language.
+
+    Returns the BOMs by item id. Unknown ids, duplicated ids and negative
+    quantities are dropped so the corresponding items are re-queued.
+    """
+    component_boms = cast(
+        ComponentBoms, ModelMapper.map_to_domain(response, ComponentBoms)
+    )
+    expected_ids = {item.id for item in batch}
+    boms: dict[str, ComponentBillOfMaterials] = {}
+    for component_bom in component_boms.boms:
+        if component_bom.id not in expected_ids or component_bom.id in boms:
+            logger.warning(
+                "Unexpected item in BOM batch response", item_id=component_bom.id
+            )
+            continue
+        if (
+            component_bom.concrete_volume_in_cubic_meters < 0
+            or component_bom.steel_weight_in_kilograms < 0
+        ):
+            logger.warning(
+                "Invalid quantities in BOM batch response", item_id=component_bom.id
+            )
+            continue
+
+        boms[component_bom.id] = ComponentBillOfMaterials(
+            steel_weight=component_bom.steel_weight_in_kilograms,
+            concrete_volume=component_bom.concrete_volume_in_cubic_meters,
+            rationale=component_bom.rationale,
+        )
+    return boms
+
+
+def _get_bom_batch_item(
+    *,
+    building_component: BuildingComponent,
+    component_data: ComponentDataView | None = None,
+) -> BomBatchItem:
+    """
+    This function gets the batch item for a building component.
+    """
+    return BomBatchItem(
+        id=str(building_component.uuid),
+        type=building_component.type,
+        data=get_component_data(
+            building_component=building_component, component_data=component_data
+        ).model_dump(),
+    )
+
+
+def generate_draft_building_design_components_bom_batched(
+    *,
+    draft_building_design_uuid: str,
+    language_code: str = "pt",
+    max_prompt_tokens: int = BOM_BATCH_MAX_PROMPT_TOKENS,
+    max_batch_size: int = BOM_BATCH_MAX_SIZE,
+    max_attempts: int = BOM_BATCH_MAX_ATTEMPTS,
+    overwrite: bool = False,
+) -> dict[str, ComponentBillOfMaterials]:
+    """
+    This function generates the bill of materials for the components of a
+    draft building design, packing many components in each LLM request.
+
+    Each component is identified by its uuid in the request. Items missing
+    from (or invalid in) a response are re-queued, and the batch size is
+    halved after a round with failures, for up to `max_attempts` rounds.
+    Components that already have a BOM are skipped unless `overwrite` is set.
+    """
+    prompt_name = "generate_components_bom_batch"
+    prompt = LanguageModelFactory.get_prompt(language_code, prompt_name)
+    chain = langchain_prompt_from_text(
+        prompt_text=prompt.prompt_text
+    ) | get_gpt().with_structured_output(prompt.model_class, method="json_schema")
+
+    draft_building_design = DraftBuildingDesign.objects.get(
+        uuid=draft_building_design_uuid
+    )
+
+    queryset = draft_building_design.building_components.all()
+    if not overwrite:
+        queryset = without_bom(queryset)
+
+    queried_components = list(queryset)
+    component_data_views = hydrate_component_data_views(
+        queried_components, COMPONENT_DATA_VIEWS
+    )
+    building_components: dict[str, BuildingComponent] = {}
+    pending: list[BomBatchItem] = []
+    for building_component, component_data in zip(
+        queried_components, component_data_views
+    ):
+        if isinstance(component_data, Exception):
+            _log_invalid_component_data(
+                building_component=building_component, error=component_data
+            )
+            continue
+        try:
+            item = _get_bom_batch_item(
+                building_component=building_component, component_data=component_data
+            )
+        except ValueError:
+            logger.exception(
+                "Skipping building component without BOM data",
+                building_component_uuid=building_component.uuid,
+            )
+            continue
+        building_components[item.id] = building_component
+        pending.append(item)
+
+    token_budget = max_prompt_tokens - estimate_tokens(prompt.prompt_text)
+    boms: dict[str, ComponentBillOfMaterials] = {}
+    with BomResultSink() as sink:
+        for attempt in range(1, max_attempts + 1):
+            if not pending:
+                break
+
+            batches = plan_bom_batches(
+                pending, token_budget=token_budget, max_batch_size=max_batch_size
+            )
+            logger.info(
+                "Generating BOM batches",
+                attempt=attempt,
+                items_count=len(pending),
+                batches_count=len(batches),
+            )
+
+            failed: list[BomBatchItem] = []
+            for batch in batches:
+                try:
+                    response = chain.invoke(
+                        {
+                            "context": json.dumps(
+                                [item.model_dump() for item in batch],
+                                ensure_ascii=False,
+                            )
+                        },
+                        config={
+                            "callbacks": [get_langfuse_callback_handler()],
+                            "run_name": f"{prompt_name}_{language_code}",
+                        },
+                    )
+                except Exception:
+                    logger.exception("BOM batch request failed", items_count=len(batch))
+                    failed.extend(batch)
+                    continue
+
+                batch_boms = validate_bom_batch_response(response, batch)
+                failed.extend(item for item in batch if item.id not in batch_boms)
+                for item_id, bom in batch_boms.items():
+                    sink.add(building_components[item_id], bom.model_dump())
+                boms.update(batch_boms)
+
+            if failed:
+                max_batch_size = max(1, max_batch_size // 2)
+            pending = failed
+
+    if pending:
+        logger.error(
+            "Failed to generate BOM for building components",
+            building_component_uuids=[item.id for item in pending],
         )
 
-        building_component.component_data["bom"] = bom.model_dump()
-        building_component.save()
+    return boms
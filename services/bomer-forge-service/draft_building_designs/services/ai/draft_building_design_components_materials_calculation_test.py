@@ -0,0 +1,286 @@
+import json
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+
+from building_components.models import BuildingComponent, BuildingComponentType
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignBuildingComponent,
+)
+from draft_building_designs.prompts.pt.prompt import CalculoComponente, Calculos
+from draft_building_designs.services.ai.draft_building_design_components_materials_calculation import (
+    COMPONENT_DATA_VIEWS,
+    BomBatchItem,
+    ComponentBillOfMaterials,
+    estimate_tokens,
+    generate_draft_building_design_components_bom,
+    generate_draft_building_design_components_bom_batched,
+    get_component_data,
+    plan_bom_batches,
+    validate_bom_batch_response,
+)
+from projects.models import Project
+
+MODULE = "draft_building_designs.services.ai.draft_building_design_components_materials_calculation"
+
+
+def make_item(item_id: str, size: int = 10) -> BomBatchItem:
+    return BomBatchItem(id=item_id, type="COLUMN", data={"code": "x" * size})
+
+
+def make_calculo(item_id: str, concrete_volume: float = 1.0) -> CalculoComponente:
+    return CalculoComponente(
+        id=item_id,
+        volume_de_betao_em_metros_cubicos=concrete_volume,
+        peso_da_armadura_em_quilogramas=2.0,
+        raciocinio="rationale",
+    )
+
+
+def test_plan_bom_batches_respects_max_batch_size() -> None:
+    items = [make_item(str(i)) for i in range(5)]
+
+    batches = plan_bom_batches(items, token_budget=10_000, max_batch_size=2)
+
+    assert [[item.id for item in batch] for batch in batches] == [
+        ["0", "1"],
+        ["2", "3"],
+        ["4"],
+    ]
+
+
+def test_plan_bom_batches_respects_token_budget() -> None:
+    items = [make_item(str(i), size=400) for i in range(3)]
+    item_tokens = estimate_tokens(items[0].model_dump_json())
+
+    batches = plan_bom_batches(items, token_budget=item_tokens * 2, max_batch_size=10)
+
+    assert [len(batch) for batch in batches] == [2, 1]
+
+
+def test_plan_bom_batches_keeps_oversized_items() -> None:
+    batches = plan_bom_batches(
+        [make_item("big", size=1000)], token_budget=1, max_batch_size=10
+    )
+
+    assert [[item.id for item in batch] for batch in batches] == [["big"]]
+
+
+def test_validate_bom_batch_response_drops_invalid_items() -> None:
+    batch = [make_item("a"), make_item("b"), make_item("c")]
+    response = Calculos(
+        calculos=[
+            make_calculo("a"),
+            make_calculo("a"),
+            make_calculo("b", concrete_volume=-1),
+            make_calculo("unknown"),
+        ]
+    )
+
+    boms = validate_bom_batch_response(response, batch)
+
+    assert list(boms) == ["a"]
+    assert boms["a"].concrete_volume == 1.0
+    assert boms["a"].steel_weight == 2.0
+
+
+def test_get_component_data_from_view() -> None:
+    building_component = BuildingComponent(
+        type=BuildingComponentType.FOOTING,
+        component_data={
+            "height": 50,
+            "width": 120,
+            "length": 150,
+            "bottom_reinforcement_x": "7Ø12",
+        },
+    )
+    component_data = COMPONENT_DATA_VIEWS[BuildingComponentType.FOOTING].hydrate(
+        building_component.component_data
+    )
+
+    footing_data = get_component_data(
+        building_component=building_component, component_data=component_data
+    )
+
+    assert footing_data == get_component_data(building_component=building_component)
+    assert footing_data.model_dump() == {
+        "height": "50cm",
+        "width": "120cm",
+        "length": "150cm",
+        "reinforcement_bars": ["7Ø12"],
+    }
+
+
+@pytest.mark.django_db
+def test_generate_bom_batched_requeues_failed_items() -> None:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    draft_building_design = DraftBuildingDesign.objects.create(
+        project=project, name="design"
+    )
+    building_components = [
+        BuildingComponent.objects.create(
+            type=BuildingComponentType.SLAB,
+            component_data={"area": 10, "thickness": 20},
+        )
+        for _ in range(4)
+    ]
+    for building_component in building_components:
+        DraftBuildingDesignBuildingComponent.objects.create(
+            draft_building_design=draft_building_design,
+            building_component=building_component,
+        )
+
+    batch_sizes = []
+
+    def invoke(inputs: dict[str, Any], config: dict[str, Any]) -> Calculos:
+        item_ids = [item["id"] for item in json.loads(inputs["context"])]
+        batch_sizes.append(len(item_ids))
+        match len(batch_sizes):
+            case 1:
+                # Partial response, with invalid quantities for the second item
+                return Calculos(
+                    calculos=[
+                        make_calculo(item_ids[0]),
+                        make_calculo(item_ids[1], concrete_volume=-1),
+                    ]
+                )
+            case 2:
+                raise RuntimeError("Request failed")
+            case _:
+                return Calculos(
+                    calculos=[make_calculo(item_id) for item_id in item_ids]
+                )
+
+    chain = mock.Mock()
+    chain.invoke.side_effect = invoke
+    with (
+        mock.patch(f"{MODULE}.langchain_prompt_from_text") as prompt_mock,
+        mock.patch(f"{MODULE}.get_gpt"),
+        mock.patch(f"{MODULE}.get_langfuse_callback_handler"),
+    ):
+        prompt_mock.return_value.__or__.return_value = chain
+        boms = generate_draft_building_design_components_bom_batched(
+            draft_building_design_uuid=str(draft_building_design.uuid),
+            max_batch_size=4,
+            max_attempts=3,
+        )
+
+    # The batch size is halved after each round with failures
+    assert batch_sizes == [4, 2, 1, 1, 1]
+    assert set(boms) == {
+        str(building_component.uuid) for building_component in building_components
+    }
+    for building_component in building_components:
+        building_component.refresh_from_db()
+        assert building_component.component_data["bom"] == {
+            "steel_weight": 2.0,
+            "concrete_volume": 1.0,
+            "rationale": "rationale",
+        }
+
+
+@pytest.mark.django_db
+def test_generate_bom_batched_skips_invalid_data_and_stops_after_max_attempts() -> None:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    draft_building_design = DraftBuildingDesign.objects.create(
+        project=project, name="design"
+    )
+    building_component = BuildingComponent.objects.create(
+        type=BuildingComponentType.SLAB, component_data={"area": 10, "thickness": 20}
+    )
+    invalid_building_component = BuildingComponent.objects.create(
+        type=BuildingComponentType.SLAB, component_data={"area": "large"}
+    )
+    for component in (building_component, invalid_building_component):
+        DraftBuildingDesignBuildingComponent.objects.create(
+            draft_building_design=draft_building_design,
+            building_component=component,
+        )
+
+    chain = mock.Mock()
+    chain.invoke.return_value = Calculos(calculos=[])
+    with (
+        mock.patch(f"{MODULE}.langchain_prompt_from_text") as prompt_mock,
+        mock.patch(f"{MODULE}.get_gpt"),
+        mock.patch(f"{MODULE}.get_langfuse_callback_handler"),
+    ):
+        prompt_mock.return_value.__or__.return_value = chain
+        boms = generate_draft_building_design_components_bom_batched(
+            draft_building_design_uuid=str(draft_building_design.uuid),
+            max_attempts=2,
+        )
+
+    assert boms == {}
+    # The component with invalid data is skipped
+    assert [
+        [item["id"] for item in json.loads(call.args[0]["context"])]
+        for call in chain.invoke.call_args_list
+    ] == [[str(building_component.uuid)]] * 2
+    building_component.refresh_from_db()
+    assert "bom" not in building_component.component_data
+
+
+@pytest.mark.django_db
+def test_generate_bom_skips_invalid_data() -> None:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    draft_building_design = DraftBuildingDesign.objects.create(
+        project=project, name="design"
+    )
+    building_component = BuildingComponent.objects.create(
+        type=BuildingComponentType.SLAB, component_data={"area": 10, "thickness": 20}
+    )
+    invalid_building_components = [
+        BuildingComponent.objects.create(
+            type=BuildingComponentType.SLAB, component_data={"area": "large"}
+        ),
+        BuildingComponent.objects.create(
+            type=BuildingComponentType.SLAB, component_data=["area"]
+        ),
+    ]
+    for component in (building_component, *invalid_building_components):
+        DraftBuildingDesignBuildingComponent.objects.create(
+            draft_building_design=draft_building_design,
+            building_component=component,
+        )
+
+    chain = mock.Mock()
+    chain.invoke.return_value = ComponentBillOfMaterials(
+        steel_weight=2.0, concrete_volume=1.0, rationale="rationale"
+    )
+    with (
+        mock.patch(f"{MODULE}.langchain_prompt_from_langfuse") as prompt_mock,
+        mock.patch(f"{MODULE}.get_gpt"),
+        mock.patch(f"{MODULE}.get_langfuse_callback_handler"),
+    ):
+        prompt_mock.return_value.__or__.return_value = chain
+        generate_draft_building_design_components_bom(
+            draft_building_design_uuid=str(draft_building_design.uuid)
+        )
+
+    chain.invoke.assert_called_once()
+    building_component.refresh_from_db()
+    assert building_component.component_data["bom"]["steel_weight"] == 2.0
@@ -1,18 +1,20 @@
 import base64
-import importlib
 import os
 from typing import Literal, Type, cast
 
-import cv2
-import pytesseract
 import structlog
-from PIL import Image
 from pydantic import BaseModel
 from django.conf import settings
+from core.utils.lazy_import import lazy_import
 from draft_building_designs.models import DraftBuildingDesignDrawingDocument
+from draft_building_designs.prompts.utils import LanguageModelFactory
 
 logger = structlog.get_logger(__name__)
 
+cv2 = lazy_import("cv2")
+pytesseract = lazy_import("pytesseract")
+Image = lazy_import("PIL.Image")
+
 TESSDATA_DIR = os.path.join(settings.BASE_DIR.parent, "tessdata")
 
 
@@ -45,6 +47,23 @@ class Column(BaseModel):
     type: str = "COLUMN"
 
 
+# Base domain model for beams
+class Beam(BaseModel):
+    width: float | None = None
+    length: float | None = None
+    height: float | None = None
+    longitudinal_reinforcement_quantity: int | None = None
+    longitudinal_reinforcement_diameter: float | None = None
+    stirrups_quantity: int | None = None
+    stirrups_diameter: float | None = None
+
+
+# Base domain model for slabs
+class Slab(BaseModel):
+    area: float | None = None
+    thickness: float | None = None
+
+
 class ColumnIPE(BaseModel):
     code: str | None = None
     description: str | None = None
@@ -56,40 +75,6 @@ class Columns(BaseModel):
     columns: list[Column]
 
 
-class LanguageModelFactory:
-    @staticmethod
-    def get_language_model(
-        language_code: str, prompt_name: str
-    ) -> tuple[Type[BaseModel], str]:
-        """
-        Factory method to get the appropriate language model and prompt
-
-        Args:
-            language_code: The language code (e.g., 'pt_pt', 'en_us')
-            model_name: The model name to load (e.g., 'footing')
-
-        Returns:
-            A tuple containing (ModelClass, prompt_text)
-        """
-        try:
-            # Import the language-specific module
-            module_path = f"draft_building_designs.prompts.{language_code}.prompt"
-            language_module = importlib.import_module(module_path)
-
-            # Get the model class and prompt
-            prompt_text, model_name = getattr(
-                language_module, f"get_{prompt_name}_prompt"
-            )()
-            model_class = getattr(language_module, model_name)
-
-            return model_class, prompt_text
-        except (ImportError, AttributeError) as e:
-            logger.error(f"Failed to load language model: {e}")
-            raise ValueError(
-                f"Unsupported language code or model: {language_code}, {model_name}"
-            )
-
-
 class ModelMapper:
     @staticmethod
     def map_to_domain(
@@ -159,7 +144,7 @@ class ModelMapper:
                 else:
                     target_data[target_field] = source_value
 
-        logger.info(f"Target data: {target_data}")
+        logger.debug("Target data", target_data=target_data)
         return target_model_class.model_validate(target_data)
 
 
@@ -227,9 +212,8 @@ def extract_footings_from_image(
 
     prompt_name = "extract_footings_from_design_drawing_document"
     # Get the language-specific model and prompt
-    language_model_class, prompt_text = LanguageModelFactory.get_language_model(
-        language_code, prompt_name
-    )
+    prompt = LanguageModelFactory.get_prompt(language_code, prompt_name)
+    language_model_class = prompt.model_class
 
     # -
 
@@ -256,9 +240,7 @@ def extract_footings_from_image(
                     {
                         "type": "text",
                         "text": f"""
-                        {prompt_text.format(
-                            schema=language_model_class.model_json_schema()
-                        )}
+                        {prompt.rendered_text}
                         
                         Texto extraído via OCR:
                         {extracted_text}
@@ -305,9 +287,8 @@ def extract_column_from_image(
 
     prompt_name = "extract_column_from_design_drawing_file"
     # Get the language-specific model and prompt
-    language_model_class, prompt_text = LanguageModelFactory.get_language_model(
-        language_code, prompt_name
-    )
+    prompt = LanguageModelFactory.get_prompt(language_code, prompt_name)
+    language_model_class = prompt.model_class
 
     # -
 
@@ -328,9 +309,7 @@ def extract_column_from_image(
                     {
                         "type": "text",
                         "text": f"""
-                        {prompt_text.format(
-                            schema=language_model_class.model_json_schema(),
-                        )}
+                        {prompt.rendered_text}
                         """,
                     },
                     {
@@ -0,0 +1,104 @@
+"""
+Changes of the building components of a draft building design since a cursor.
+
+The cursor is the time the previous changes were read at. Rows saved in a
+transaction that was still open at that time carry an earlier `updated_at`,
+so every read overlaps the previous one by `COMPONENTS_CHANGES_OVERLAP` and
+clients apply the changes by uuid.
+
+Tombstones are kept for `COMPONENTS_CHANGES_RETENTION`, a cursor older than
+that is refused and the client gets every component again. They are pruned by
+a periodic task, reading the changes never writes.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from building_components.models import BuildingComponent
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignBuildingComponent,
+    DraftBuildingDesignBuildingComponentTombstone,
+)
+
+COMPONENTS_CHANGES_OVERLAP = timedelta(minutes=1)
+COMPONENTS_CHANGES_RETENTION = timedelta(days=30)
+
+
+class ComponentsChangesCursorTooOldError(ValueError):
+    """
+    Raised when the tombstones of the deletions since a cursor were pruned.
+    """
+
+
+@dataclass
+class ComponentsChanges:
+    """
+    This class represents the changes of the components of a design.
+    """
+
+    cursor: datetime
+    components: QuerySet[DraftBuildingDesignBuildingComponent]
+    deleted: QuerySet[DraftBuildingDesignBuildingComponentTombstone]
+
+
+def get_components_changes(
+    draft_building_design: DraftBuildingDesign, *, since: datetime | None = None
+) -> ComponentsChanges:
+    """
+    This function gets the components, links and BOMs of a design changed
+    after `since`, and the links deleted since then. Without `since` every
+    component is returned.
+
+    Raises ComponentsChangesCursorTooOldError when `since` is older than the
+    retention of the tombstones.
+    """
+    cursor = timezone.now()
+    retained_after = cursor - COMPONENTS_CHANGES_RETENTION
+    if since is not None and since - COMPONENTS_CHANGES_OVERLAP < retained_after:
+        raise ComponentsChangesCursorTooOldError(
+            f"The cursor is older than {COMPONENTS_CHANGES_RETENTION.days} days"
+        )
+
+    components = DraftBuildingDesignBuildingComponent.objects.filter(
+        draft_building_design=draft_building_design
+    ).select_related("building_component")
+    deleted = DraftBuildingDesignBuildingComponentTombstone.objects.filter(
+        draft_building_design_uuid=draft_building_design.uuid
+    )
+
+    if since is None:
+        return ComponentsChanges(
+            cursor=cursor, components=components, deleted=deleted.none()
+        )
+
+    changed_after = since - COMPONENTS_CHANGES_OVERLAP
+    # The BOM is saved in the component data, so it bumps the component. The
+    # subquery uses the index of the component updated_at, a filter across the
+    # join couldn't
+    components = components.filter(
+        Q(updated_at__gt=changed_after)
+        | Q(
+            building_component__in=BuildingComponent.objects.filter(
+                updated_at__gt=changed_after
+            ).values("uuid")
+        )
+    )
+    deleted = deleted.filter(created_at__gt=changed_after)
+    return ComponentsChanges(cursor=cursor, components=components, deleted=deleted)
+
+
+def prune_components_tombstones(*, before: datetime | None = None) -> int:
+    """
+    This function deletes the tombstones of every design created before
+    `before`, by default the retention, and returns how many were deleted.
+    """
+    if before is None:
+        before = timezone.now() - COMPONENTS_CHANGES_RETENTION
+    deleted_count, _ = DraftBuildingDesignBuildingComponentTombstone.objects.filter(
+        created_at__lt=before
+    ).delete()
+    return deleted_count
@@ -0,0 +1,139 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from building_components.models import BuildingComponent, BuildingComponentType
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignBuildingComponent,
+    DraftBuildingDesignBuildingComponentTombstone,
+)
+from draft_building_designs.services.components_changes import (
+    COMPONENTS_CHANGES_OVERLAP,
+    COMPONENTS_CHANGES_RETENTION,
+    ComponentsChangesCursorTooOldError,
+    get_components_changes,
+    prune_components_tombstones,
+)
+from projects.models import Project
+
+
+@pytest.fixture()
+def draft_building_design() -> DraftBuildingDesign:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return DraftBuildingDesign.objects.create(project=project, name="design")
+
+
+def create_component(
+    draft_building_design: DraftBuildingDesign,
+) -> DraftBuildingDesignBuildingComponent:
+    return DraftBuildingDesignBuildingComponent.objects.create(
+        draft_building_design=draft_building_design,
+        building_component=BuildingComponent.objects.create(
+            type=BuildingComponentType.COLUMN, component_data={"code": "P1"}
+        ),
+    )
+
+
+def age(component: DraftBuildingDesignBuildingComponent, delta: timedelta) -> None:
+    updated_at = timezone.now() - delta
+    DraftBuildingDesignBuildingComponent.objects.filter(uuid=component.uuid).update(
+        updated_at=updated_at
+    )
+    BuildingComponent.objects.filter(uuid=component.building_component_id).update(
+        updated_at=updated_at
+    )
+
+
+@pytest.mark.django_db
+def test_get_components_changes_without_since(draft_building_design):
+    component = create_component(draft_building_design)
+
+    changes = get_components_changes(draft_building_design)
+
+    assert list(changes.components) == [component]
+    assert list(changes.deleted) == []
+
+
+@pytest.mark.django_db
+def test_get_components_changes_since(draft_building_design):
+    unchanged = create_component(draft_building_design)
+    changed = create_component(draft_building_design)
+    age(unchanged, timedelta(hours=1))
+    age(changed, timedelta(hours=1))
+    since = timezone.now() - COMPONENTS_CHANGES_OVERLAP
+
+    building_component = changed.building_component
+    building_component.component_data = {"code": "P1", "bom": {"steel_weight": 1}}
+    building_component.save()
+
+    changes = get_components_changes(draft_building_design, since=since)
+
+    assert list(changes.components) == [changed]
+    assert changes.cursor > since
+
+
+@pytest.mark.django_db
+def test_get_components_changes_deleted(draft_building_design):
+    component = create_component(draft_building_design)
+    since = timezone.now()
+
+    component.building_component.delete()
+
+    changes = get_components_changes(draft_building_design, since=since)
+    assert list(changes.components) == []
+    assert [tombstone.building_component_uuid for tombstone in changes.deleted] == [
+        component.building_component_id
+    ]
+
+
+@pytest.mark.django_db
+def test_deleting_design_deletes_tombstones(draft_building_design):
+    create_component(draft_building_design)
+
+    draft_building_design.delete()
+
+    assert not DraftBuildingDesignBuildingComponentTombstone.objects.exists()
+
+
+@pytest.mark.django_db
+def test_get_components_changes_refuses_cursors_past_the_retention(
+    draft_building_design,
+):
+    since = timezone.now() - COMPONENTS_CHANGES_RETENTION
+
+    with pytest.raises(ComponentsChangesCursorTooOldError):
+        get_components_changes(draft_building_design, since=since)
+
+
+@pytest.mark.django_db
+def test_prune_components_tombstones(draft_building_design):
+    expired = create_component(draft_building_design)
+    retained = create_component(draft_building_design)
+    expired.delete()
+    retained.delete()
+    DraftBuildingDesignBuildingComponentTombstone.objects.filter(
+        draft_building_design_building_component_uuid=expired.uuid
+    ).update(
+        created_at=timezone.now() - COMPONENTS_CHANGES_RETENTION - timedelta(days=1)
+    )
+
+    # Reading the changes doesn't prune
+    get_components_changes(draft_building_design)
+    assert DraftBuildingDesignBuildingComponentTombstone.objects.count() == 2
+
+    assert prune_components_tombstones() == 1
+    assert list(
+        DraftBuildingDesignBuildingComponentTombstone.objects.values_list(
+            "draft_building_design_building_component_uuid", flat=True
+        )
+    ) == [retained.uuid]
@@ -0,0 +1,267 @@
+"""
+Staged pipeline creating the components of a draft building design from its
+drawing documents.
+
+Every drawing document is checkpointed once its components are saved, and
+the components carry an idempotency key, so a retried run only processes
+the documents that are left.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import structlog
+from django.db import transaction
+from pydantic import BaseModel
+
+from building_components.models import BuildingComponent, BuildingComponentType
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignBuildingComponent,
+    DraftBuildingDesignDrawingDocument,
+    DraftBuildingDesignDrawingDocumentType,
+    DraftBuildingDesignProcessingCheckpoint,
+    DraftBuildingDesignProcessingStage,
+    DraftBuildingDesignStatus,
+)
+from draft_building_designs.services.ai.draft_building_design_components_measure import (
+    extract_column_from_image,
+    extract_footings_from_image,
+)
+from draft_building_designs.services.dxf_component_extraction import (
+    extract_columns_from_dxf_drawing_document,
+    extract_footings_from_dxf_drawing_document,
+)
+from draft_building_designs.services.footing_reference_index import (
+    assign_footings_to_column_components,
+)
+from draft_building_designs.services.progress import (
+    ProgressEvent,
+    publish_progress_event,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    """
+    This class represents a stage of the components pipeline.
+    """
+
+    name: DraftBuildingDesignProcessingStage
+    status: DraftBuildingDesignStatus
+    document_type: DraftBuildingDesignDrawingDocumentType
+    component_type: BuildingComponentType
+    extract: Callable[[str], list[BaseModel]]
+    # Extraction of the DXF drawing documents, from their entities
+    extract_dxf: Callable[[str], list[BaseModel]]
+    enabled: bool = True
+
+
+def _extract_footings(drawing_document_uuid: str) -> list[BaseModel]:
+    return list(
+        extract_footings_from_image(drawing_document_uuid=drawing_document_uuid)
+    )
+
+
+def _extract_column(drawing_document_uuid: str) -> list[BaseModel]:
+    return [extract_column_from_image(drawing_document_uuid=drawing_document_uuid)]
+
+
+def _extract_dxf_footings(drawing_document_uuid: str) -> list[BaseModel]:
+    return list(
+        extract_footings_from_dxf_drawing_document(
+            drawing_document_uuid=drawing_document_uuid
+        )
+    )
+
+
+def _extract_dxf_columns(drawing_document_uuid: str) -> list[BaseModel]:
+    return list(
+        extract_columns_from_dxf_drawing_document(
+            drawing_document_uuid=drawing_document_uuid
+        )
+    )
+
+
+PIPELINE_STAGES = (
+    PipelineStage(
+        name=DraftBuildingDesignProcessingStage.FOOTINGS,
+        status=DraftBuildingDesignStatus.CREATING_FOOTING_COMPONENTS,
+        document_type=DraftBuildingDesignDrawingDocumentType.FOOTING,
+        component_type=BuildingComponentType.FOOTING,
+        extract=_extract_footings,
+        extract_dxf=_extract_dxf_footings,
+        # Footing extraction from drawings is disabled for now
+        enabled=False,
+    ),
+    PipelineStage(
+        name=DraftBuildingDesignProcessingStage.COLUMNS,
+        status=DraftBuildingDesignStatus.CREATING_COLUMN_COMPONENTS,
+        document_type=DraftBuildingDesignDrawingDocumentType.COLUMN,
+        component_type=BuildingComponentType.COLUMN,
+        extract=_extract_column,
+        extract_dxf=_extract_dxf_columns,
+    ),
+)
+
+
+def get_component_idempotency_key(
+    *, drawing_document_uuid: str, stage: str, index: int
+) -> str:
+    """
+    This function gets the idempotency key of an extracted component.
+    """
+    return f"{drawing_document_uuid}:{stage}:{index}"
+
+
+def save_stage_components(
+    *,
+    draft_building_design: DraftBuildingDesign,
+    drawing_document: DraftBuildingDesignDrawingDocument,
+    stage: PipelineStage,
+    components_data: list[BaseModel],
+) -> None:
+    """
+    This function saves the components extracted from a drawing document and
+    checkpoints the document in the same transaction.
+    """
+    components = [
+        BuildingComponent(
+            type=stage.component_type,
+            component_data=component_data.model_dump(),
+            description=f"Generated from drawing document {drawing_document.uuid}",
+            idempotency_key=get_component_idempotency_key(
+                drawing_document_uuid=str(drawing_document.uuid),
+                stage=stage.name,
+                index=index,
+            ),
+        )
+        for index, component_data in enumerate(components_data)
+    ]
+
+    idempotency_keys = [component.idempotency_key for component in components]
+
+    with transaction.atomic():
+        BuildingComponent.objects.bulk_create(components, ignore_conflicts=True)
+        # Conflicting components keep their stored uuid, so read them back
+        component_uuids = BuildingComponent.objects.filter(
+            idempotency_key__in=idempotency_keys
+        ).values_list("uuid", flat=True)
+        DraftBuildingDesignBuildingComponent.objects.bulk_create(
+            [
+                DraftBuildingDesignBuildingComponent(
+                    draft_building_design=draft_building_design,
+                    building_component_id=component_uuid,
+                )
+                for component_uuid in component_uuids
+            ],
+            ignore_conflicts=True,
+        )
+        DraftBuildingDesignProcessingCheckpoint.objects.get_or_create(
+            drawing_document=drawing_document,
+            stage=stage.name,
+            defaults={
+                "draft_building_design": draft_building_design,
+                "components_count": len(components),
+            },
+        )
+
+
+def run_pipeline_stage(
+    *, draft_building_design: DraftBuildingDesign, stage: PipelineStage
+) -> None:
+    """
+    This function runs a stage for the drawing documents without a checkpoint.
+    """
+    # PDF documents are extracted from the documents of their pages
+    stage_drawing_documents = DraftBuildingDesignDrawingDocument.objects.filter(
+        draft_building_design=draft_building_design,
+        type=stage.document_type,
+    ).exclude(file__iendswith=".pdf")
+    drawing_documents = list(
+        stage_drawing_documents.exclude(processing_checkpoints__stage=stage.name)
+    )
+    documents_total = stage_drawing_documents.count()
+
+    logger.info(
+        "Running draft building design pipeline stage",
+        draft_building_design_uuid=draft_building_design.uuid,
+        stage=stage.name,
+        drawing_documents_count=len(drawing_documents),
+    )
+
+    progress_event = ProgressEvent(
+        status=stage.status,
+        stage=stage.name,
+        documents_done=documents_total - len(drawing_documents),
+        documents_total=documents_total,
+    )
+    publish_progress_event(
+        draft_building_design_uuid=str(draft_building_design.uuid),
+        event=progress_event,
+    )
+
+    for drawing_document in drawing_documents:
+        extract = stage.extract_dxf if drawing_document.is_dxf else stage.extract
+        components_data = extract(str(drawing_document.uuid))
+        save_stage_components(
+            draft_building_design=draft_building_design,
+            drawing_document=drawing_document,
+            stage=stage,
+            components_data=components_data,
+        )
+
+        progress_event = progress_event.model_copy(
+            update={
+                "documents_done": progress_event.documents_done + 1,
+                "components_created": progress_event.components_created
+                + len(components_data),
+            }
+        )
+        publish_progress_event(
+            draft_building_design_uuid=str(draft_building_design.uuid),
+            event=progress_event,
+        )
+
+
+def run_draft_building_design_components_pipeline(
+    *, draft_building_design_uuid: str
+) -> None:
+    """
+    This function runs every stage of the components pipeline, resuming from
+    the last checkpoint of each stage.
+    """
+    draft_building_design = DraftBuildingDesign.objects.get(
+        uuid=draft_building_design_uuid
+    )
+
+    for stage in PIPELINE_STAGES:
+        draft_building_design.status = stage.status
+        draft_building_design.save(update_fields=["status", "updated_at"])
+        logger.info(
+            "Draft building design status updated",
+            draft_building_design_uuid=draft_building_design_uuid,
+            status=stage.status,
+        )
+
+        if not stage.enabled:
+            continue
+
+        run_pipeline_stage(draft_building_design=draft_building_design, stage=stage)
+
+    # The columns extracted from the drawings don't know their footing
+    assign_footings_to_column_components(draft_building_design)
+
+    draft_building_design.status = DraftBuildingDesignStatus.CREATING_BEAM_COMPONENTS
+    draft_building_design.save(update_fields=["status", "updated_at"])
+    logger.info(
+        "Draft building design status updated",
+        draft_building_design_uuid=draft_building_design_uuid,
+        status=draft_building_design.status,
+    )
+    publish_progress_event(
+        draft_building_design_uuid=draft_building_design_uuid,
+        event=ProgressEvent(status=draft_building_design.status, is_final=True),
+    )
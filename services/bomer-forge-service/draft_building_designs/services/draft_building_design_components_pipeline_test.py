@@ -0,0 +1,109 @@
+from dataclasses import replace
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from pydantic import BaseModel
+
+from building_components.models import BuildingComponent
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignDrawingDocument,
+    DraftBuildingDesignDrawingDocumentType,
+    DraftBuildingDesignProcessingCheckpoint,
+)
+from draft_building_designs.services.draft_building_design_components_pipeline import (
+    PIPELINE_STAGES,
+    run_pipeline_stage,
+    save_stage_components,
+)
+from projects.models import Project
+
+COLUMNS_STAGE = PIPELINE_STAGES[1]
+
+
+class ExtractedColumn(BaseModel):
+    code: str
+
+
+@pytest.fixture()
+def draft_building_design() -> DraftBuildingDesign:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return DraftBuildingDesign.objects.create(project=project, name="design")
+
+
+def create_drawing_document(
+    draft_building_design: DraftBuildingDesign, file: str = "columns.png"
+) -> DraftBuildingDesignDrawingDocument:
+    return DraftBuildingDesignDrawingDocument.objects.create(
+        draft_building_design=draft_building_design,
+        file=file,
+        type=DraftBuildingDesignDrawingDocumentType.COLUMN,
+    )
+
+
+@pytest.mark.django_db()
+def test_saving_stage_components_twice_does_not_duplicate(
+    draft_building_design: DraftBuildingDesign,
+) -> None:
+    drawing_document = create_drawing_document(draft_building_design)
+
+    for _ in range(2):
+        save_stage_components(
+            draft_building_design=draft_building_design,
+            drawing_document=drawing_document,
+            stage=COLUMNS_STAGE,
+            components_data=[ExtractedColumn(code="P1"), ExtractedColumn(code="P2")],
+        )
+
+    assert BuildingComponent.objects.count() == 2
+    assert draft_building_design.building_components.count() == 2
+    assert DraftBuildingDesignProcessingCheckpoint.objects.count() == 1
+
+
+@pytest.mark.django_db()
+def test_stage_resumes_from_last_checkpoint(
+    draft_building_design: DraftBuildingDesign,
+) -> None:
+    done_document = create_drawing_document(draft_building_design)
+    pending_document = create_drawing_document(draft_building_design)
+    save_stage_components(
+        draft_building_design=draft_building_design,
+        drawing_document=done_document,
+        stage=COLUMNS_STAGE,
+        components_data=[ExtractedColumn(code="P1")],
+    )
+    extract = mock.Mock(return_value=[ExtractedColumn(code="P2")])
+
+    run_pipeline_stage(
+        draft_building_design=draft_building_design,
+        stage=replace(COLUMNS_STAGE, extract=extract),
+    )
+
+    extract.assert_called_once_with(str(pending_document.uuid))
+    assert draft_building_design.building_components.count() == 2
+
+
+@pytest.mark.django_db()
+def test_stage_extracts_dxf_documents_from_their_entities(
+    draft_building_design: DraftBuildingDesign,
+) -> None:
+    image_document = create_drawing_document(draft_building_design)
+    dxf_document = create_drawing_document(draft_building_design, "columns.DXF")
+    extract = mock.Mock(return_value=[ExtractedColumn(code="P1")])
+    extract_dxf = mock.Mock(return_value=[ExtractedColumn(code="P2")])
+
+    run_pipeline_stage(
+        draft_building_design=draft_building_design,
+        stage=replace(COLUMNS_STAGE, extract=extract, extract_dxf=extract_dxf),
+    )
+
+    extract.assert_called_once_with(str(image_document.uuid))
+    extract_dxf.assert_called_once_with(str(dxf_document.uuid))
@@ -0,0 +1,198 @@
+"""
+Upload of the drawing documents of a draft building design, deduplicated by
+content hash.
+
+A file uploaded again to the same design (e.g. when a user retries) is linked
+to the document uploaded first, with its checkpoints and components, instead
+of being extracted again. PNG drawings also get a perceptual hash, to spot
+re-exports of a drawing that differ in bytes only. Documents uploaded before
+the hashes existed get them from `backfill_drawing_document_hashes`.
+"""
+
+import hashlib
+from collections import Counter
+from dataclasses import dataclass
+
+import structlog
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
+
+from core.utils.lazy_import import lazy_import
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignDrawingDocument,
+)
+
+logger = structlog.get_logger(__name__)
+
+Image = lazy_import("PIL.Image")
+
+FILE_HASH_CHUNK_SIZE = 1024 * 1024
+# The perceptual hash compares the rows of a (size + 1) x size thumbnail
+PERCEPTUAL_HASH_SIZE = 8
+PERCEPTUAL_HASH_EXTENSIONS = (".png",)
+
+
+@dataclass
+class UploadedDrawingDocument:
+    """
+    This class represents an uploaded drawing document, the existing one when
+    the file was uploaded already.
+    """
+
+    drawing_document: DraftBuildingDesignDrawingDocument
+    is_duplicate: bool
+
+
+def get_file_hash(file: File) -> str:
+    """
+    This function gets the sha256 hash of a file, read in chunks.
+    """
+    file_hash = hashlib.sha256()
+    for chunk in file.chunks(FILE_HASH_CHUNK_SIZE):
+        file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_perceptual_hash(file: File) -> str:
+    """
+    This function gets the difference hash of an image, whether each pixel of
+    a grayscale thumbnail is brighter than the next one, as 16 hex digits.
+    """
+    file.seek(0)
+    with Image.open(file) as image:
+        thumbnail = image.convert("L").resize(
+            (PERCEPTUAL_HASH_SIZE + 1, PERCEPTUAL_HASH_SIZE),
+            Image.Resampling.LANCZOS,
+        )
+    file.seek(0)
+
+    pixels = list(thumbnail.getdata())
+    perceptual_hash = 0
+    for row in range(PERCEPTUAL_HASH_SIZE):
+        for column in range(PERCEPTUAL_HASH_SIZE):
+            index = row * (PERCEPTUAL_HASH_SIZE + 1) + column
+            perceptual_hash = (perceptual_hash << 1) | (
+                pixels[index] > pixels[index + 1]
+            )
+    return f"{perceptual_hash:0{PERCEPTUAL_HASH_SIZE**2 // 4}x}"
+
+
+def upload_drawing_document(
+    *,
+    draft_building_design: DraftBuildingDesign,
+    file: File,
+    type: str,
+) -> UploadedDrawingDocument:
+    """
+    This function creates a drawing document for an uploaded file, unless the
+    design has a document with the same content already.
+    """
+    content_hash = get_file_hash(file)
+    existing_document = DraftBuildingDesignDrawingDocument.objects.filter(
+        draft_building_design=draft_building_design, content_hash=content_hash
+    ).first()
+    if existing_document is not None:
+        logger.info(
+            "Duplicate drawing document uploaded",
+            draft_building_design_uuid=draft_building_design.uuid,
+            drawing_document_uuid=existing_document.uuid,
+            file_name=file.name,
+        )
+        return UploadedDrawingDocument(
+            drawing_document=existing_document, is_duplicate=True
+        )
+
+    perceptual_hash = None
+    if file.name.lower().endswith(PERCEPTUAL_HASH_EXTENSIONS):
+        perceptual_hash = get_perceptual_hash(file)
+        similar_document = DraftBuildingDesignDrawingDocument.objects.filter(
+            draft_building_design=draft_building_design,
+            perceptual_hash=perceptual_hash,
+        ).first()
+        if similar_document is not None:
+            # Drawings of the same kind can look alike, so they're only logged
+            logger.info(
+                "Drawing document similar to an uploaded one",
+                draft_building_design_uuid=draft_building_design.uuid,
+                drawing_document_uuid=similar_document.uuid,
+                file_name=file.name,
+            )
+
+    try:
+        with transaction.atomic():
+            drawing_document = DraftBuildingDesignDrawingDocument.objects.create(
+                draft_building_design=draft_building_design,
+                file=file,
+                type=type,
+                content_hash=content_hash,
+                perceptual_hash=perceptual_hash,
+            )
+    except IntegrityError:
+        # Uploaded at the same time by another request
+        drawing_document = DraftBuildingDesignDrawingDocument.objects.get(
+            draft_building_design=draft_building_design, content_hash=content_hash
+        )
+        return UploadedDrawingDocument(
+            drawing_document=drawing_document, is_duplicate=True
+        )
+
+    return UploadedDrawingDocument(
+        drawing_document=drawing_document, is_duplicate=False
+    )
+
+
+def backfill_drawing_document_hashes(
+    drawing_documents: QuerySet[DraftBuildingDesignDrawingDocument] | None = None,
+) -> Counter[str]:
+    """
+    This function sets the content hash (and perceptual hash) of the uploaded
+    drawing documents that don't have one, and returns the number of
+    documents by outcome.
+
+    Documents are hashed oldest first, so when a file was uploaded twice to a
+    design the first document gets the hash, and the others are left without
+    one since the hash is unique in the design.
+    """
+    if drawing_documents is None:
+        drawing_documents = DraftBuildingDesignDrawingDocument.objects.all()
+    # The pages of PDF documents aren't uploads
+    drawing_documents = drawing_documents.filter(
+        content_hash__isnull=True, source_document__isnull=True
+    ).order_by("created_at")
+
+    outcomes: Counter[str] = Counter()
+    for drawing_document in drawing_documents.iterator():
+        try:
+            with drawing_document.file.open("rb") as file:
+                drawing_document.content_hash = get_file_hash(file)
+                if drawing_document.file.name.lower().endswith(
+                    PERCEPTUAL_HASH_EXTENSIONS
+                ):
+                    drawing_document.perceptual_hash = get_perceptual_hash(file)
+        except OSError:
+            logger.warning(
+                "Failed to hash drawing document file",
+                drawing_document_uuid=drawing_document.uuid,
+                exc_info=True,
+            )
+            outcomes["unreadable"] += 1
+            continue
+
+        try:
+            with transaction.atomic():
+                drawing_document.save(
+                    update_fields=["content_hash", "perceptual_hash", "updated_at"]
+                )
+        except IntegrityError:
+            logger.warning(
+                "Drawing document is a duplicate of another document of its design",
+                drawing_document_uuid=drawing_document.uuid,
+                draft_building_design_uuid=drawing_document.draft_building_design_id,
+            )
+            outcomes["duplicate"] += 1
+            continue
+        outcomes["hashed"] += 1
+
+    return outcomes
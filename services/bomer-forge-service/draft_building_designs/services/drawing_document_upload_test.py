@@ -0,0 +1,109 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignDrawingDocument,
+)
+from draft_building_designs.services.drawing_document_upload import (
+    backfill_drawing_document_hashes,
+    get_file_hash,
+    get_perceptual_hash,
+    upload_drawing_document,
+)
+from projects.models import Project
+
+
+@pytest.fixture()
+def draft_building_design() -> DraftBuildingDesign:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return DraftBuildingDesign.objects.create(project=project, name="design")
+
+
+def create_png(
+    name: str, *, is_darkening: bool = True, **save_kwargs
+) -> SimpleUploadedFile:
+    image = Image.new("L", (90, 80))
+    for x in range(90):
+        for y in range(80):
+            image.putpixel((x, y), 255 - x * 2 if is_darkening else x * 2)
+    content = io.BytesIO()
+    image.save(content, format="PNG", **save_kwargs)
+    return SimpleUploadedFile(name, content.getvalue())
+
+
+def test_perceptual_hash_ignores_the_encoding():
+    assert get_perceptual_hash(create_png("a.png")) == get_perceptual_hash(
+        create_png("b.png", compress_level=0)
+    )
+    assert get_perceptual_hash(create_png("a.png")) != get_perceptual_hash(
+        create_png("c.png", is_darkening=False)
+    )
+
+
+@pytest.mark.django_db()
+def test_upload_drawing_document_twice(
+    draft_building_design: DraftBuildingDesign, settings, tmp_path
+) -> None:
+    settings.MEDIA_ROOT = str(tmp_path)
+
+    uploaded_document = upload_drawing_document(
+        draft_building_design=draft_building_design,
+        file=create_png("columns.png"),
+        type="COLUMN",
+    )
+    duplicate_document = upload_drawing_document(
+        draft_building_design=draft_building_design,
+        file=create_png("columns (1).png"),
+        type="COLUMN",
+    )
+
+    assert not uploaded_document.is_duplicate
+    assert uploaded_document.drawing_document.perceptual_hash is not None
+    assert duplicate_document.is_duplicate
+    assert (
+        duplicate_document.drawing_document.uuid
+        == uploaded_document.drawing_document.uuid
+    )
+    assert DraftBuildingDesignDrawingDocument.objects.count() == 1
+
+
+@pytest.mark.django_db()
+def test_backfill_drawing_document_hashes(
+    draft_building_design: DraftBuildingDesign, settings, tmp_path
+) -> None:
+    settings.MEDIA_ROOT = str(tmp_path)
+    # Documents uploaded before the deduplication, twice for the same file
+    first_document, duplicate_document = [
+        DraftBuildingDesignDrawingDocument.objects.create(
+            draft_building_design=draft_building_design,
+            file=create_png(name),
+            type="COLUMN",
+        )
+        for name in ("columns.png", "columns (1).png")
+    ]
+    missing_document = DraftBuildingDesignDrawingDocument.objects.create(
+        draft_building_design=draft_building_design, file="missing.png"
+    )
+
+    outcomes = backfill_drawing_document_hashes()
+
+    assert outcomes == {"hashed": 1, "duplicate": 1, "unreadable": 1}
+    first_document.refresh_from_db()
+    assert first_document.content_hash == get_file_hash(create_png("columns.png"))
+    assert first_document.perceptual_hash is not None
+    duplicate_document.refresh_from_db()
+    assert duplicate_document.content_hash is None
+    missing_document.refresh_from_db()
+    assert missing_document.content_hash is None
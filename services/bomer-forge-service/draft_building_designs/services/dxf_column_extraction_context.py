@@ -0,0 +1,190 @@
+"""
+Context of the DXF based column extraction, built per region of the drawing.
+
+Instead of the whole drawing, every request gets the entities of one spatial
+cluster holding a column code, in a compact JSON representation and within a
+token budget. When a query embedding is given, the entities most similar to it
+are kept first, otherwise the texts holding the column codes of the region.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+
+import structlog
+from pgvector.django import CosineDistance
+
+from draft_building_designs.models import DraftBuildingDesign, DXFEntity
+from draft_building_designs.services.dxf_entity_clustering import NOISE_LABEL
+
+logger = structlog.get_logger(__name__)
+
+COLUMN_CODE_PATTERN = re.compile(r"\bP\d+\b")
+DXF_CONTEXT_TOKENS_BUDGET = 4000
+# Rough estimate for JSON, close enough to stay under the model limits
+DXF_CONTEXT_CHARS_PER_TOKEN = 4
+DXF_CONTEXT_COORDINATES_DECIMALS = 1
+DXF_CONTEXT_EXCLUDED_TYPES = ("LINE", "POLYLINE")
+DXF_CONTEXT_TEXT_TYPES = ("TEXT", "MTEXT")
+
+DXF_CONTEXT_DESCRIPTION = (
+    "One DXF entity per line, with the keys t (type), l (layer), x (text) and "
+    "c (coordinates)."
+)
+
+
+@dataclass
+class DXFRegionContext:
+    """
+    This class represents the context of a region of a drawing.
+    """
+
+    cluster_label: int
+    column_codes: list[str]
+    context: str
+    entities_count: int
+    tokens_count: int
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    This function estimates the tokens of a text.
+    """
+    return -(-len(text) // DXF_CONTEXT_CHARS_PER_TOKEN)
+
+
+def _round_coordinates(coordinates):
+    if isinstance(coordinates, (list, tuple)):
+        return [_round_coordinates(coordinate) for coordinate in coordinates]
+    if isinstance(coordinates, float):
+        return round(coordinates, DXF_CONTEXT_COORDINATES_DECIMALS)
+    return coordinates
+
+
+def compact_dxf_entity(metadata: dict | None) -> str:
+    """
+    This function gets the compact JSON of the metadata of a DXF entity, with
+    short keys, rounded coordinates and no empty values.
+    """
+    metadata = metadata or {}
+    compact_entity = {
+        "t": metadata.get("type") or metadata.get("dxftype"),
+        "l": metadata.get("layer"),
+        "x": metadata.get("text"),
+        "c": _round_coordinates(metadata.get("coordinates")),
+    }
+    return json.dumps(
+        {key: value for key, value in compact_entity.items() if value is not None},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+
+
+def _holds_column_code(metadata: dict | None, column_codes: list[str]) -> bool:
+    """
+    This function checks whether a DXF entity is a text holding one of the
+    column codes.
+    """
+    metadata = metadata or {}
+    if (metadata.get("type") or metadata.get("dxftype")) not in DXF_CONTEXT_TEXT_TYPES:
+        return False
+    codes = COLUMN_CODE_PATTERN.findall(metadata.get("text") or "")
+    return any(code in column_codes for code in codes)
+
+
+def get_column_candidate_regions(
+    draft_building_design: DraftBuildingDesign,
+) -> dict[int, list[str]]:
+    """
+    This function gets the clusters holding a column code, with their codes.
+    """
+    texts = (
+        DXFEntity.objects.filter(
+            draft_building_design=draft_building_design,
+            entity_type__in=DXF_CONTEXT_TEXT_TYPES,
+            cluster_label__isnull=False,
+        )
+        .exclude(cluster_label=NOISE_LABEL)
+        .values_list("cluster_label", "metadata")
+    )
+
+    regions: dict[int, list[str]] = {}
+    for cluster_label, metadata in texts:
+        codes = COLUMN_CODE_PATTERN.findall((metadata or {}).get("text") or "")
+        for code in codes:
+            region_codes = regions.setdefault(cluster_label, [])
+            if code not in region_codes:
+                region_codes.append(code)
+    return regions
+
+
+def build_region_context(
+    draft_building_design: DraftBuildingDesign,
+    cluster_label: int,
+    *,
+    column_codes: list[str],
+    query_embedding: list[float] | None = None,
+    tokens_budget: int = DXF_CONTEXT_TOKENS_BUDGET,
+) -> DXFRegionContext:
+    """
+    This function builds the context of a cluster within the token budget.
+    """
+    entities = DXFEntity.objects.filter(
+        draft_building_design=draft_building_design, cluster_label=cluster_label
+    ).exclude(entity_type__in=DXF_CONTEXT_EXCLUDED_TYPES)
+    if query_embedding is not None:
+        # Entities without embedding are sorted last
+        entities = entities.order_by(CosineDistance("embedding", query_embedding))
+    entities_metadata = list(entities.values_list("metadata", flat=True))
+    if query_embedding is None:
+        # The column codes are kept whatever the budget, in the stable order
+        entities_metadata.sort(
+            key=lambda metadata: not _holds_column_code(metadata, column_codes)
+        )
+
+    lines: list[str] = []
+    tokens_count = 0
+    for metadata in entities_metadata:
+        line = compact_dxf_entity(metadata)
+        line_tokens = estimate_tokens(line) + 1
+        if tokens_count + line_tokens > tokens_budget:
+            logger.info(
+                "DXF region context truncated",
+                cluster_label=cluster_label,
+                entities_count=len(lines),
+            )
+            break
+        lines.append(line)
+        tokens_count += line_tokens
+
+    return DXFRegionContext(
+        cluster_label=cluster_label,
+        column_codes=column_codes,
+        context="\n".join(lines),
+        entities_count=len(lines),
+        tokens_count=tokens_count,
+    )
+
+
+def build_column_extraction_contexts(
+    draft_building_design: DraftBuildingDesign,
+    *,
+    query_embedding: list[float] | None = None,
+    tokens_budget: int = DXF_CONTEXT_TOKENS_BUDGET,
+) -> list[DXFRegionContext]:
+    """
+    This function builds one context per region of a design holding a column
+    code, so the extraction sends one request per region.
+    """
+    return [
+        build_region_context(
+            draft_building_design,
+            cluster_label,
+            column_codes=column_codes,
+            query_embedding=query_embedding,
+            tokens_budget=tokens_budget,
+        )
+        for cluster_label, column_codes in get_column_candidate_regions(
+            draft_building_design
+        ).items()
+    ]
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+from django.contrib.auth.models import User
+
+from draft_building_designs.models import DraftBuildingDesign, DXFEntity
+from draft_building_designs.services.dxf_column_extraction_context import (
+    build_column_extraction_contexts,
+    compact_dxf_entity,
+    estimate_tokens,
+)
+from projects.models import Project
+
+
+@pytest.fixture()
+def draft_building_design() -> DraftBuildingDesign:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return DraftBuildingDesign.objects.create(project=project, name="design")
+
+
+def create_dxf_entity(
+    draft_building_design: DraftBuildingDesign, cluster_label: int, **metadata
+) -> DXFEntity:
+    return DXFEntity.objects.create(
+        draft_building_design=draft_building_design,
+        metadata=metadata,
+        cluster_label=cluster_label,
+    )
+
+
+def test_compact_dxf_entity():
+    compact_entity = compact_dxf_entity(
+        {
+            "type": "TEXT",
+            "layer": "PIL",
+            "text": "P1",
+            "coordinates": [10.123456, 20.987654],
+            "handle": "1F",
+        }
+    )
+
+    assert compact_entity == '{"t":"TEXT","l":"PIL","x":"P1","c":[10.1,21.0]}'
+
+
+def test_compact_dxf_entity_without_values():
+    assert json.loads(compact_dxf_entity({"dxftype": "LINE"})) == {"t": "LINE"}
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcde") == 2
+
+
+@pytest.mark.django_db
+def test_build_column_extraction_contexts(draft_building_design):
+    create_dxf_entity(
+        draft_building_design, 0, type="TEXT", text="P1=P2", coordinates=[0, 0]
+    )
+    create_dxf_entity(
+        draft_building_design, 0, type="TEXT", text="30x30", coordinates=[1, 0]
+    )
+    create_dxf_entity(
+        draft_building_design, 0, type="LINE", coordinates=[[0, 0], [1, 1]]
+    )
+    create_dxf_entity(
+        draft_building_design, 1, type="TEXT", text="Planta", coordinates=[90, 90]
+    )
+    create_dxf_entity(
+        draft_building_design, -1, type="TEXT", text="P3", coordinates=[500, 0]
+    )
+
+    contexts = build_column_extraction_contexts(draft_building_design)
+
+    assert len(contexts) == 1
+    assert contexts[0].cluster_label == 0
+    assert contexts[0].column_codes == ["P1", "P2"]
+    assert contexts[0].entities_count == 2
+    assert "LINE" not in contexts[0].context
+
+
+@pytest.mark.django_db
+def test_build_column_extraction_contexts_tokens_budget(draft_building_design):
+    for index in range(10):
+        create_dxf_entity(
+            draft_building_design, 0, type="TEXT", text=f"P{index}", coordinates=[0, 0]
+        )
+
+    contexts = build_column_extraction_contexts(draft_building_design, tokens_budget=30)
+
+    assert contexts[0].tokens_count <= 30
+    assert 0 < contexts[0].entities_count < 10
+
+
+@pytest.mark.django_db
+def test_build_column_extraction_contexts_of_ingested_entities(
+    draft_building_design,
+):
+    # Shape of the metadata written by the ingestion
+    create_dxf_entity(
+        draft_building_design,
+        0,
+        dxftype="TEXT",
+        layer="PIL",
+        text="P1",
+        coordinates=[0.0, 0.0],
+    )
+    create_dxf_entity(
+        draft_building_design,
+        0,
+        dxftype="LINE",
+        layer="PIL",
+        text=None,
+        coordinates=[[0.0, 0.0], [1.0, 1.0]],
+    )
+    create_dxf_entity(draft_building_design, 0, text="30x30", coordinates=[1.0, 0.0])
+
+    contexts = build_column_extraction_contexts(draft_building_design)
+
+    assert len(contexts) == 1
+    assert contexts[0].column_codes == ["P1"]
+    # Entities without type are kept, the lines are left out
+    assert contexts[0].entities_count == 2
+    assert "LINE" not in contexts[0].context
+
+
+@pytest.mark.django_db
+def test_build_column_extraction_contexts_keeps_column_codes_first(
+    draft_building_design,
+):
+    for index in range(10):
+        create_dxf_entity(
+            draft_building_design,
+            0,
+            dxftype="TEXT",
+            text=f"Nota {index}",
+            coordinates=[0.0, 0.0],
+        )
+    create_dxf_entity(
+        draft_building_design, 0, dxftype="TEXT", text="P7", coordinates=[0.0, 0.0]
+    )
+
+    contexts = build_column_extraction_contexts(draft_building_design, tokens_budget=30)
+
+    assert contexts[0].entities_count < 11
+    assert contexts[0].context.startswith('{"t":"TEXT","x":"P7"')
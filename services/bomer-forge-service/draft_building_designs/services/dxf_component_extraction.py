@@ -0,0 +1,617 @@
+"""
+Extraction of the components of a DXF drawing document from its entities.
+
+Texts, dimensions and block attributes are read with their insertion points,
+and every callout (section, rebar, stirrups, height) is assigned to the
+nearest component code within a search radius. Column outlines drawn with
+lines are used when a column has no section callout.
+
+Components are built directly from the drawing, the LLM is only asked about
+the ones left ambiguous, with the texts near their code as context.
+"""
+
+import math
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import structlog
+from pydantic import BaseModel
+
+from core.utils.lazy_import import lazy_import
+from draft_building_designs.models import DraftBuildingDesignDrawingDocument
+from draft_building_designs.services.ai.draft_building_design_components_measure import (
+    Column,
+    Footing,
+)
+
+if TYPE_CHECKING:
+    from ezdxf.document import Drawing
+
+logger = structlog.get_logger(__name__)
+
+ezdxf = lazy_import("ezdxf")
+units = lazy_import("ezdxf.units")
+
+# Units of drawings without $INSUNITS, centimeters (`ezdxf.units.CM`)
+DXF_DEFAULT_UNITS = 5
+# Callouts farther than this from every code are ignored
+DXF_CALLOUT_SEARCH_RADIUS_CM = 150.0
+# Closed outlines larger than this are not column sections
+DXF_COLUMN_MAX_SECTION_CM = 200.0
+DXF_COORDINATE_TOLERANCE = 0.01
+DXF_AMBIGUOUS_MAX_CONCURRENCY = 8
+
+COLUMN_CODE_PATTERN = re.compile(r"\bP\d+\b")
+FOOTING_CODE_PATTERN = re.compile(r"\bS\d+\b")
+_NUMBER = r"(\d+(?:[.,]\d+)?)"
+SECTION_PATTERN = re.compile(rf"{_NUMBER}\s*[xX×]\s*{_NUMBER}(?:\s*[xX×]\s*{_NUMBER})?")
+HEIGHT_PATTERN = re.compile(rf"\b[hH]\s*=\s*{_NUMBER}")
+STIRRUPS_PATTERN = re.compile(rf"[Øø∅Φφ]\s*{_NUMBER}\s*(?:c/|//|@)\s*{_NUMBER}")
+LONGITUDINAL_REBAR_PATTERN = re.compile(rf"\b\d+\s*[Øø∅Φφ]\s*{_NUMBER}")
+DXF_DIAMETER_CODE_PATTERN = re.compile(r"%%[cC]")
+
+COLUMN_REQUIRED_FIELDS = ("width", "length", "height", "longitudinal_rebar", "stirrups")
+FOOTING_REQUIRED_FIELDS = ("width", "length", "height", "references")
+
+DXF_AMBIGUOUS_COMPONENT_PROMPT = """
+You are a helpful assistant that extracts a {component_name} from the texts of
+a structural DXF drawing near its code.
+Dimensions are in centimeters.
+
+Code: {codes}
+Values already read from the drawing, keep them unless the texts contradict
+them: {values}
+
+Texts near the code, one per line:
+{texts}
+"""
+
+
+@dataclass
+class DXFText:
+    """
+    This class represents a text of a drawing, with its insertion point.
+    """
+
+    text: str
+    x: float
+    y: float
+
+
+@dataclass
+class DXFDimension:
+    """
+    This class represents a dimension of a drawing, measured in centimeters.
+    """
+
+    value: float
+    x: float
+    y: float
+    is_vertical: bool
+
+
+@dataclass
+class DXFRectangle:
+    """
+    This class represents a closed axis aligned outline drawn with lines,
+    measured in centimeters around its center.
+    """
+
+    x: float
+    y: float
+    width: float
+    length: float
+
+
+@dataclass
+class DXFDrawing:
+    """
+    This class represents the entities of a drawing used by the extraction.
+    """
+
+    texts: list[DXFText]
+    dimensions: list[DXFDimension]
+    rectangles: list[DXFRectangle]
+    cm_per_unit: float
+
+
+@dataclass
+class DXFComponentCandidate:
+    """
+    This class represents a component code of a drawing with the values found
+    near it. A value found more than once with different contents is ambiguous.
+    """
+
+    codes: list[str]
+    x: float
+    y: float
+    values: dict[str, list[Any]] = field(default_factory=lambda: defaultdict(list))
+    texts: list[str] = field(default_factory=list)
+
+    def add_value(self, name: str, value: Any) -> None:
+        """
+        Add a value found near the code.
+        """
+        if value not in self.values[name]:
+            self.values[name].append(value)
+
+    def get_value(self, name: str) -> Any:
+        """
+        Get a value found near the code, None when it's missing or ambiguous.
+        """
+        values = self.values.get(name) or []
+        return values[0] if len(values) == 1 else None
+
+
+@dataclass
+class DXFExtraction:
+    """
+    This class represents the components extracted from a drawing, and the
+    candidates too ambiguous to build a component from.
+    """
+
+    components: list[BaseModel]
+    ambiguous: list[DXFComponentCandidate]
+
+
+class _SpatialGrid:
+    """
+    Items bucketed in square cells, to find the nearest one within a radius by
+    looking at the neighbouring cells only.
+    """
+
+    def __init__(self, radius: float) -> None:
+        self.radius = radius
+        self.cells: dict[tuple[int, int], list] = defaultdict(list)
+
+    def _get_cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.radius), math.floor(y / self.radius)
+
+    def add(self, item: Any, x: float, y: float) -> None:
+        self.cells[self._get_cell(x, y)].append((x, y, item))
+
+    def nearest(self, x: float, y: float) -> Any | None:
+        cell_x, cell_y = self._get_cell(x, y)
+        nearest_item = None
+        nearest_distance = self.radius
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for item_x, item_y, item in self.cells.get(
+                    (cell_x + dx, cell_y + dy), ()
+                ):
+                    distance = math.hypot(item_x - x, item_y - y)
+                    if distance <= nearest_distance:
+                        nearest_item = item
+                        nearest_distance = distance
+        return nearest_item
+
+
+def parse_number(value: str) -> float:
+    """
+    This function parses a number of a drawing text, with a comma or a dot as
+    decimal separator.
+    """
+    return float(value.replace(",", "."))
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(DXF_DIAMETER_CODE_PATTERN.sub("Ø", text).split())
+
+
+def get_cm_per_unit(doc: "Drawing") -> float:
+    """
+    This function gets the centimeters of a drawing unit.
+    """
+    return units.conversion_factor(doc.units or DXF_DEFAULT_UNITS, units.CM)
+
+
+def find_rectangles(
+    lines: Iterable[tuple[tuple[float, float], tuple[float, float]]],
+    *,
+    tolerance: float = DXF_COORDINATE_TOLERANCE,
+) -> list[tuple[float, float, float, float]]:
+    """
+    This function finds the closed axis aligned outlines drawn with lines, as
+    (min x, min y, max x, max y) boxes.
+
+    Horizontal lines are grouped by their span, and two consecutive ones form
+    an outline when vertical lines join their ends.
+    """
+
+    def key(value: float) -> int:
+        return round(value / tolerance)
+
+    horizontal_lines: dict[tuple[int, int], list[float]] = defaultdict(list)
+    vertical_lines: set[tuple[int, int, int]] = set()
+    for (start_x, start_y), (end_x, end_y) in lines:
+        if abs(start_y - end_y) < tolerance:
+            min_x, max_x = sorted((start_x, end_x))
+            horizontal_lines[(key(min_x), key(max_x))].append(start_y)
+        elif abs(start_x - end_x) < tolerance:
+            min_y, max_y = sorted((start_y, end_y))
+            vertical_lines.add((key(start_x), key(min_y), key(max_y)))
+
+    rectangles = []
+    for (min_x_key, max_x_key), ys in horizontal_lines.items():
+        ys = sorted(set(ys))
+        for min_y, max_y in zip(ys, ys[1:]):
+            left_side = (min_x_key, key(min_y), key(max_y))
+            right_side = (max_x_key, key(min_y), key(max_y))
+            if left_side in vertical_lines and right_side in vertical_lines:
+                rectangles.append(
+                    (min_x_key * tolerance, min_y, max_x_key * tolerance, max_y)
+                )
+    return rectangles
+
+
+def _read_dimension(entity, cm_per_unit: float) -> DXFDimension | DXFText | None:
+    position = entity.dxf.get("text_midpoint") or entity.dxf.defpoint
+    text = entity.dxf.get("text") or ""
+    if text and text != "<>":
+        # Overridden texts are kept as texts, like the other callouts
+        return DXFText(text=_normalize_text(text), x=position.x, y=position.y)
+
+    measurement = entity.get_measurement()
+    if not isinstance(measurement, (int, float)):
+        return None
+    angle = entity.dxf.get("angle", 0) % 180
+    return DXFDimension(
+        value=round(measurement * cm_per_unit, 2),
+        x=position.x,
+        y=position.y,
+        is_vertical=45 <= angle < 135,
+    )
+
+
+def read_dxf_drawing(doc: "Drawing") -> DXFDrawing:
+    """
+    This function reads the texts, dimensions, block attributes and lines of
+    the modelspace of a drawing.
+    """
+    cm_per_unit = get_cm_per_unit(doc)
+    texts: list[DXFText] = []
+    dimensions: list[DXFDimension] = []
+    lines: list[tuple[tuple[float, float], tuple[float, float]]] = []
+
+    for entity in doc.modelspace():
+        match entity.dxftype():
+            case "TEXT" | "MTEXT":
+                insert = entity.dxf.insert
+                texts.append(
+                    DXFText(
+                        text=_normalize_text(entity.plain_text()),
+                        x=insert.x,
+                        y=insert.y,
+                    )
+                )
+            case "DIMENSION":
+                dimension = _read_dimension(entity, cm_per_unit)
+                if isinstance(dimension, DXFText):
+                    texts.append(dimension)
+                elif dimension is not None:
+                    dimensions.append(dimension)
+            case "INSERT":
+                for attrib in entity.attribs:
+                    insert = attrib.dxf.insert
+                    texts.append(
+                        DXFText(
+                            text=_normalize_text(attrib.plain_text()),
+                            x=insert.x,
+                            y=insert.y,
+                        )
+                    )
+            case "LINE":
+                start, end = entity.dxf.start, entity.dxf.end
+                lines.append(((start.x, start.y), (end.x, end.y)))
+
+    rectangles = []
+    for min_x, min_y, max_x, max_y in find_rectangles(lines):
+        width = (max_x - min_x) * cm_per_unit
+        length = (max_y - min_y) * cm_per_unit
+        if max(width, length) <= DXF_COLUMN_MAX_SECTION_CM:
+            rectangles.append(
+                DXFRectangle(
+                    x=(min_x + max_x) / 2,
+                    y=(min_y + max_y) / 2,
+                    width=round(width, 2),
+                    length=round(length, 2),
+                )
+            )
+
+    return DXFDrawing(
+        texts=texts,
+        dimensions=dimensions,
+        rectangles=rectangles,
+        cm_per_unit=cm_per_unit,
+    )
+
+
+def add_callouts(
+    candidate: DXFComponentCandidate,
+    text: str,
+    *,
+    reference_pattern: re.Pattern | None = None,
+) -> None:
+    """
+    This function adds the values of the callouts of a text to a candidate.
+    """
+    if reference_pattern is not None:
+        for reference in reference_pattern.findall(text):
+            candidate.add_value("references", reference)
+
+    for match in STIRRUPS_PATTERN.finditer(text):
+        candidate.add_value("stirrups", match.group(0))
+    # Stirrups are removed, their diameter isn't a longitudinal rebar
+    remaining_text = STIRRUPS_PATTERN.sub(" ", text)
+    for match in LONGITUDINAL_REBAR_PATTERN.finditer(remaining_text):
+        candidate.add_value("longitudinal_rebar", match.group(0).replace(" ", ""))
+    for match in SECTION_PATTERN.finditer(remaining_text):
+        section = tuple(parse_number(value) for value in match.groups() if value)
+        candidate.add_value("section", section)
+    for match in HEIGHT_PATTERN.finditer(remaining_text):
+        candidate.add_value("height", parse_number(match.group(1)))
+
+
+def get_candidates(
+    drawing: DXFDrawing,
+    code_pattern: re.Pattern,
+    *,
+    reference_pattern: re.Pattern | None = None,
+) -> list[DXFComponentCandidate]:
+    """
+    This function gets a candidate per text holding a component code, with
+    the callouts nearest to it.
+
+    Codes written together (e.g. "P1=P2") share a candidate. Codes matching
+    `reference_pattern` near a candidate are added as its references.
+    """
+    radius = DXF_CALLOUT_SEARCH_RADIUS_CM / drawing.cm_per_unit
+    grid = _SpatialGrid(radius)
+    candidates: list[DXFComponentCandidate] = []
+    callouts: list[DXFText] = []
+
+    for text in drawing.texts:
+        codes = code_pattern.findall(text.text)
+        if not codes:
+            callouts.append(text)
+            continue
+        candidate = DXFComponentCandidate(codes=codes, x=text.x, y=text.y)
+        candidate.texts.append(text.text)
+        # The callouts written with the code, e.g. "P1 30x40"
+        add_callouts(
+            candidate,
+            code_pattern.sub(" ", text.text),
+            reference_pattern=reference_pattern,
+        )
+        grid.add(candidate, text.x, text.y)
+        candidates.append(candidate)
+
+    for text in callouts:
+        candidate = grid.nearest(text.x, text.y)
+        if candidate is not None:
+            candidate.texts.append(text.text)
+            add_callouts(candidate, text.text, reference_pattern=reference_pattern)
+
+    for dimension in drawing.dimensions:
+        candidate = grid.nearest(dimension.x, dimension.y)
+        if candidate is not None:
+            name = "dimension_length" if dimension.is_vertical else "dimension_width"
+            candidate.add_value(name, dimension.value)
+
+    for rectangle in drawing.rectangles:
+        candidate = grid.nearest(rectangle.x, rectangle.y)
+        if candidate is not None:
+            candidate.add_value("outline", (rectangle.width, rectangle.length))
+
+    return candidates
+
+
+def get_section(candidate: DXFComponentCandidate) -> tuple[float, ...] | None:
+    """
+    This function gets the section of a candidate from its section callout,
+    else from its dimensions, else from its outline.
+    """
+    section = candidate.get_value("section")
+    if section is not None:
+        return section
+    if candidate.values.get("section"):
+        # Conflicting section callouts
+        return None
+
+    width = candidate.get_value("dimension_width")
+    length = candidate.get_value("dimension_length")
+    if width is not None and length is not None:
+        return width, length
+
+    return candidate.get_value("outline")
+
+
+def build_columns(candidate: DXFComponentCandidate) -> list[Column] | None:
+    """
+    This function builds the columns of a candidate, None when it's ambiguous.
+    """
+    section = get_section(candidate)
+    values = {
+        "width": section[0] if section else None,
+        "length": section[1] if section else None,
+        "height": candidate.get_value("height"),
+        "longitudinal_rebar": candidate.get_value("longitudinal_rebar"),
+        "stirrups": candidate.get_value("stirrups"),
+    }
+    if any(values[name] is None for name in COLUMN_REQUIRED_FIELDS):
+        return None
+    return [Column(code=code, **values) for code in candidate.codes]
+
+
+def build_footing(candidate: DXFComponentCandidate) -> Footing | None:
+    """
+    This function builds the footing of a candidate, None when it's ambiguous.
+
+    Its references are the column codes near it, and its bottom reinforcement
+    the spaced rebar callouts, the first one along x.
+    """
+    section = get_section(candidate)
+    height = candidate.get_value("height")
+    if section and len(section) == 3:
+        height = height if height is not None else section[2]
+    references = candidate.values.get("references") or []
+    reinforcements = candidate.values.get("stirrups") or []
+
+    values = {
+        "width": section[0] if section else None,
+        "length": section[1] if section else None,
+        "height": height,
+        "references": "=".join(references) or None,
+    }
+    if any(values[name] is None for name in FOOTING_REQUIRED_FIELDS):
+        return None
+    if len(reinforcements) > 2:
+        return None
+
+    return Footing(
+        **values,
+        bottom_reinforcement_x=reinforcements[0] if reinforcements else None,
+        bottom_reinforcement_y=reinforcements[-1] if reinforcements else None,
+        top_reinforcement_x=None,
+        top_reinforcement_y=None,
+        justification=None,
+        type="Sapata Isolada" if len(references) == 1 else None,
+    )
+
+
+def extract_dxf_columns(doc: "Drawing") -> DXFExtraction:
+    """
+    This function extracts the columns of a drawing.
+    """
+    extraction = DXFExtraction(components=[], ambiguous=[])
+    for candidate in get_candidates(read_dxf_drawing(doc), COLUMN_CODE_PATTERN):
+        columns = build_columns(candidate)
+        if columns is None:
+            extraction.ambiguous.append(candidate)
+        else:
+            extraction.components.extend(columns)
+    return extraction
+
+
+def extract_dxf_footings(doc: "Drawing") -> DXFExtraction:
+    """
+    This function extracts the footings of a drawing.
+    """
+    extraction = DXFExtraction(components=[], ambiguous=[])
+    for candidate in get_candidates(
+        read_dxf_drawing(doc),
+        FOOTING_CODE_PATTERN,
+        reference_pattern=COLUMN_CODE_PATTERN,
+    ):
+        footing = build_footing(candidate)
+        if footing is None:
+            extraction.ambiguous.append(candidate)
+        else:
+            extraction.components.append(footing)
+    return extraction
+
+
+def resolve_ambiguous_candidates(
+    candidates: list[DXFComponentCandidate],
+    *,
+    model_class: type[BaseModel],
+    component_name: str,
+) -> list[BaseModel]:
+    """
+    This function asks the LLM for the components of the ambiguous candidates,
+    one request per candidate. Candidates it can't resolve are skipped.
+    """
+    if not candidates:
+        return []
+
+    from ai.services.runnables import (
+        get_gpt,
+        get_langfuse_callback_handler,
+        langchain_prompt_from_text,
+    )
+
+    chain = langchain_prompt_from_text(
+        prompt_text=DXF_AMBIGUOUS_COMPONENT_PROMPT
+    ) | get_gpt().with_structured_output(model_class, method="json_schema")
+
+    responses = chain.batch(
+        [
+            {
+                "component_name": component_name,
+                "codes": "=".join(candidate.codes),
+                "values": dict(candidate.values),
+                "texts": "\n".join(candidate.texts),
+            }
+            for candidate in candidates
+        ],
+        config={
+            "callbacks": [get_langfuse_callback_handler()],
+            "run_name": f"resolve_ambiguous_dxf_{component_name}",
+            "max_concurrency": DXF_AMBIGUOUS_MAX_CONCURRENCY,
+        },
+        return_exceptions=True,
+    )
+
+    components: list[BaseModel] = []
+    for candidate, response in zip(candidates, responses):
+        if isinstance(response, Exception):
+            logger.warning(
+                "Ambiguous DXF component not resolved",
+                codes=candidate.codes,
+                error=str(response),
+            )
+            continue
+        if "code" in model_class.model_fields:
+            components.extend(
+                response.model_copy(update={"code": code}) for code in candidate.codes
+            )
+        else:
+            components.append(response)
+    return components
+
+
+def extract_columns_from_dxf_drawing_document(
+    *, drawing_document_uuid: str
+) -> list[Column]:
+    """
+    This function extracts the columns of a DXF drawing document, asking the
+    LLM about the ambiguous ones only.
+    """
+    drawing_document = DraftBuildingDesignDrawingDocument.objects.get(
+        uuid=drawing_document_uuid
+    )
+    extraction = extract_dxf_columns(ezdxf.readfile(drawing_document.file.path))
+    logger.info(
+        "Columns extracted from DXF drawing document",
+        drawing_document_uuid=drawing_document_uuid,
+        columns_count=len(extraction.components),
+        ambiguous_count=len(extraction.ambiguous),
+    )
+    return extraction.components + resolve_ambiguous_candidates(
+        extraction.ambiguous, model_class=Column, component_name="column"
+    )
+
+
+def extract_footings_from_dxf_drawing_document(
+    *, drawing_document_uuid: str
+) -> list[Footing]:
+    """
+    This function extracts the footings of a DXF drawing document, asking the
+    LLM about the ambiguous ones only.
+    """
+    drawing_document = DraftBuildingDesignDrawingDocument.objects.get(
+        uuid=drawing_document_uuid
+    )
+    extraction = extract_dxf_footings(ezdxf.readfile(drawing_document.file.path))
+    logger.info(
+        "Footings extracted from DXF drawing document",
+        drawing_document_uuid=drawing_document_uuid,
+        footings_count=len(extraction.components),
+        ambiguous_count=len(extraction.ambiguous),
+    )
+    return extraction.components + resolve_ambiguous_candidates(
+        extraction.ambiguous, model_class=Footing, component_name="footing"
+    )
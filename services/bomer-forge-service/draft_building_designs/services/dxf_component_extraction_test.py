@@ -0,0 +1,91 @@
+import ezdxf
+from ezdxf import units
+
+from draft_building_designs.services.dxf_component_extraction import (
+    extract_dxf_columns,
+    extract_dxf_footings,
+    find_rectangles,
+)
+
+
+def new_drawing():
+    doc = ezdxf.new(units=units.CM)
+    return doc, doc.modelspace()
+
+
+def add_rectangle(msp, min_x, min_y, max_x, max_y):
+    corners = [(min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y)]
+    for start, end in zip(corners, corners[1:] + corners[:1]):
+        msp.add_line(start, end)
+
+
+def test_find_rectangles():
+    lines = [
+        ((0, 0), (20, 0)),
+        ((20, 0), (20, 50)),
+        ((20, 50), (0, 50)),
+        ((0, 50), (0, 0)),
+        # Open outline
+        ((100, 0), (120, 0)),
+        ((100, 50), (120, 50)),
+        ((100, 0), (100, 50)),
+    ]
+
+    assert find_rectangles(lines) == [(0, 0, 20, 50)]
+
+
+def test_extract_dxf_columns():
+    doc, msp = new_drawing()
+    msp.add_text("P1=P2", dxfattribs={"insert": (0, 0)})
+    msp.add_text("30x40", dxfattribs={"insert": (10, -10)})
+    msp.add_mtext("4%%c16", dxfattribs={"insert": (10, -20)})
+    msp.add_text("%%c6 c/15", dxfattribs={"insert": (10, -30)})
+    msp.add_text("H=300", dxfattribs={"insert": (10, -40)})
+    # The section of P3 is drawn, not written
+    msp.add_text("P3 4Ø12 Ø5 c/12 H=280", dxfattribs={"insert": (1000, 0)})
+    add_rectangle(msp, 990, -70, 1010, -20)
+
+    extraction = extract_dxf_columns(doc)
+
+    assert [
+        (column.code, column.width, column.length, column.height)
+        for column in extraction.components
+    ] == [("P1", 30, 40, 300), ("P2", 30, 40, 300), ("P3", 20, 50, 280)]
+    assert extraction.components[0].longitudinal_rebar == "4Ø16"
+    assert extraction.components[0].stirrups == "Ø6 c/15"
+    assert extraction.ambiguous == []
+
+
+def test_extract_dxf_columns_ambiguous():
+    doc, msp = new_drawing()
+    msp.add_text("P1 4Ø16 Ø6 c/15 H=300", dxfattribs={"insert": (0, 0)})
+    # Two sections near the same code
+    msp.add_text("30x40", dxfattribs={"insert": (10, -10)})
+    msp.add_text("20x40", dxfattribs={"insert": (10, -20)})
+    # Too far from every code
+    msp.add_text("25x25", dxfattribs={"insert": (5000, 0)})
+
+    extraction = extract_dxf_columns(doc)
+
+    assert extraction.components == []
+    assert [candidate.codes for candidate in extraction.ambiguous] == [["P1"]]
+    assert extraction.ambiguous[0].values["section"] == [(30, 40), (20, 40)]
+
+
+def test_extract_dxf_footings():
+    doc, msp = new_drawing()
+    msp.add_text("S1 120x100x50", dxfattribs={"insert": (0, 0)})
+    msp.add_text("P1", dxfattribs={"insert": (20, 20)})
+    msp.add_text("%%c10 c/15", dxfattribs={"insert": (0, -20)})
+    msp.add_text("%%c12 c/20", dxfattribs={"insert": (0, -30)})
+    msp.add_text("S2", dxfattribs={"insert": (1000, 0)})
+
+    extraction = extract_dxf_footings(doc)
+
+    [footing] = extraction.components
+    assert (footing.width, footing.length, footing.height) == (120, 100, 50)
+    assert footing.references == "P1"
+    assert footing.bottom_reinforcement_x == "Ø10 c/15"
+    assert footing.bottom_reinforcement_y == "Ø12 c/20"
+    assert footing.type == "Sapata Isolada"
+    assert [candidate.codes for candidate in extraction.ambiguous] == [["S2"]]
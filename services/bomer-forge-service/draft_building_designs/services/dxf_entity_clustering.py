@@ -0,0 +1,376 @@
+"""
+Spatial clustering of the DXF entities of a draft building design.
+
+Entities are clustered with DBSCAN on their centroids, with an euclidean metric
+and a KD-tree. The sheet is split in square tiles clustered one at a time, with
+a halo of the neighbouring points closer than `eps`, and the clusters of
+neighbouring tiles are merged through the core points they share. The result
+is the one of a single DBSCAN run, while the memory of a run is bounded by the
+densest tile instead of the whole sheet.
+"""
+
+from collections.abc import Iterable
+from uuid import UUID
+
+import numpy as np
+import structlog
+from django.db.models import F, Max, Q
+from django.utils import timezone
+
+from core.utils.lazy_import import lazy_import
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DXFEntity,
+    get_dxf_entity_points,
+)
+
+logger = structlog.get_logger(__name__)
+
+sklearn_cluster = lazy_import("sklearn.cluster")
+
+DXF_CLUSTERING_EPS = 10.0
+DXF_CLUSTERING_MIN_SAMPLES = 2
+DXF_CLUSTERING_TILE_SIZE = 1000.0
+DXF_CLUSTERING_BATCH_SIZE = 1000
+
+NOISE_LABEL = -1
+
+Tile = tuple[int, int]
+
+
+def get_dxf_entity_point(metadata: dict | None) -> tuple[float, float] | None:
+    """
+    This function gets the centroid of the points of a DXF entity.
+    """
+    points = get_dxf_entity_points(metadata)
+    if not points:
+        return None
+    centroid = np.mean(points, axis=0)
+    return float(centroid[0]), float(centroid[1])
+
+
+class _DisjointSet:
+    def __init__(self) -> None:
+        self._parents: list[int] = []
+
+    def add(self) -> int:
+        self._parents.append(len(self._parents))
+        return len(self._parents) - 1
+
+    def find(self, node: int) -> int:
+        while self._parents[node] != node:
+            self._parents[node] = self._parents[self._parents[node]]
+            node = self._parents[node]
+        return node
+
+    def union(self, node: int, other_node: int) -> None:
+        root, other_root = self.find(node), self.find(other_node)
+        if root != other_root:
+            self._parents[max(root, other_root)] = min(root, other_root)
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+
+def get_tile(point: tuple[float, float], tile_size: float) -> Tile:
+    """
+    This function gets the tile of a point.
+    """
+    return int(np.floor(point[0] / tile_size)), int(np.floor(point[1] / tile_size))
+
+
+def _group_by_tile(points: np.ndarray, tile_size: float) -> dict[Tile, np.ndarray]:
+    tiles = np.floor(points / tile_size).astype(np.int64)
+    unique_tiles, inverse = np.unique(tiles, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.argsort(inverse, kind="stable")
+    splits = np.cumsum(np.bincount(inverse))[:-1]
+    return {
+        (tile[0], tile[1]): members
+        for tile, members in zip(unique_tiles.tolist(), np.split(order, splits))
+    }
+
+
+def _get_tile_halo(
+    points: np.ndarray,
+    tiles_members: dict[Tile, np.ndarray],
+    tile: Tile,
+    *,
+    eps: float,
+    tile_size: float,
+) -> np.ndarray:
+    """
+    Get the points of the neighbouring tiles closer than `eps` to the tile.
+    """
+    min_corner = np.array(tile) * tile_size
+    max_corner = min_corner + tile_size
+    halo = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbour_members = tiles_members.get((tile[0] + dx, tile[1] + dy))
+            if (dx, dy) == (0, 0) or neighbour_members is None:
+                continue
+            neighbour_points = points[neighbour_members]
+            distances = np.maximum(
+                np.maximum(
+                    min_corner - neighbour_points, neighbour_points - max_corner
+                ),
+                0,
+            )
+            halo.append(
+                neighbour_members[np.hypot(distances[:, 0], distances[:, 1]) <= eps]
+            )
+    return np.concatenate(halo) if halo else np.array([], dtype=np.int64)
+
+
+def cluster_points(
+    points: np.ndarray,
+    *,
+    eps: float = DXF_CLUSTERING_EPS,
+    min_samples: int = DXF_CLUSTERING_MIN_SAMPLES,
+    tile_size: float = DXF_CLUSTERING_TILE_SIZE,
+) -> np.ndarray:
+    """
+    This function clusters 2D points tile by tile, returning the label of every
+    point, numbered from 0, or -1 for noise.
+    """
+    if tile_size < eps:
+        msg = f"The tile size ({tile_size}) can't be smaller than eps ({eps})"
+        raise ValueError(msg)
+
+    labels = np.full(len(points), NOISE_LABEL, dtype=np.int64)
+    if not len(points):
+        return labels
+
+    tiles_members = _group_by_tile(points, tile_size)
+    clusters = _DisjointSet()
+    # Cluster of every point and whether it is a core point, from its own tile
+    # where its whole neighbourhood is visible
+    point_clusters = np.full(len(points), -1, dtype=np.int64)
+    is_core_point = np.zeros(len(points), dtype=bool)
+    halo_clusters: list[tuple[int, int]] = []
+
+    for tile, members in tiles_members.items():
+        halo = _get_tile_halo(points, tiles_members, tile, eps=eps, tile_size=tile_size)
+        indices = np.concatenate([members, halo])
+        dbscan = sklearn_cluster.DBSCAN(
+            eps=eps, min_samples=min_samples, metric="euclidean", algorithm="kd_tree"
+        ).fit(points[indices])
+
+        is_core = np.zeros(len(indices), dtype=bool)
+        is_core[dbscan.core_sample_indices_] = True
+        tile_clusters = {
+            label: clusters.add()
+            for label in np.unique(dbscan.labels_)
+            if label != NOISE_LABEL
+        }
+        for position, (index, label) in enumerate(zip(indices, dbscan.labels_)):
+            if label == NOISE_LABEL:
+                continue
+            if position < len(members):
+                point_clusters[index] = tile_clusters[label]
+                is_core_point[index] = is_core[position]
+            else:
+                halo_clusters.append((index, tile_clusters[label]))
+
+    for index, cluster in halo_clusters:
+        if is_core_point[index]:
+            clusters.union(point_clusters[index], cluster)
+        elif point_clusters[index] == -1:
+            # A border point reachable from a core point of another tile only
+            point_clusters[index] = cluster
+
+    clustered = point_clusters != -1
+    if clustered.any():
+        roots = np.array([clusters.find(cluster) for cluster in range(len(clusters))])
+        _, labels[clustered] = np.unique(
+            roots[point_clusters[clustered]], return_inverse=True
+        )
+    return labels
+
+
+def _save_cluster_labels(labels_by_uuid: dict[UUID, int | None]) -> None:
+    clustered_at = timezone.now()
+    DXFEntity.objects.bulk_update(
+        [
+            DXFEntity(uuid=uuid, cluster_label=label, clustered_at=clustered_at)
+            for uuid, label in labels_by_uuid.items()
+        ],
+        ["cluster_label", "clustered_at"],
+        batch_size=DXF_CLUSTERING_BATCH_SIZE,
+    )
+
+
+def _cluster_entities(
+    entities: Iterable[tuple[UUID, dict | None]],
+    *,
+    label_offset: int,
+    eps: float,
+    min_samples: int,
+    tile_size: float,
+) -> dict[UUID, int | None]:
+    """
+    Cluster entities, entities without geometry are labelled None.
+    """
+    labels_by_uuid: dict[UUID, int | None] = {}
+    uuids, points = [], []
+    for uuid, metadata in entities:
+        point = get_dxf_entity_point(metadata)
+        if point is None:
+            labels_by_uuid[uuid] = None
+            continue
+        uuids.append(uuid)
+        points.append(point)
+
+    labels = cluster_points(
+        np.array(points, dtype=float).reshape(-1, 2),
+        eps=eps,
+        min_samples=min_samples,
+        tile_size=tile_size,
+    )
+    for uuid, label in zip(uuids, labels.tolist()):
+        labels_by_uuid[uuid] = label if label == NOISE_LABEL else label + label_offset
+    return labels_by_uuid
+
+
+def cluster_dxf_entities(
+    draft_building_design: DraftBuildingDesign,
+    *,
+    eps: float = DXF_CLUSTERING_EPS,
+    min_samples: int = DXF_CLUSTERING_MIN_SAMPLES,
+    tile_size: float = DXF_CLUSTERING_TILE_SIZE,
+) -> int:
+    """
+    This function clusters all the DXF entities of a design and saves their
+    labels, returning the number of clusters.
+    """
+    entities = (
+        DXFEntity.objects.filter(draft_building_design=draft_building_design)
+        .values_list("uuid", "metadata")
+        .iterator(chunk_size=DXF_CLUSTERING_BATCH_SIZE)
+    )
+    labels_by_uuid = _cluster_entities(
+        entities, label_offset=0, eps=eps, min_samples=min_samples, tile_size=tile_size
+    )
+    _save_cluster_labels(labels_by_uuid)
+
+    clusters_count = len(set(labels_by_uuid.values()) - {None, NOISE_LABEL})
+    logger.info(
+        "Clustered DXF entities",
+        draft_building_design_uuid=str(draft_building_design.uuid),
+        entities_count=len(labels_by_uuid),
+        clusters_count=clusters_count,
+    )
+    return clusters_count
+
+
+def _get_entities_in_tiles(
+    draft_building_design: DraftBuildingDesign, tiles: set[Tile], tile_size: float
+) -> dict[UUID, tuple[dict | None, int | None]]:
+    """
+    Get the entities whose centroid is in the tiles, with their current label.
+    """
+    min_x = min(tile[0] for tile in tiles) * tile_size
+    min_y = min(tile[1] for tile in tiles) * tile_size
+    max_x = (max(tile[0] for tile in tiles) + 1) * tile_size
+    max_y = (max(tile[1] for tile in tiles) + 1) * tile_size
+    # The centroid of an entity is in its bounding box
+    entities = DXFEntity.objects.filter(
+        draft_building_design=draft_building_design,
+        bbox_min_x__lte=max_x,
+        bbox_max_x__gte=min_x,
+        bbox_min_y__lte=max_y,
+        bbox_max_y__gte=min_y,
+    ).values_list("uuid", "metadata", "cluster_label")
+
+    entities_in_tiles = {}
+    for uuid, metadata, cluster_label in entities:
+        point = get_dxf_entity_point(metadata)
+        if point is not None and get_tile(point, tile_size) in tiles:
+            entities_in_tiles[uuid] = (metadata, cluster_label)
+    return entities_in_tiles
+
+
+def update_dxf_entity_clusters(
+    draft_building_design: DraftBuildingDesign,
+    *,
+    eps: float = DXF_CLUSTERING_EPS,
+    min_samples: int = DXF_CLUSTERING_MIN_SAMPLES,
+    tile_size: float = DXF_CLUSTERING_TILE_SIZE,
+) -> int:
+    """
+    This function clusters again only the tiles around the entities added or
+    changed since they were clustered, with the tiles of the clusters those
+    tiles hold and of the clusters the changed entities were in, returning
+    the number of clusters updated.
+
+    Entities deleted since the last run don't split their clusters until the
+    design is clustered again with `cluster_dxf_entities`.
+    """
+    changed_entities = DXFEntity.objects.filter(
+        Q(clustered_at__isnull=True) | Q(updated_at__gt=F("clustered_at")),
+        draft_building_design=draft_building_design,
+    ).values_list("uuid", "metadata", "cluster_label")
+
+    labels_by_uuid: dict[UUID, int | None] = {}
+    tiles: set[Tile] = set()
+    # The clusters the changed entities may have left, e.g. when they moved
+    previous_labels: set[int] = set()
+    for uuid, metadata, cluster_label in changed_entities:
+        if cluster_label is not None and cluster_label != NOISE_LABEL:
+            previous_labels.add(cluster_label)
+        point = get_dxf_entity_point(metadata)
+        if point is None:
+            labels_by_uuid[uuid] = None
+            continue
+        tile_x, tile_y = get_tile(point, tile_size)
+        tiles |= {(tile_x + dx, tile_y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+
+    if not tiles and not previous_labels:
+        _save_cluster_labels(labels_by_uuid)
+        return 0
+
+    # Grow the tiles until they hold every cluster they touch, starting with
+    # the previous clusters of the changed entities
+    labels = previous_labels
+    seen_labels: set[int] = set()
+    while True:
+        clustered_entities = DXFEntity.objects.filter(
+            draft_building_design=draft_building_design,
+            cluster_label__in=labels - seen_labels,
+        ).values_list("metadata", flat=True)
+        seen_labels |= labels
+        for metadata in clustered_entities:
+            point = get_dxf_entity_point(metadata)
+            if point is not None:
+                tiles.add(get_tile(point, tile_size))
+
+        entities = _get_entities_in_tiles(draft_building_design, tiles, tile_size)
+        labels = {label for _, label in entities.values()} - {None, NOISE_LABEL}
+        if labels <= seen_labels:
+            break
+
+    label_offset = (
+        DXFEntity.objects.filter(draft_building_design=draft_building_design).aggregate(
+            max_label=Max("cluster_label")
+        )["max_label"]
+        or 0
+    ) + 1
+    labels_by_uuid |= _cluster_entities(
+        ((uuid, metadata) for uuid, (metadata, _) in entities.items()),
+        label_offset=label_offset,
+        eps=eps,
+        min_samples=min_samples,
+        tile_size=tile_size,
+    )
+    _save_cluster_labels(labels_by_uuid)
+
+    clusters_count = len(set(labels_by_uuid.values()) - {None, NOISE_LABEL})
+    logger.info(
+        "Updated DXF entity clusters",
+        draft_building_design_uuid=str(draft_building_design.uuid),
+        tiles_count=len(tiles),
+        entities_count=len(labels_by_uuid),
+        clusters_count=clusters_count,
+    )
+    return clusters_count
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+from django.contrib.auth.models import User
+
+from draft_building_designs.models import DraftBuildingDesign, DXFEntity
+from draft_building_designs.services.dxf_entity_clustering import (
+    NOISE_LABEL,
+    cluster_dxf_entities,
+    cluster_points,
+    get_dxf_entity_point,
+    update_dxf_entity_clusters,
+)
+from projects.models import Project
+
+
+@pytest.fixture()
+def draft_building_design() -> DraftBuildingDesign:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return DraftBuildingDesign.objects.create(project=project, name="design")
+
+
+def create_dxf_entity(
+    draft_building_design: DraftBuildingDesign, x: float, y: float
+) -> DXFEntity:
+    return DXFEntity.objects.create(
+        draft_building_design=draft_building_design,
+        metadata={"type": "TEXT", "coordinates": [x, y]},
+    )
+
+
+@pytest.mark.parametrize(
+    "metadata, expected_point",
+    [
+        ({"coordinates": [1, 2]}, (1.0, 2.0)),
+        ({"coordinates": [[0, 0], [2, 4]]}, (1.0, 2.0)),
+        ({"type": "LINE"}, None),
+        (None, None),
+    ],
+)
+def test_get_dxf_entity_point(metadata, expected_point):
+    assert get_dxf_entity_point(metadata) == expected_point
+
+
+def test_cluster_points():
+    points = np.array([[0, 0], [1, 0], [0, 1], [50, 50], [51, 50], [200, 200]])
+
+    labels = cluster_points(points, eps=2, min_samples=2, tile_size=100)
+
+    assert labels[0] == labels[1] == labels[2]
+    assert labels[3] == labels[4] != labels[0]
+    assert labels[5] == NOISE_LABEL
+
+
+def test_cluster_points_across_tiles():
+    # A chain of points crossing three tiles is a single cluster
+    points = np.array([[x, 5.0] for x in range(0, 30, 2)], dtype=float)
+
+    tiled_labels = cluster_points(points, eps=2.5, min_samples=2, tile_size=10)
+    single_tile_labels = cluster_points(points, eps=2.5, min_samples=2, tile_size=100)
+
+    assert len(set(tiled_labels)) == 1
+    assert list(tiled_labels) == list(single_tile_labels)
+
+
+def test_cluster_points_tile_size_smaller_than_eps():
+    with pytest.raises(ValueError):
+        cluster_points(np.zeros((2, 2)), eps=10, tile_size=5)
+
+
+@pytest.mark.django_db
+def test_cluster_dxf_entities(draft_building_design):
+    entities = [
+        create_dxf_entity(draft_building_design, 0, 0),
+        create_dxf_entity(draft_building_design, 1, 1),
+        create_dxf_entity(draft_building_design, 500, 500),
+    ]
+
+    assert cluster_dxf_entities(draft_building_design) == 1
+
+    for entity in entities:
+        entity.refresh_from_db()
+    assert entities[0].cluster_label == entities[1].cluster_label == 0
+    assert entities[2].cluster_label == NOISE_LABEL
+    assert all(entity.clustered_at for entity in entities)
+
+
+@pytest.mark.django_db
+def test_update_dxf_entity_clusters(draft_building_design):
+    first = create_dxf_entity(draft_building_design, 0, 0)
+    create_dxf_entity(draft_building_design, 1, 1)
+    far = create_dxf_entity(draft_building_design, 5000, 5000)
+    cluster_dxf_entities(draft_building_design)
+
+    assert update_dxf_entity_clusters(draft_building_design) == 0
+
+    added = create_dxf_entity(draft_building_design, 5001, 5001)
+    assert update_dxf_entity_clusters(draft_building_design) == 1
+
+    first.refresh_from_db()
+    far.refresh_from_db()
+    added.refresh_from_db()
+    assert first.cluster_label == 0
+    assert far.cluster_label == added.cluster_label == 1
+
+
+@pytest.mark.django_db
+def test_update_dxf_entity_clusters_of_moved_entities(draft_building_design):
+    first = create_dxf_entity(draft_building_design, 0, 0)
+    moved = create_dxf_entity(draft_building_design, 8, 0)
+    last = create_dxf_entity(draft_building_design, 16, 0)
+    cluster_dxf_entities(draft_building_design, eps=10)
+    last.refresh_from_db()
+    assert last.cluster_label == 0
+
+    # The cluster was chained through the moved entity, it is split
+    moved.metadata = {"type": "TEXT", "coordinates": [5000, 5000]}
+    moved.save()
+    update_dxf_entity_clusters(draft_building_design, eps=10)
+
+    for entity in (first, moved, last):
+        entity.refresh_from_db()
+    assert [entity.cluster_label for entity in (first, moved, last)] == [
+        NOISE_LABEL
+    ] * 3
@@ -0,0 +1,228 @@
+"""
+Index of the column codes referenced by the footings of a draft building design.
+
+Footings list the columns they hold in their `references` (e.g. `P1=P2=P3`).
+The index maps every exact column code to its footing, is built with a single
+query and is stored with the design until its footings change. The column
+components are assigned their footing when the pipeline created them, and
+again when footings or columns are created or edited.
+"""
+
+import re
+from collections.abc import Iterable
+from typing import Protocol
+
+import structlog
+from django.db.models import Count, Max
+from django.utils import timezone
+from pydantic import BaseModel
+
+from building_components.component_types import component_type_tree
+from building_components.models import BuildingComponent
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignBuildingComponent,
+)
+
+logger = structlog.get_logger(__name__)
+
+REFERENCES_SEPARATOR = re.compile(r"[=,;\s]+")
+
+
+class FootingReference(BaseModel):
+    """
+    This class represents the footing a column code is referenced by.
+    """
+
+    footing_uuid: str
+    height: float | None = None
+
+
+class FootingReferenceIndex(BaseModel):
+    """
+    This class represents the stored index of a draft building design.
+    """
+
+    stamp: str
+    references: dict[str, FootingReference]
+
+
+class ColumnWithFooting(Protocol):
+    code: str | None
+    starter_rebar_height: float | None
+    footing_uuid: str | None
+
+
+def parse_footing_references(references: str | None) -> list[str]:
+    """
+    This function parses the column codes of footing references, e.g. `P1=P2`.
+    """
+    if not references:
+        return []
+    return [code for code in REFERENCES_SEPARATOR.split(references.strip()) if code]
+
+
+def _get_footings(draft_building_design: DraftBuildingDesign):
+    return DraftBuildingDesignBuildingComponent.objects.filter(
+        draft_building_design=draft_building_design,
+        building_component__type__in=component_type_tree.get_types("Footing"),
+    )
+
+
+def _get_footings_stamp(draft_building_design: DraftBuildingDesign) -> str:
+    """
+    This function gets a stamp of the footings that changes when any of them
+    is added, removed or updated.
+    """
+    footings = _get_footings(draft_building_design).aggregate(
+        count=Count("uuid"), updated_at=Max("building_component__updated_at")
+    )
+    updated_at = footings["updated_at"].isoformat() if footings["updated_at"] else ""
+    return f"{footings['count']}:{updated_at}"
+
+
+def build_footing_reference_index(
+    draft_building_design: DraftBuildingDesign,
+) -> dict[str, FootingReference]:
+    """
+    This function builds the column code to footing index of a design.
+    """
+    references: dict[str, FootingReference] = {}
+    footings = _get_footings(draft_building_design).values_list(
+        "uuid", "building_component__component_data"
+    )
+    for footing_uuid, component_data in footings:
+        component_data = component_data or {}
+        for code in parse_footing_references(component_data.get("references")):
+            if code in references:
+                logger.warning(
+                    "Column referenced by more than one footing",
+                    code=code,
+                    footing_uuid=str(footing_uuid),
+                )
+                continue
+            references[code] = FootingReference(
+                footing_uuid=str(footing_uuid),
+                height=component_data.get("height", 0),
+            )
+    return references
+
+
+def get_footing_reference_index(
+    draft_building_design: DraftBuildingDesign, *, refresh: bool = False
+) -> dict[str, FootingReference]:
+    """
+    This function gets the stored index of a design, rebuilding it when its
+    footings changed since it was stored.
+    """
+    stamp = _get_footings_stamp(draft_building_design)
+    if not refresh and draft_building_design.footing_reference_index:
+        stored_index = FootingReferenceIndex.model_validate(
+            draft_building_design.footing_reference_index
+        )
+        if stored_index.stamp == stamp:
+            return stored_index.references
+
+    references = build_footing_reference_index(draft_building_design)
+    draft_building_design.footing_reference_index = FootingReferenceIndex(
+        stamp=stamp, references=references
+    ).model_dump()
+    draft_building_design.save(update_fields=["footing_reference_index", "updated_at"])
+    return references
+
+
+def assign_footings_to_columns(
+    columns: Iterable[ColumnWithFooting],
+    references: dict[str, FootingReference],
+) -> int:
+    """
+    This function sets the footing and starter rebar height of every column
+    referenced by a footing, returning how many columns were assigned.
+    """
+    assigned_count = 0
+    for column in columns:
+        reference = references.get(column.code) if column.code else None
+        if reference is None:
+            continue
+        column.starter_rebar_height = reference.height
+        column.footing_uuid = reference.footing_uuid
+        assigned_count += 1
+    return assigned_count
+
+
+def assign_footings_to_column_components(
+    draft_building_design: DraftBuildingDesign,
+) -> int:
+    """
+    This function assigns the footings of the stored column components of a
+    design in a single update, e.g. after the footings were edited.
+
+    Only the columns whose assignment changed are updated, so the others keep
+    their `updated_at` for the changes sync. Columns no longer referenced by
+    their footing get their assignment cleared.
+    """
+    references = get_footing_reference_index(draft_building_design)
+    column_components = list(
+        BuildingComponent.objects.filter(
+            draft_building_designs=draft_building_design,
+            type__in=component_type_tree.get_types("Column"),
+        )
+    )
+
+    now = timezone.now()
+    updated_components = []
+    for column_component in column_components:
+        component_data = column_component.component_data or {}
+        reference = references.get(component_data.get("code"))
+        if reference is not None:
+            assignment = {
+                "starter_rebar_height": reference.height,
+                "footing_uuid": reference.footing_uuid,
+            }
+        elif component_data.get("footing_uuid") is not None:
+            assignment = {"starter_rebar_height": None, "footing_uuid": None}
+        else:
+            continue
+
+        if all(
+            key in component_data and component_data[key] == value
+            for key, value in assignment.items()
+        ):
+            continue
+        column_component.component_data = {**component_data, **assignment}
+        # bulk_update skips auto_now fields
+        column_component.updated_at = now
+        updated_components.append(column_component)
+
+    BuildingComponent.objects.bulk_update(
+        updated_components, ["component_data", "updated_at"]
+    )
+    return len(updated_components)
+
+
+def assign_footings_after_components_change(
+    building_components: Iterable[BuildingComponent],
+) -> int:
+    """
+    This function assigns the footings of the column components of the designs
+    of the changed components, when any of them is a footing or a column.
+    """
+    component_types = {
+        *component_type_tree.get_types("Footing"),
+        *component_type_tree.get_types("Column"),
+    }
+    changed_component_uuids = [
+        building_component.uuid
+        for building_component in building_components
+        if building_component.type in component_types
+    ]
+    if not changed_component_uuids:
+        return 0
+
+    draft_building_designs = DraftBuildingDesign.objects.filter(
+        building_components__in=changed_component_uuids
+    ).distinct()
+    return sum(
+        assign_footings_to_column_components(draft_building_design)
+        for draft_building_design in draft_building_designs
+    )
@@ -0,0 +1,174 @@
+import pytest
+from django.contrib.auth.models import User
+from pydantic import BaseModel
+
+from building_components.models import BuildingComponent, BuildingComponentType
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignBuildingComponent,
+)
+from draft_building_designs.services.footing_reference_index import (
+    FootingReference,
+    assign_footings_after_components_change,
+    assign_footings_to_column_components,
+    assign_footings_to_columns,
+    get_footing_reference_index,
+    parse_footing_references,
+)
+from projects.models import Project
+
+
+class ExtractedColumn(BaseModel):
+    code: str
+    starter_rebar_height: float | None = None
+    footing_uuid: str | None = None
+
+
+@pytest.fixture()
+def draft_building_design() -> DraftBuildingDesign:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return DraftBuildingDesign.objects.create(project=project, name="design")
+
+
+def create_footing(
+    draft_building_design: DraftBuildingDesign, references: str, height: float
+) -> DraftBuildingDesignBuildingComponent:
+    building_component = BuildingComponent.objects.create(
+        type=BuildingComponentType.FOOTING,
+        component_data={"references": references, "height": height},
+    )
+    return DraftBuildingDesignBuildingComponent.objects.create(
+        draft_building_design=draft_building_design,
+        building_component=building_component,
+    )
+
+
+def create_column(
+    draft_building_design: DraftBuildingDesign, code: str
+) -> BuildingComponent:
+    building_component = BuildingComponent.objects.create(
+        type=BuildingComponentType.COLUMN, component_data={"code": code}
+    )
+    DraftBuildingDesignBuildingComponent.objects.create(
+        draft_building_design=draft_building_design,
+        building_component=building_component,
+    )
+    return building_component
+
+
+@pytest.mark.parametrize(
+    "references, expected_codes",
+    [
+        ("P1", ["P1"]),
+        ("P1=P2=P3", ["P1", "P2", "P3"]),
+        (" P1 = P2, P3 ", ["P1", "P2", "P3"]),
+        ("", []),
+        (None, []),
+    ],
+)
+def test_parse_footing_references(references, expected_codes):
+    assert parse_footing_references(references) == expected_codes
+
+
+def test_assign_footings_to_columns_matches_exact_codes():
+    columns = [ExtractedColumn(code="P1"), ExtractedColumn(code="P12")]
+    references = {"P12": FootingReference(footing_uuid="footing", height=0.6)}
+
+    assigned_count = assign_footings_to_columns(columns, references)
+
+    assert assigned_count == 1
+    assert columns[0].footing_uuid is None
+    assert columns[1].footing_uuid == "footing"
+    assert columns[1].starter_rebar_height == 0.6
+
+
+@pytest.mark.django_db
+def test_get_footing_reference_index(draft_building_design):
+    footing = create_footing(draft_building_design, "P1=P2", 0.5)
+    create_footing(draft_building_design, "P12", 0.8)
+
+    references = get_footing_reference_index(draft_building_design)
+
+    assert set(references) == {"P1", "P2", "P12"}
+    assert references["P1"].footing_uuid == str(footing.uuid)
+    assert references["P1"].height == 0.5
+    draft_building_design.refresh_from_db()
+    assert draft_building_design.footing_reference_index is not None
+
+
+@pytest.mark.django_db
+def test_get_footing_reference_index_rebuilds_when_footings_change(
+    draft_building_design,
+):
+    create_footing(draft_building_design, "P1", 0.5)
+    assert set(get_footing_reference_index(draft_building_design)) == {"P1"}
+
+    create_footing(draft_building_design, "P2", 0.5)
+
+    assert set(get_footing_reference_index(draft_building_design)) == {"P1", "P2"}
+
+
+@pytest.mark.django_db
+def test_assign_footings_to_column_components(draft_building_design):
+    footing = create_footing(draft_building_design, "P1", 0.5)
+    column = create_column(draft_building_design, "P1")
+    unmatched_column = create_column(draft_building_design, "P2")
+
+    assert assign_footings_to_column_components(draft_building_design) == 1
+
+    column.refresh_from_db()
+    assert column.component_data == {
+        "code": "P1",
+        "starter_rebar_height": 0.5,
+        "footing_uuid": str(footing.uuid),
+    }
+    unmatched_column.refresh_from_db()
+    assert unmatched_column.component_data == {"code": "P2"}
+
+    # Columns already assigned are left untouched
+    updated_at = column.updated_at
+    assert assign_footings_to_column_components(draft_building_design) == 0
+    column.refresh_from_db()
+    assert column.updated_at == updated_at
+
+
+@pytest.mark.django_db
+def test_assign_footings_to_column_components_clears_stale_footings(
+    draft_building_design,
+):
+    footing = create_footing(draft_building_design, "P1", 0.5)
+    column = create_column(draft_building_design, "P1")
+    assign_footings_to_column_components(draft_building_design)
+
+    footing.building_component.component_data = {"references": "P2", "height": 0.5}
+    footing.building_component.save()
+
+    assert assign_footings_to_column_components(draft_building_design) == 1
+    column.refresh_from_db()
+    assert column.component_data == {
+        "code": "P1",
+        "starter_rebar_height": None,
+        "footing_uuid": None,
+    }
+
+
+@pytest.mark.django_db
+def test_assign_footings_after_components_change(draft_building_design):
+    column = create_column(draft_building_design, "P1")
+    footing = create_footing(draft_building_design, "P1", 0.5)
+    slab = BuildingComponent.objects.create(
+        type=BuildingComponentType.SLAB, component_data={}
+    )
+
+    assert assign_footings_after_components_change([slab]) == 0
+    assert assign_footings_after_components_change([footing.building_component]) == 1
+
+    column.refresh_from_db()
+    assert column.component_data["footing_uuid"] == str(footing.uuid)
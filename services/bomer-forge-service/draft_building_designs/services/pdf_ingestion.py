@@ -0,0 +1,220 @@
+"""
+Ingestion of the PDF drawing documents, registering each page as its own
+drawing document.
+
+Pages are rendered in parallel at a target DPI and cached in the storage by
+(file hash, page, DPI), so a PDF uploaded twice, or a retried ingestion, is
+not rendered again. Pages are registered in order as soon as they are
+rendered, and `on_page_registered` is called with each one, so the extraction
+can start on the first ones while the others render.
+"""
+
+import os
+import subprocess
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from tempfile import TemporaryDirectory
+
+import structlog
+from django.core.files import File
+from django.core.files.storage import default_storage
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from draft_building_designs.models import (
+    DraftBuildingDesignDrawingDocument,
+    DraftBuildingDesignDrawingDocumentType,
+)
+from draft_building_designs.services.drawing_document_upload import get_file_hash
+
+logger = structlog.get_logger(__name__)
+
+PDF_RASTERIZATION_DPI = 200
+PDF_RASTERIZATION_MAX_WORKERS = min(4, os.cpu_count() or 1)
+PDF_PAGES_CACHE_LOCATION = "bucket/pdf_pages"
+
+# Keywords of the sheet titles of each drawing document type
+DRAWING_DOCUMENT_TYPE_KEYWORDS = {
+    DraftBuildingDesignDrawingDocumentType.FOOTING: ("sapata", "fundação", "fundacao"),
+    DraftBuildingDesignDrawingDocumentType.COLUMN: ("pilar", "pilares"),
+    DraftBuildingDesignDrawingDocumentType.BEAM: ("viga", "vigas"),
+    DraftBuildingDesignDrawingDocumentType.SLAB: ("laje", "lajes"),
+}
+
+
+@dataclass
+class RasterizedPage:
+    """
+    This class represents a rendered page of a PDF.
+    """
+
+    page_number: int
+    file_name: str
+    text: str
+    is_cached: bool
+
+
+def get_page_cache_name(file_hash: str, page_number: int, dpi: int) -> str:
+    """
+    This function gets the storage name of a rendered page.
+    """
+    return f"{PDF_PAGES_CACHE_LOCATION}/{file_hash}/{dpi}/{page_number}.png"
+
+
+def get_pdf_pages_count(pdf_path: str) -> int:
+    """
+    This function gets the number of pages of a PDF.
+    """
+    return pdfinfo_from_path(pdf_path)["Pages"]
+
+
+def extract_pdf_page_text(pdf_path: str, page_number: int) -> str:
+    """
+    This function extracts the text of a page of a PDF with pdftotext, empty
+    for scanned pages.
+    """
+    page = str(page_number)
+    result = subprocess.run(
+        ["pdftotext", "-f", page, "-l", page, "-layout", pdf_path, "-"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return result.stdout
+
+
+def detect_drawing_document_type(
+    text: str, *, default: str
+) -> DraftBuildingDesignDrawingDocumentType | str:
+    """
+    This function detects the type of a drawing document from its text, the
+    type whose keywords appear the most. Without any keyword the default type
+    is kept.
+    """
+    text = text.lower()
+    counts = {
+        document_type: sum(text.count(keyword) for keyword in keywords)
+        for document_type, keywords in DRAWING_DOCUMENT_TYPE_KEYWORDS.items()
+    }
+    document_type, count = max(counts.items(), key=lambda item: item[1])
+    return document_type if count else default
+
+
+def rasterize_pdf_page(
+    pdf_path: str, *, file_hash: str, page_number: int, dpi: int
+) -> RasterizedPage:
+    """
+    This function renders a page of a PDF to the page cache, unless it is
+    cached already.
+    """
+    cache_name = get_page_cache_name(file_hash, page_number, dpi)
+    is_cached = default_storage.exists(cache_name)
+    if not is_cached:
+        with TemporaryDirectory() as output_folder:
+            [page_path] = convert_from_path(
+                pdf_path,
+                dpi=dpi,
+                first_page=page_number,
+                last_page=page_number,
+                fmt="png",
+                output_folder=output_folder,
+                output_file="page",
+                single_file=True,
+                paths_only=True,
+            )
+            with open(page_path, "rb") as page_file:
+                cache_name = default_storage.save(cache_name, File(page_file))
+
+    return RasterizedPage(
+        page_number=page_number,
+        file_name=cache_name,
+        text=extract_pdf_page_text(pdf_path, page_number),
+        is_cached=is_cached,
+    )
+
+
+def rasterize_pdf(
+    pdf_path: str,
+    *,
+    file_hash: str,
+    dpi: int = PDF_RASTERIZATION_DPI,
+    max_workers: int = PDF_RASTERIZATION_MAX_WORKERS,
+) -> Iterator[RasterizedPage]:
+    """
+    This function renders the pages of a PDF in parallel, yielding them in
+    order as soon as each one is rendered.
+
+    Every page is rendered by its own poppler process, the threads only wait
+    for them.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                rasterize_pdf_page,
+                pdf_path,
+                file_hash=file_hash,
+                page_number=page_number,
+                dpi=dpi,
+            )
+            for page_number in range(1, get_pdf_pages_count(pdf_path) + 1)
+        ]
+        for future in futures:
+            yield future.result()
+
+
+def ingest_pdf_drawing_document(
+    *,
+    drawing_document_uuid: str,
+    dpi: int = PDF_RASTERIZATION_DPI,
+    max_workers: int = PDF_RASTERIZATION_MAX_WORKERS,
+    on_page_registered: (
+        Callable[[DraftBuildingDesignDrawingDocument], None] | None
+    ) = None,
+) -> list[DraftBuildingDesignDrawingDocument]:
+    """
+    This function registers every page of a PDF drawing document as its own
+    drawing document, typed from its text. Pages registered already are kept.
+
+    `on_page_registered` is called with each page document once it's
+    registered, before the next pages are rendered.
+    """
+    drawing_document = DraftBuildingDesignDrawingDocument.objects.get(
+        uuid=drawing_document_uuid
+    )
+    file_hash = drawing_document.content_hash
+    if file_hash is None:
+        with drawing_document.file.open("rb") as file:
+            file_hash = get_file_hash(file)
+
+    page_documents = []
+    for page in rasterize_pdf(
+        drawing_document.file.path,
+        file_hash=file_hash,
+        dpi=dpi,
+        max_workers=max_workers,
+    ):
+        page_document, _ = DraftBuildingDesignDrawingDocument.objects.get_or_create(
+            source_document=drawing_document,
+            page_number=page.page_number,
+            defaults={
+                "draft_building_design_id": drawing_document.draft_building_design_id,
+                "file": page.file_name,
+                "type": detect_drawing_document_type(
+                    page.text, default=drawing_document.type
+                ),
+                "description": drawing_document.description,
+            },
+        )
+        logger.info(
+            "PDF page registered as drawing document",
+            drawing_document_uuid=drawing_document_uuid,
+            page_number=page.page_number,
+            page_document_uuid=page_document.uuid,
+            type=page_document.type,
+            is_cached=page.is_cached,
+        )
+        page_documents.append(page_document)
+        if on_page_registered is not None:
+            on_page_registered(page_document)
+
+    return page_documents
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignDrawingDocument,
+    DraftBuildingDesignDrawingDocumentType,
+)
+from draft_building_designs.services import pdf_ingestion
+from draft_building_designs.services.pdf_ingestion import (
+    detect_drawing_document_type,
+    ingest_pdf_drawing_document,
+)
+from projects.models import Project
+
+
+@pytest.fixture()
+def draft_building_design() -> DraftBuildingDesign:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return DraftBuildingDesign.objects.create(project=project, name="design")
+
+
+def test_detect_drawing_document_type():
+    assert (
+        detect_drawing_document_type(
+            "PLANTA DE LOCALIZAÇÃO DE PILARES\nQuadro de pilares", default="FOOTING"
+        )
+        == DraftBuildingDesignDrawingDocumentType.COLUMN
+    )
+    assert detect_drawing_document_type("", default="BEAM") == "BEAM"
+
+
+@pytest.mark.django_db()
+def test_ingest_pdf_drawing_document(
+    draft_building_design: DraftBuildingDesign, settings, tmp_path, mocker
+) -> None:
+    settings.MEDIA_ROOT = str(tmp_path)
+    drawing_document = DraftBuildingDesignDrawingDocument.objects.create(
+        draft_building_design=draft_building_design,
+        file=SimpleUploadedFile("sheets.pdf", b"%PDF-1.7"),
+        type=DraftBuildingDesignDrawingDocumentType.FOOTING,
+    )
+
+    def convert_from_path(pdf_path, *, first_page, output_folder, **kwargs):
+        page_path = os.path.join(output_folder, "page.png")
+        with open(page_path, "wb") as page_file:
+            page_file.write(f"page {first_page}".encode())
+        return [page_path]
+
+    convert = mocker.patch.object(
+        pdf_ingestion, "convert_from_path", side_effect=convert_from_path
+    )
+    mocker.patch.object(pdf_ingestion, "get_pdf_pages_count", return_value=2)
+    mocker.patch.object(
+        pdf_ingestion,
+        "extract_pdf_page_text",
+        side_effect=lambda pdf_path, page_number: (
+            "Quadro de pilares" if page_number == 1 else ""
+        ),
+    )
+
+    for _ in range(2):
+        registered_documents = []
+        page_documents = ingest_pdf_drawing_document(
+            drawing_document_uuid=str(drawing_document.uuid),
+            on_page_registered=registered_documents.append,
+        )
+
+    # The second ingestion reuses the cached pages and registered documents
+    assert convert.call_count == 2
+    assert DraftBuildingDesignDrawingDocument.objects.count() == 3
+    assert [
+        (page_document.page_number, page_document.type)
+        for page_document in page_documents
+    ] == [
+        (1, DraftBuildingDesignDrawingDocumentType.COLUMN),
+        (2, DraftBuildingDesignDrawingDocumentType.FOOTING),
+    ]
+    assert registered_documents == page_documents
+    assert page_documents[1].file.read() == b"page 2"
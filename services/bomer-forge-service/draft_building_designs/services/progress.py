@@ -0,0 +1,139 @@
+"""
+Progress events of the draft building design processing.
+
+Events are rows of the database, shared by the Celery workers publishing them
+and the web processes streaming them. Their auto-incremented ids are their
+sequence numbers, so a reader only queries the events it hasn't seen yet.
+
+Publishing an event also sends a Postgres NOTIFY on the channel of its design,
+so the readers LISTENing to it query the new events instead of polling.
+"""
+
+import select
+from datetime import timedelta
+from uuid import UUID
+
+import structlog
+from django.db import connection
+from django.utils import timezone
+from pydantic import BaseModel
+
+from draft_building_designs.models import DraftBuildingDesignProgressEvent
+
+logger = structlog.get_logger(__name__)
+
+PROGRESS_EVENTS_TTL_SECONDS = 60 * 60
+
+
+class ProgressEvent(BaseModel):
+    """
+    This class represents a progress event of a draft building design.
+    """
+
+    sequence: int = 0
+    status: str
+    stage: str | None = None
+    documents_done: int = 0
+    documents_total: int = 0
+    components_created: int = 0
+    is_final: bool = False
+
+
+def get_progress_channel(draft_building_design_uuid: str) -> str:
+    """
+    This function gets the notification channel of the progress events of a
+    draft building design.
+    """
+    return f"progress_{UUID(str(draft_building_design_uuid)).hex}"
+
+
+def publish_progress_event(
+    *, draft_building_design_uuid: str, event: ProgressEvent
+) -> ProgressEvent:
+    """
+    This function publishes a progress event, assigning its sequence number.
+
+    The final event of a run also deletes the events older than
+    PROGRESS_EVENTS_TTL_SECONDS, of every design. Publishing is best effort,
+    a failure must not fail the processing.
+    """
+    try:
+        progress_event = DraftBuildingDesignProgressEvent.objects.create(
+            draft_building_design_id=draft_building_design_uuid,
+            data=event.model_dump(exclude={"sequence"}),
+        )
+        event = event.model_copy(update={"sequence": progress_event.id})
+        # Delivered once the event is committed
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)",
+                [get_progress_channel(draft_building_design_uuid), str(event.sequence)],
+            )
+
+        if event.is_final:
+            DraftBuildingDesignProgressEvent.objects.filter(
+                created_at__lt=timezone.now()
+                - timedelta(seconds=PROGRESS_EVENTS_TTL_SECONDS)
+            ).delete()
+    except Exception:
+        logger.warning(
+            "Failed to publish progress event",
+            draft_building_design_uuid=draft_building_design_uuid,
+            exc_info=True,
+        )
+    return event
+
+
+def get_progress_events(
+    *, draft_building_design_uuid: str, after: int = 0
+) -> list[ProgressEvent]:
+    """
+    This function gets the progress events published after a sequence number.
+    """
+    progress_events = DraftBuildingDesignProgressEvent.objects.filter(
+        draft_building_design_id=draft_building_design_uuid, id__gt=after
+    ).order_by("id")
+    return [
+        ProgressEvent(**progress_event.data, sequence=progress_event.id)
+        for progress_event in progress_events
+    ]
+
+
+class ProgressEventListener:
+    """
+    This class listens to the notifications of the progress events of a draft
+    building design, on the database connection of the current thread.
+
+    It is a context manager, listening from the moment it's entered so the
+    events published after the reader's first query aren't missed.
+    """
+
+    def __init__(self, *, draft_building_design_uuid: str) -> None:
+        self.channel = connection.ops.quote_name(
+            get_progress_channel(draft_building_design_uuid)
+        )
+
+    def __enter__(self) -> "ProgressEventListener":
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"UNLISTEN {self.channel}")
+
+    def wait(self, timeout: float) -> bool:
+        """
+        This function waits up to `timeout` seconds for a notification,
+        returning whether one was received.
+        """
+        # The psycopg2 connection, opened by the LISTEN
+        database_connection = connection.connection
+        if not database_connection.notifies:
+            readable, _, _ = select.select([database_connection], [], [], timeout)
+            if readable:
+                database_connection.poll()
+
+        notified = bool(database_connection.notifies)
+        database_connection.notifies.clear()
+        return notified
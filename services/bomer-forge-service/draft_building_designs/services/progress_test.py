@@ -0,0 +1,104 @@
+import pytest
+from django.contrib.auth.models import User
+
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignProgressEvent,
+)
+from draft_building_designs.services.progress import (
+    ProgressEvent,
+    ProgressEventListener,
+    get_progress_channel,
+    get_progress_events,
+    publish_progress_event,
+)
+from projects.models import Project
+
+
+@pytest.fixture()
+def draft_building_design() -> DraftBuildingDesign:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return DraftBuildingDesign.objects.create(project=project, name="design")
+
+
+def publish(draft_building_design: DraftBuildingDesign, **fields) -> ProgressEvent:
+    return publish_progress_event(
+        draft_building_design_uuid=str(draft_building_design.uuid),
+        event=ProgressEvent(status="CREATING_COLUMN_COMPONENTS", **fields),
+    )
+
+
+@pytest.mark.django_db
+def test_publishes_events_in_sequence(draft_building_design) -> None:
+    published_events = [
+        publish(draft_building_design, documents_done=documents_done)
+        for documents_done in range(3)
+    ]
+
+    events = get_progress_events(
+        draft_building_design_uuid=str(draft_building_design.uuid)
+    )
+
+    assert events == published_events
+    assert [event.documents_done for event in events] == [0, 1, 2]
+    assert events[0].sequence < events[1].sequence < events[2].sequence
+
+
+@pytest.mark.django_db
+def test_gets_only_new_events(draft_building_design) -> None:
+    events = [publish(draft_building_design) for _ in range(3)]
+
+    new_events = get_progress_events(
+        draft_building_design_uuid=str(draft_building_design.uuid),
+        after=events[1].sequence,
+    )
+
+    assert new_events == [events[2]]
+    assert (
+        get_progress_events(
+            draft_building_design_uuid=str(draft_building_design.uuid),
+            after=events[2].sequence,
+        )
+        == []
+    )
+
+
+@pytest.mark.django_db
+def test_final_event_deletes_expired_events(draft_building_design) -> None:
+    expired_event = publish(draft_building_design)
+    DraftBuildingDesignProgressEvent.objects.filter(pk=expired_event.sequence).update(
+        created_at="2000-01-01T00:00:00Z"
+    )
+
+    final_event = publish(draft_building_design, is_final=True)
+
+    assert get_progress_events(
+        draft_building_design_uuid=str(draft_building_design.uuid)
+    ) == [final_event]
+
+
+def test_get_progress_channel() -> None:
+    assert (
+        get_progress_channel("6f1f8d52-0d6c-4b8a-9a3e-2a1f6a1f0b3c")
+        == "progress_6f1f8d520d6c4b8a9a3e2a1f6a1f0b3c"
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_listener_is_notified_of_published_events(draft_building_design) -> None:
+    draft_building_design_uuid = str(draft_building_design.uuid)
+
+    with ProgressEventListener(
+        draft_building_design_uuid=draft_building_design_uuid
+    ) as listener:
+        assert not listener.wait(0)
+        publish(draft_building_design)
+        assert listener.wait(1)
+        assert not listener.wait(0)
@@ -1,5 +1,4 @@
 import base64
-import importlib
 import os
 from typing import Literal, Type, cast
 
@@ -10,12 +9,14 @@ from PIL import Image
 from django.conf import settings
 from pydantic import BaseModel
 
-from draft_building_designs.models import (
-    DraftBuildingDesignDrawingDocument,
-    DraftBuildingDesignBuildingComponent,
-)
+from draft_building_designs.models import DraftBuildingDesignDrawingDocument
 from building_components.models import BuildingComponentType
 from draft_building_designs.prompts.pt.prompt import Pilares, Pilar, PilarIPE
+from draft_building_designs.prompts.utils import LanguageModelFactory
+from draft_building_designs.services.footing_reference_index import (
+    assign_footings_to_columns,
+    get_footing_reference_index,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -62,40 +63,6 @@ class Columns(BaseModel):
     columns: list[Column]
 
 
-class LanguageModelFactory:
-    @staticmethod
-    def get_language_model(
-        language_code: str, prompt_name: str
-    ) -> tuple[Type[BaseModel], str]:
-        """
-        Factory method to get the appropriate language model and prompt
-
-        Args:
-            language_code: The language code (e.g., 'pt_pt', 'en_us')
-            model_name: The model name to load (e.g., 'footing')
-
-        Returns:
-            A tuple containing (ModelClass, prompt_text)
-        """
-        try:
-            # Import the language-specific module
-            module_path = f"draft_building_designs.prompts.{language_code}.prompt"
-            language_module = importlib.import_module(module_path)
-
-            # Get the model class and prompt
-            prompt_text, model_name = getattr(
-                language_module, f"get_{prompt_name}_prompt"
-            )()
-            model_class = getattr(language_module, model_name)
-
-            return model_class, prompt_text
-        except (ImportError, AttributeError) as e:
-            logger.error(f"Failed to load language model: {e}")
-            raise ValueError(
-                f"Unsupported language code or model: {language_code}, {model_name}"
-            )
-
-
 class ModelMapper:
     @staticmethod
     def map_to_domain(
@@ -171,7 +138,7 @@ class ModelMapper:
                 else:
                     target_data[target_field] = source_value
 
-        logger.info(f"Target data: {target_data}")
+        logger.debug("Target data", target_data=target_data)
         return target_model_class.model_validate(target_data)
 
 
@@ -312,22 +279,13 @@ def extract_columns_from_drawing_design_document(
                 )
 
     # extract starter rebar height from footings
-    footings = DraftBuildingDesignBuildingComponent.objects.filter(
-        draft_building_design=drawing_document.draft_building_design,
-        building_component__type__name__in=["Isolated", "Continuous"],
+    footing_references = get_footing_reference_index(
+        drawing_document.draft_building_design
+    )
+    assign_footings_to_columns(
+        [column for column in columns if isinstance(column, Column)],
+        footing_references,
     )
-
-    for column in columns:
-        for footing in footings:
-            if isinstance(
-                column, Column
-            ) and column.code in footing.building_component.component_data.get(
-                "references", ""
-            ):
-                column.starter_rebar_height = (
-                    footing.building_component.component_data.get("height", 0)
-                )
-                column.footing_uuid = str(footing.uuid)
     return columns
 
 
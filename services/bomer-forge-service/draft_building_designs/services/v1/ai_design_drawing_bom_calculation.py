@@ -186,4 +186,4 @@ def generate_structural_design_evaluation(
         name=f"{prompt_name}_{language_code}",
     )
 
-    logger.info("Response", response=response.choices[0].message.content)
+    logger.debug("Response", response=response.choices[0].message.content)
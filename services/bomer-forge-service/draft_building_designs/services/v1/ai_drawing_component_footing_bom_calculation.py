@@ -7,6 +7,10 @@ from pydantic import BaseModel
 from draft_building_designs.prompts.pt.prompt import Calculo
 from draft_building_designs.models import DraftBuildingDesignBuildingComponent
 from building_components.models import BuildingComponent
+from building_components.services.bom_result_sink import BomResultSink
+from draft_building_designs.services.ai.draft_building_design_components_materials_calculation import (
+    ComponentBillOfMaterials,
+)
 from draft_building_designs.prompts.utils import LanguageModelFactory
 from ai.services.runnables import get_langfuse_callback_handler, get_gpt
 
@@ -78,15 +82,16 @@ def generate_bill_of_materials_for_component(
 
     calculo = cast(Calculo, response)
 
-    # TODO: add mapping to domain model
-    bom = Bom(
-        concrete_volume_in_cubic_meters=calculo.volume_de_betao_em_metros_cubicos,
-        steel_weight_in_kilograms=calculo.peso_da_armadura_em_quilogramas,
+    # Stored with the keys the other BOM services write and the views read
+    bom = ComponentBillOfMaterials(
+        steel_weight=calculo.peso_da_armadura_em_quilogramas,
+        concrete_volume=calculo.volume_de_betao_em_metros_cubicos,
         rationale=calculo.raciocinio,
     )
 
-    building_component.component_bom = bom.model_dump()
-    building_component.save(update_fields=["component_bom"])
+    # `component_bom` was dropped, the BOM now lives in `component_data`
+    with BomResultSink(batch_size=1) as sink:
+        sink.add(building_component, bom.model_dump())
     logger.info(
         "Bill of materials generated for component",
         building_component_uuid=building_component.uuid,
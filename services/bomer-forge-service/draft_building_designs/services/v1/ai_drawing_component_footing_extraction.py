@@ -1,5 +1,4 @@
 import base64
-import importlib
 import os
 from typing import Literal, Type, cast
 
@@ -10,6 +9,7 @@ from PIL import Image
 from pydantic import BaseModel
 from django.conf import settings
 from draft_building_designs.models import DesignDrawingDocument
+from draft_building_designs.prompts.utils import LanguageModelFactory
 
 logger = structlog.get_logger(__name__)
 
@@ -34,40 +34,6 @@ class Footings(BaseModel):
     footings: list[Footing]
 
 
-class LanguageModelFactory:
-    @staticmethod
-    def get_language_model(
-        language_code: str, prompt_name: str
-    ) -> tuple[Type[BaseModel], str]:
-        """
-        Factory method to get the appropriate language model and prompt
-
-        Args:
-            language_code: The language code (e.g., 'pt_pt', 'en_us')
-            model_name: The model name to load (e.g., 'footing')
-
-        Returns:
-            A tuple containing (ModelClass, prompt_text)
-        """
-        try:
-            # Import the language-specific module
-            module_path = f"draft_building_designs.prompts.{language_code}.prompt"
-            language_module = importlib.import_module(module_path)
-
-            # Get the model class and prompt
-            prompt_text, model_name = getattr(
-                language_module, f"get_{prompt_name}_prompt"
-            )()
-            model_class = getattr(language_module, model_name)
-
-            return model_class, prompt_text
-        except (ImportError, AttributeError) as e:
-            logger.error(f"Failed to load language model: {e}")
-            raise ValueError(
-                f"Unsupported language code or model: {language_code}, {model_name}"
-            )
-
-
 class ModelMapper:
     @staticmethod
     def map_to_domain(
@@ -126,7 +92,7 @@ class ModelMapper:
                 else:
                     target_data[target_field] = source_value
 
-        logger.info(f"Target data: {target_data}")
+        logger.debug("Target data", target_data=target_data)
         return target_model_class.model_validate(target_data)
 
 
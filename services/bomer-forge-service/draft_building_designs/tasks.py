@@ -1,16 +1,17 @@
 from celery import shared_task, Task
+from celery.result import AsyncResult
 import structlog
 
+from celery_worker.queues import dispatch_bulk_task
+
 from draft_building_designs.models import (
     DraftBuildingDesign,
     DraftBuildingDesignDrawingDocument,
-    DraftBuildingDesignDrawingDocumentType,
     DraftBuildingDesignStatus,
 )
-from building_components.models import BuildingComponent, BuildingComponentType
-from draft_building_designs.services.ai.draft_building_design_components_measure import (
-    extract_footings_from_image as extract_footings_from_image_service,
-    extract_column_from_image as extract_column_from_image_service,
+from draft_building_designs.services.progress import (
+    ProgressEvent,
+    publish_progress_event,
 )
 
 logger = structlog.get_logger(__name__)
@@ -44,107 +45,181 @@ def generate_bill_of_materials_for_building_component_task(
     )
 
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=5)
-def create_draft_building_design_components(
-    self: Task, *, draft_building_design_uuid: str
+# Bulk tasks are acked once done, so a lost worker hands them to another one
+# that resumes from the saved progress
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=5,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def generate_draft_building_design_components_bom_task(
+    self: Task,
+    *,
+    draft_building_design_uuid: str,
+    batched: bool = True,
+    overwrite: bool = False,
 ):
-    draft_building_design = DraftBuildingDesign.objects.get(
-        uuid=draft_building_design_uuid
+    from draft_building_designs.services.ai.draft_building_design_components_materials_calculation import (
+        generate_draft_building_design_components_bom,
+        generate_draft_building_design_components_bom_batched,
     )
 
-    draft_building_design.status = DraftBuildingDesignStatus.CREATING_FOOTING_COMPONENTS
-    draft_building_design.save()
     logger.info(
-        f"Draft building design {draft_building_design_uuid} status updated to CREATING_FOOTING_COMPONENTS"
+        "Generating bill of materials for draft building design components",
+        draft_building_design_uuid=draft_building_design_uuid,
+        batched=batched,
+        overwrite=overwrite,
     )
+    if batched:
+        generate_draft_building_design_components_bom_batched(
+            draft_building_design_uuid=draft_building_design_uuid,
+            overwrite=overwrite,
+        )
+    else:
+        generate_draft_building_design_components_bom(
+            draft_building_design_uuid=draft_building_design_uuid,
+            overwrite=overwrite,
+        )
 
-    extract_footings_from_design_drawing_documents(
-        draft_building_design=draft_building_design,
-    )
 
-    draft_building_design.status = DraftBuildingDesignStatus.CREATING_COLUMN_COMPONENTS
-    draft_building_design.save()
-    logger.info(
-        f"Draft building design {draft_building_design_uuid} status updated to CREATING_COLUMN_COMPONENTS"
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=5,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def create_draft_building_design_components(
+    self: Task, *, draft_building_design_uuid: str
+):
+    from draft_building_designs.services.draft_building_design_components_pipeline import (
+        run_draft_building_design_components_pipeline,
     )
 
-    extract_columns_from_design_drawing_documents(
-        draft_building_design=draft_building_design,
-    )
+    try:
+        run_draft_building_design_components_pipeline(
+            draft_building_design_uuid=draft_building_design_uuid,
+        )
+    except Exception as exc:
+        if self.request.retries >= self.max_retries:
+            DraftBuildingDesign.objects.filter(uuid=draft_building_design_uuid).update(
+                status=DraftBuildingDesignStatus.FAILED
+            )
+            publish_progress_event(
+                draft_building_design_uuid=draft_building_design_uuid,
+                event=ProgressEvent(
+                    status=DraftBuildingDesignStatus.FAILED, is_final=True
+                ),
+            )
+            raise
 
-    draft_building_design.status = DraftBuildingDesignStatus.CREATING_BEAM_COMPONENTS
-    draft_building_design.save()
-    logger.info(
-        f"Draft building design {draft_building_design_uuid} status updated to CREATING_BEAM_COMPONENTS"
-    )
+        logger.exception(
+            "Draft building design pipeline failed, resuming from the last checkpoint",
+            draft_building_design_uuid=draft_building_design_uuid,
+            retries=self.request.retries,
+        )
+        raise self.retry(exc=exc)
 
 
-def extract_footings_from_design_drawing_documents(
-    *, draft_building_design: DraftBuildingDesign
-):
-    return
-    footings_drawings = DraftBuildingDesignDrawingDocument.objects.filter(
-        draft_building_design=draft_building_design,
-        type=DraftBuildingDesignDrawingDocumentType.FOOTING,
+@shared_task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=5,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def ingest_pdf_drawing_document_task(self: Task, *, drawing_document_uuid: str):
+    from draft_building_designs.services.pdf_ingestion import (
+        ingest_pdf_drawing_document,
     )
+
     logger.info(
-        f"Found {footings_drawings.count()} footings drawings for draft building design {str(draft_building_design.uuid)}"
+        "Ingesting PDF drawing document",
+        drawing_document_uuid=drawing_document_uuid,
     )
+    # The pipeline starts on the first page while the next ones render
+    started_pipeline_pages: list[DraftBuildingDesignDrawingDocument] = []
 
-    new_footing_components = []
-    for drawing in footings_drawings:
-        footings = extract_footings_from_image_service(
-            drawing_document_uuid=drawing.uuid,
-        )
-        for footing in footings:
-            new_footing_components.append(
-                BuildingComponent(
-                    type=BuildingComponentType.FOOTING,
-                    component_data=footing.model_dump(),
-                    description=f"Generated from drawing document {drawing.uuid}",
-                )
+    def start_pipeline(page_document: DraftBuildingDesignDrawingDocument) -> None:
+        if not started_pipeline_pages:
+            enqueue_create_draft_building_design_components(
+                draft_building_design=page_document.draft_building_design
             )
+        started_pipeline_pages.append(page_document)
 
-    BuildingComponent.objects.bulk_create(new_footing_components)
+    try:
+        page_documents = ingest_pdf_drawing_document(
+            drawing_document_uuid=drawing_document_uuid,
+            on_page_registered=start_pipeline,
+        )
+    except Exception as exc:
+        # Rendered pages are cached and registered pages are kept, so a retry
+        # only renders the pages that are left
+        logger.exception(
+            "PDF drawing document ingestion failed",
+            drawing_document_uuid=drawing_document_uuid,
+            retries=self.request.retries,
+        )
+        raise self.retry(exc=exc)
 
-    for footing_component in new_footing_components:
-        DraftBuildingDesign.objects.link_building_component_to_building_design(
-            building_design_uuid=draft_building_design.uuid,
-            building_component_uuid=footing_component.uuid,
+    # The pipeline skips the documents it has a checkpoint for, so this run
+    # only extracts the pages registered after the first one
+    if len(page_documents) > 1:
+        enqueue_create_draft_building_design_components(
+            draft_building_design=page_documents[0].draft_building_design
         )
 
 
-def extract_columns_from_design_drawing_documents(
-    *, draft_building_design: DraftBuildingDesign
-):
-    columns_drawings_uuids = list(
-        DraftBuildingDesignDrawingDocument.objects.filter(
-            draft_building_design=draft_building_design,
-            type=DraftBuildingDesignDrawingDocumentType.COLUMN,
-        ).values_list("uuid", flat=True)
+@shared_task
+def prune_components_tombstones_task():
+    from draft_building_designs.services.components_changes import (
+        prune_components_tombstones,
     )
 
-    logger.info(
-        f"Found {len(columns_drawings_uuids)} columns drawings for draft building design {str(draft_building_design.uuid)}"
+    deleted_count = prune_components_tombstones()
+    logger.info("Pruned components tombstones", deleted_count=deleted_count)
+
+
+def enqueue_ingest_pdf_drawing_document(
+    *, drawing_document: DraftBuildingDesignDrawingDocument
+) -> AsyncResult:
+    """
+    Enqueue the ingestion of a PDF document on the bulk queue of its project.
+    """
+    return dispatch_bulk_task(
+        ingest_pdf_drawing_document_task,
+        tenant=str(drawing_document.draft_building_design.project_id),
+        kwargs={"drawing_document_uuid": str(drawing_document.uuid)},
     )
 
-    new_column_components = []
-    for drawing_uuid in columns_drawings_uuids:
-        column = extract_column_from_image_service(
-            drawing_document_uuid=drawing_uuid,
-        )
-        new_column_components.append(
-            BuildingComponent(
-                type=BuildingComponentType.COLUMN,
-                component_data=column.model_dump(),
-                description=f"Generated from drawing document {drawing_uuid}",
-            )
-        )
 
-    BuildingComponent.objects.bulk_create(new_column_components)
+def enqueue_create_draft_building_design_components(
+    *, draft_building_design: DraftBuildingDesign
+) -> AsyncResult:
+    """
+    Enqueue the components pipeline on the bulk queue of the design's project.
+    """
+    return dispatch_bulk_task(
+        create_draft_building_design_components,
+        tenant=str(draft_building_design.project_id),
+        kwargs={"draft_building_design_uuid": str(draft_building_design.uuid)},
+    )
 
-    for column_component in new_column_components:
-        DraftBuildingDesign.objects.link_building_component_to_building_design(
-            building_design_uuid=draft_building_design.uuid,
-            building_component_uuid=column_component.uuid,
-        )
+
+def enqueue_generate_draft_building_design_components_bom(
+    *, draft_building_design: DraftBuildingDesign, overwrite: bool = False
+) -> AsyncResult:
+    """
+    Enqueue the BOM of the components of a design on the bulk queue of its
+    project.
+    """
+    return dispatch_bulk_task(
+        generate_draft_building_design_components_bom_task,
+        tenant=str(draft_building_design.project_id),
+        kwargs={
+            "draft_building_design_uuid": str(draft_building_design.uuid),
+            "overwrite": overwrite,
+        },
+    )
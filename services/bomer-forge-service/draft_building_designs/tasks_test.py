@@ -0,0 +1,124 @@
+from unittest import mock
+
+import pytest
+from celery.exceptions import Retry
+from django.contrib.auth.models import User
+
+from celery_worker.queues import get_bulk_queue_name
+from draft_building_designs.models import (
+    DraftBuildingDesign,
+    DraftBuildingDesignDrawingDocument,
+)
+from draft_building_designs.tasks import (
+    enqueue_generate_draft_building_design_components_bom,
+    enqueue_ingest_pdf_drawing_document,
+    generate_draft_building_design_components_bom_task,
+    ingest_pdf_drawing_document_task,
+)
+from projects.models import Project
+
+
+@pytest.fixture()
+def draft_building_design() -> DraftBuildingDesign:
+    user = User.objects.create(username="user")
+    project = Project.objects.create(
+        name="project",
+        description="description",
+        reference="reference",
+        created_by=user,
+        updated_by=user,
+    )
+    return DraftBuildingDesign.objects.create(project=project, name="design")
+
+
+@pytest.mark.django_db
+def test_enqueue_ingest_pdf_drawing_document_uses_the_project_bulk_queue(
+    draft_building_design,
+):
+    drawing_document = DraftBuildingDesignDrawingDocument.objects.create(
+        draft_building_design=draft_building_design, file="drawings.pdf"
+    )
+
+    with mock.patch.object(
+        ingest_pdf_drawing_document_task, "apply_async"
+    ) as apply_async:
+        enqueue_ingest_pdf_drawing_document(drawing_document=drawing_document)
+
+    apply_async.assert_called_once_with(
+        kwargs={"drawing_document_uuid": str(drawing_document.uuid)},
+        queue=get_bulk_queue_name(str(draft_building_design.project_id)),
+    )
+
+
+@pytest.mark.django_db
+def test_enqueue_generate_draft_building_design_components_bom_uses_the_project_bulk_queue(
+    draft_building_design,
+):
+    with mock.patch.object(
+        generate_draft_building_design_components_bom_task, "apply_async"
+    ) as apply_async:
+        enqueue_generate_draft_building_design_components_bom(
+            draft_building_design=draft_building_design
+        )
+
+    apply_async.assert_called_once_with(
+        kwargs={
+            "draft_building_design_uuid": str(draft_building_design.uuid),
+            "overwrite": False,
+        },
+        queue=get_bulk_queue_name(str(draft_building_design.project_id)),
+    )
+
+
+@pytest.mark.django_db
+def test_ingest_pdf_drawing_document_task_enqueues_the_pipeline(
+    draft_building_design,
+):
+    page_documents = [
+        DraftBuildingDesignDrawingDocument.objects.create(
+            draft_building_design=draft_building_design, file=f"drawings-{page}.png"
+        )
+        for page in (1, 2)
+    ]
+
+    def ingest_pdf_drawing_document(*, drawing_document_uuid, on_page_registered):
+        for page_document in page_documents:
+            on_page_registered(page_document)
+            # The pipeline is started with the first page
+            enqueue_pipeline.assert_called_once()
+        return page_documents
+
+    with (
+        mock.patch(
+            "draft_building_designs.services.pdf_ingestion.ingest_pdf_drawing_document",
+            side_effect=ingest_pdf_drawing_document,
+        ),
+        mock.patch(
+            "draft_building_designs.tasks.enqueue_create_draft_building_design_components"
+        ) as enqueue_pipeline,
+    ):
+        ingest_pdf_drawing_document_task.run(drawing_document_uuid="document")
+
+    # And again for the pages registered after it
+    assert (
+        enqueue_pipeline.call_args_list
+        == [mock.call(draft_building_design=draft_building_design)] * 2
+    )
+
+
+def test_ingest_pdf_drawing_document_task_retries():
+    error = RuntimeError("Rendering failed")
+
+    with (
+        mock.patch(
+            "draft_building_designs.services.pdf_ingestion.ingest_pdf_drawing_document",
+            side_effect=error,
+        ),
+        mock.patch.object(
+            ingest_pdf_drawing_document_task, "retry", side_effect=Retry()
+        ) as retry,
+        pytest.raises(Retry),
+    ):
+        ingest_pdf_drawing_document_task.run(drawing_document_uuid="document")
+
+    retry.assert_called_once_with(exc=error)
@@ -0,0 +1,246 @@
+"""
+Typed views of the component_data of the building components, generated from
+their Pydantic domain models.
+
+A view reads its dict once, when it is hydrated, into a slot per field of the
+model: nested models get their own views, and missing fields get the model's
+default (or None). Reading a field afterwards is a plain attribute access.
+
+Values are validated against the field types as they are read, coercing them
+like Pydantic does. Values of the expected type skip the validator, and ints
+are kept as they are in float fields. Null values are read as None whatever
+the field type, like missing fields, as the component_data of older
+components may hold them.
+"""
+
+from collections.abc import Callable, Iterable, Mapping
+from functools import cache, partial
+from types import UnionType
+from typing import Annotated, Any, ClassVar, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+
+
+class ComponentDataView:
+    """
+    This class is the base of the views generated by
+    `compile_component_data_view`.
+    """
+
+    __slots__ = ("_data",)
+
+    # Fields of pydantic models can't start with an underscore
+    _model: ClassVar[type[BaseModel]]
+    _fields: ClassVar[tuple[str, ...]] = ()
+    hydrate: ClassVar[Callable[[dict[str, Any]], "ComponentDataView"]]
+
+    _data: dict[str, Any]
+
+    @classmethod
+    def hydrate_many(
+        cls, component_data: Iterable[dict[str, Any]]
+    ) -> list["ComponentDataView"]:
+        """
+        This function hydrates the views of many component_data dicts.
+        """
+        hydrate = cls.hydrate
+        return [hydrate(data) for data in component_data]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        This function gets a field, or a key of the dict that is not a field.
+        """
+        if name in self._fields:
+            return getattr(self, name)
+        return self._data.get(name, default)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        This function gets the dict of the view.
+        """
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._data!r})"
+
+
+# Types of the values used as they are, by the field types accepting them
+EXACT_TYPES: dict[Any, tuple[type, ...]] = {
+    str: (str,),
+    int: (int,),
+    float: (float, int),
+    bool: (bool,),
+}
+
+MISSING = object()
+
+
+def _get_exact_types(annotation: Any) -> tuple[type, ...]:
+    """
+    This function gets the types of the values of a field that don't need to
+    be validated.
+    """
+    if get_origin(annotation) in (Union, UnionType):
+        return tuple(
+            exact_type
+            for argument in get_args(annotation)
+            for exact_type in _get_exact_types(argument)
+        )
+    return EXACT_TYPES.get(annotation, ())
+
+
+def _get_validate(field: FieldInfo) -> Callable[[Any], Any]:
+    """
+    This function gets the function validating the value of a field.
+    """
+    annotation = field.annotation
+    if field.metadata:
+        annotation = Annotated[annotation, *field.metadata]
+    return TypeAdapter(annotation).validate_python
+
+
+def _get_default(field: FieldInfo) -> tuple[Any, bool]:
+    """
+    This function gets the default of a field, and whether it must be got
+    again for each view, for default factories and mutable defaults.
+    """
+    if field.default_factory is not None:
+        return partial(field.get_default, call_default_factory=True), True
+    if field.is_required():
+        return None, False
+    # Pydantic copies the mutable defaults it gets
+    if field.get_default() is not field.default:
+        return field.get_default, True
+    return field.default, False
+
+
+def _get_nested_model(annotation: Any) -> tuple[type[BaseModel], bool] | None:
+    """
+    This function gets the model of a field holding a model, or a list of
+    models, optional or not, and whether it's a list.
+    """
+    if get_origin(annotation) in (Union, UnionType):
+        arguments = [
+            argument for argument in get_args(annotation) if argument is not type(None)
+        ]
+        if len(arguments) != 1:
+            return None
+        annotation = arguments[0]
+
+    if get_origin(annotation) is list:
+        nested_model = _get_nested_model(get_args(annotation)[0])
+        return (nested_model[0], True) if nested_model and not nested_model[1] else None
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None
+
+
+def _get_nested_hydrate(
+    model: type[BaseModel], is_list: bool, validate: Callable[[Any], Any]
+) -> Callable[[Any], Any]:
+    """
+    This function gets the function hydrating the value of a nested field,
+    validating the values that aren't dicts, or lists of dicts.
+    """
+    hydrate = compile_component_data_view(model).hydrate
+    if not is_list:
+        return lambda value: hydrate(value) if type(value) is dict else validate(value)
+
+    validate_item = TypeAdapter(model).validate_python
+
+    def hydrate_list(value: Any) -> Any:
+        if type(value) is not list:
+            return validate(value)
+        return [
+            hydrate(item) if type(item) is dict else validate_item(item)
+            for item in value
+        ]
+
+    return hydrate_list
+
+
+@cache
+def compile_component_data_view(model: type[BaseModel]) -> type[ComponentDataView]:
+    """
+    This function generates the view class of a domain model, with a slot per
+    field and a compiled `hydrate` function reading a dict into a new view.
+
+    Invalid values raise a pydantic ValidationError.
+    """
+    fields = tuple(model.model_fields)
+    view_class = type(
+        f"{model.__name__}View",
+        (ComponentDataView,),
+        {"__slots__": fields, "_model": model, "_fields": fields},
+    )
+
+    namespace: dict[str, Any] = {"view_class": view_class, "MISSING": MISSING}
+    lines = [
+        "def hydrate(data):",
+        "    if not isinstance(data, dict):",
+        "        raise TypeError(f'Component data must be a dict, not {type(data).__name__}')",
+        "    view = object.__new__(view_class)",
+        "    view._data = data",
+        "    get = data.get",
+    ]
+    for index, (name, field) in enumerate(model.model_fields.items()):
+        default, call_default = _get_default(field)
+        namespace[f"default_{index}"] = default
+        namespace[f"validate_{index}"] = _get_validate(field)
+        # Values of constrained fields are always validated
+        namespace[f"exact_types_{index}"] = (
+            () if field.metadata else _get_exact_types(field.annotation)
+        )
+        lines += [
+            f"    value = get({name!r}, MISSING)",
+            "    if value is MISSING:",
+            f"        view.{name} = default_{index}{'()' if call_default else ''}",
+            f"    elif value is None or type(value) in exact_types_{index}:",
+            f"        view.{name} = value",
+        ]
+
+        nested_model = _get_nested_model(field.annotation)
+        if nested_model is not None:
+            namespace[f"hydrate_{index}"] = _get_nested_hydrate(
+                *nested_model, namespace[f"validate_{index}"]
+            )
+            lines += ["    else:", f"        view.{name} = hydrate_{index}(value)"]
+        else:
+            lines += ["    else:", f"        view.{name} = validate_{index}(value)"]
+    lines.append("    return view")
+
+    exec("\n".join(lines), namespace)
+    view_class.hydrate = staticmethod(namespace["hydrate"])
+    return view_class
+
+
+def hydrate_component_data_views(
+    building_components: Iterable[Any],
+    view_classes: Mapping[str, type[ComponentDataView]],
+) -> list[ComponentDataView | Exception | None]:
+    """
+    This function hydrates the views of the component_data of many building
+    components, by their type, in order. Components of a type without a view
+    get None.
+
+    Components with invalid data get the error instead of a view, so one of
+    them doesn't fail the others.
+    """
+    hydrates = {
+        component_type: view_class.hydrate
+        for component_type, view_class in view_classes.items()
+    }
+    views: list[ComponentDataView | Exception | None] = []
+    for building_component in building_components:
+        hydrate = hydrates.get(building_component.type)
+        if hydrate is None:
+            views.append(None)
+            continue
+        try:
+            views.append(hydrate(building_component.component_data))
+        # ValidationError is a ValueError, data that isn't a dict a TypeError
+        except (TypeError, ValueError) as error:
+            views.append(error)
+    return views
@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel, Field, ValidationError
+
+from draft_building_designs.utils.component_data import (
+    ComponentDataView,
+    compile_component_data_view,
+    hydrate_component_data_views,
+)
+
+
+class Rebar(BaseModel):
+    quantity: int
+    diameter: float
+
+
+class Column(BaseModel):
+    code: str
+    height: float | None
+    longitudinal_rebar: Rebar | None = None
+    stirrups: list[Rebar] = []
+    type: str = "COLUMN"
+
+
+def test_compile_component_data_view() -> None:
+    view_class = compile_component_data_view(Column)
+
+    assert issubclass(view_class, ComponentDataView)
+    assert view_class.__name__ == "ColumnView"
+    assert view_class.__slots__ == (
+        "code",
+        "height",
+        "longitudinal_rebar",
+        "stirrups",
+        "type",
+    )
+    assert compile_component_data_view(Column) is view_class
+
+
+def test_hydrate() -> None:
+    data = {
+        "code": "P1",
+        "longitudinal_rebar": {"quantity": 4, "diameter": 12.0},
+        "stirrups": [{"quantity": 20, "diameter": 6.0}],
+        "notes": "checked",
+    }
+
+    view = compile_component_data_view(Column).hydrate(data)
+
+    assert view.code == "P1"
+    assert view.height is None
+    assert view.type == "COLUMN"
+    assert view.longitudinal_rebar.quantity == 4
+    assert [stirrup.diameter for stirrup in view.stirrups] == [6.0]
+    assert view.get("notes") == "checked"
+    assert view.get("missing", "default") == "default"
+    assert view.to_dict() is data
+    with pytest.raises(AttributeError):
+        view.notes
+
+
+def test_hydrate_invalid_data() -> None:
+    with pytest.raises(TypeError, match="list"):
+        compile_component_data_view(Column).hydrate([])
+
+
+def test_hydrate_validates_values() -> None:
+    view = compile_component_data_view(Column).hydrate(
+        {"code": "P1", "height": "2.5", "stirrups": [{"quantity": "20", "diameter": 6}]}
+    )
+
+    assert view.height == 2.5
+    assert view.stirrups[0].quantity == 20
+    with pytest.raises(ValidationError):
+        compile_component_data_view(Column).hydrate({"code": "P1", "height": "high"})
+    with pytest.raises(ValidationError):
+        compile_component_data_view(Column).hydrate({"code": "P1", "stirrups": "4Ø6"})
+
+
+def test_hydrate_keeps_values_of_the_field_type() -> None:
+    view = compile_component_data_view(Column).hydrate(
+        {"code": "P1", "height": 3, "longitudinal_rebar": None}
+    )
+
+    assert view.height == 3
+    assert type(view.height) is int
+    assert view.longitudinal_rebar is None
+
+
+def test_hydrate_copies_mutable_defaults() -> None:
+    class Beam(BaseModel):
+        stirrups: list[str] = []
+        tags: list[str] = Field(default_factory=lambda: ["beam"])
+
+    view_class = compile_component_data_view(Beam)
+    view = view_class.hydrate({})
+    view.stirrups.append("4Ø6")
+    view.tags.append("checked")
+
+    other_view = view_class.hydrate({})
+
+    assert other_view.stirrups == []
+    assert other_view.tags == ["beam"]
+
+
+def test_hydrate_component_data_views() -> None:
+    building_components = [
+        SimpleNamespace(type="COLUMN", component_data={"code": "P1"}),
+        SimpleNamespace(type="BEAM", component_data={"code": "V1"}),
+        SimpleNamespace(type="COLUMN", component_data={"code": "P2"}),
+    ]
+
+    views = hydrate_component_data_views(
+        building_components, {"COLUMN": compile_component_data_view(Column)}
+    )
+
+    assert [view and view.code for view in views] == ["P1", None, "P2"]
+
+
+def test_hydrate_component_data_views_returns_errors_of_invalid_data() -> None:
+    building_components = [
+        SimpleNamespace(type="COLUMN", component_data={"code": "P1"}),
+        SimpleNamespace(type="COLUMN", component_data={"height": "tall"}),
+        SimpleNamespace(type="COLUMN", component_data=["P3"]),
+    ]
+
+    views = hydrate_component_data_views(
+        building_components, {"COLUMN": compile_component_data_view(Column)}
+    )
+
+    assert views[0].code == "P1"
+    assert isinstance(views[1], ValidationError)
+    assert isinstance(views[2], TypeError)